@@ -29,8 +29,35 @@ class Config(object):
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
     SOLR_BASE_URL = os.getenv('SOLR_BASE_URL', None)
+    # Number of queries of a conflict bucket sent to Solr at the same time, and pooled connections to keep alive
+    SOLR_MAX_CONCURRENT_QUERIES = int(os.getenv('SOLR_MAX_CONCURRENT_QUERIES', '8'))
+    # Seconds to wait for a Solr query to answer, and for a new connection to Solr
+    SOLR_QUERY_TIMEOUT = int(os.getenv('SOLR_QUERY_TIMEOUT', '30'))
+    SOLR_CONNECT_TIMEOUT = int(os.getenv('SOLR_CONNECT_TIMEOUT', '5'))
+    # Histories and exact match lookups are cached until their core is updated, whose index version is checked at most
+    # every SOLR_CORE_VERSION_CHECK_INTERVAL seconds. 0 turns the cache off.
+    SOLR_MATCH_CACHE_TIMEOUT = int(os.getenv('SOLR_MATCH_CACHE_TIMEOUT', '60'))
+    SOLR_CORE_VERSION_CHECK_INTERVAL = int(os.getenv('SOLR_CORE_VERSION_CHECK_INTERVAL', '5'))
 
     SOLR_SYNONYMS_API_URL = f'{os.getenv("SOLR_SYNONYMS_API_URL", None)}{os.getenv("SOLR_SYNONYMS_API_VERSION", None)}'
+    # Serve synonym / designation lookups from the in-process synonym engine instead of the synonyms API
+    SYNONYMS_IN_PROCESS = os.getenv('SYNONYMS_IN_PROCESS', 'False').lower() == 'true'
+    # Seconds to wait for the synonym table snapshot and version from the synonyms API
+    SYNONYMS_SNAPSHOT_TIMEOUT = int(os.getenv('SYNONYMS_SNAPSHOT_TIMEOUT', '30'))
+    # Seconds between checks of the synonym table version, the name processing reference data is reloaded on change
+    REFERENCE_DATA_TTL = int(os.getenv('REFERENCE_DATA_TTL', '300'))
+    # Seconds the classifications of a word are cached for, approving a word drops them in the approving process
+    WORD_CLASSIFICATION_CACHE_TIMEOUT = int(os.getenv('WORD_CLASSIFICATION_CACHE_TIMEOUT', '300'))
+    # Seconds the Solr analysis and synonyms API lookups of the conflict searches are cached for
+    SOLR_LOOKUP_CACHE_TIMEOUT = int(os.getenv('SOLR_LOOKUP_CACHE_TIMEOUT', '300'))
+    # Seconds between checks of the restricted word tables, the restricted words dictionary is rebuilt on change
+    RESTRICTED_WORDS_TTL = int(os.getenv('RESTRICTED_WORDS_TTL', '300'))
+    # Rows counted at most by the requests search with count=capped
+    REQUESTS_SEARCH_COUNT_CAP = int(os.getenv('REQUESTS_SEARCH_COUNT_CAP', '10000'))
+    # Fetch the conflict search candidates with a single query instead of one query per (dist, desc) pair
+    CONFLICT_CANDIDATES_BATCHED = os.getenv('CONFLICT_CANDIDATES_BATCHED', 'True').lower() == 'true'
+    # Seconds the json of an NR is cached for by id and last update, 0 disables the cache
+    REQUEST_JSON_CACHE_TIMEOUT = int(os.getenv('REQUEST_JSON_CACHE_TIMEOUT', '0'))
 
     AUTO_ANALYZE_URL = os.getenv('AUTO_ANALYZE_URL', None)
     AUTO_ANALYZE_CONFIG = os.getenv('AUTO_ANALYZE_CONFIG', None)
@@ -40,10 +67,16 @@ class Config(object):
 
     PAYMENT_SVC_URL = os.getenv('PAY_API_URL', None)
     PAYMENT_SVC_VERSION = os.getenv('PAY_API_VERSION', None)
+    # Concurrent requests to SBC Pay when listing the payments of an NR
+    PAYMENT_SVC_FETCH_WORKERS = int(os.getenv('PAYMENT_SVC_FETCH_WORKERS', '4'))
+    # Seconds the SBC Pay invoices in a final state are cached, 0 never expires them
+    PAYMENT_INVOICE_CACHE_TIMEOUT = int(os.getenv('PAYMENT_INVOICE_CACHE_TIMEOUT', '0'))
 
     AUTH_SVC_URL = f'{os.getenv("AUTH_API_URL", None)}{os.getenv("AUTH_API_VERSION", "/api/v1")}'
 
     COLIN_SVC_URL = f'{os.getenv("COLIN_SVC_URL", None)}{os.getenv("COLIN_SVC_VERSION", None)}'
+    # Seconds a COLIN business lookup is cached, absorbs the repeated lookups of an examiner working an NR
+    COLIN_LOOKUP_CACHE_TIMEOUT = int(os.getenv('COLIN_LOOKUP_CACHE_TIMEOUT', '60'))
 
     ENTITY_SVC_URL = f'{os.getenv("LEGAL_API_URL", None)}{os.getenv("LEGAL_API_VERSION", "/api/v1")}'
 
@@ -95,9 +128,21 @@ permits-licences/businesses-incorporated-companies/approval-business-name')
     GCP_AUTH_KEY = os.getenv('BUSINESS_GCP_AUTH_KEY', None)
     NAMEX_NR_STATE_TOPIC = os.getenv('NAMEX_NR_STATE_TOPIC', '')
     EMAILER_TOPIC = os.getenv('NAMEX_MAILER_TOPIC', '')
+    # Write the queue messages to the outbox_messages table in the transaction of the change, relayed after commit
+    QUEUE_OUTBOX_ENABLED = os.getenv('QUEUE_OUTBOX_ENABLED', 'True').lower() == 'true'
+    QUEUE_OUTBOX_RELAY_IN_BACKGROUND = os.getenv('QUEUE_OUTBOX_RELAY_IN_BACKGROUND', 'True').lower() == 'true'
+    # Seconds between relays of the outbox when no transaction wrote to it
+    QUEUE_OUTBOX_RELAY_INTERVAL = int(os.getenv('QUEUE_OUTBOX_RELAY_INTERVAL', '30'))
+    QUEUE_OUTBOX_BATCH_SIZE = int(os.getenv('QUEUE_OUTBOX_BATCH_SIZE', '100'))
+    # Failed publications of a message before it is left in the outbox for investigation
+    QUEUE_OUTBOX_MAX_ATTEMPTS = int(os.getenv('QUEUE_OUTBOX_MAX_ATTEMPTS', '10'))
 
     AUDIENCE = os.getenv("AUDIENCE", "https://pubsub.googleapis.com/google.pubsub.v1.Subscriber")
     PUBLISHER_AUDIENCE = os.getenv("PUBLISHER_AUDIENCE", "https://pubsub.googleapis.com/google.pubsub.v1.Publisher")
+    # Client side batching of the messages published to a topic
+    PUBLISHER_BATCH_MAX_MESSAGES = int(os.getenv('PUBLISHER_BATCH_MAX_MESSAGES', '100'))
+    PUBLISHER_BATCH_MAX_BYTES = int(os.getenv('PUBLISHER_BATCH_MAX_BYTES', '1000000'))
+    PUBLISHER_BATCH_MAX_LATENCY = float(os.getenv('PUBLISHER_BATCH_MAX_LATENCY', '0.01'))
 
     # MRAS
     MRAS_SVC_URL = os.getenv('MRAS_SVC_URL', '')
@@ -108,6 +153,15 @@ permits-licences/businesses-incorporated-companies/approval-business-name')
 
     # Generate new NR Number
     NR_NUM_LIFESPAN = int(os.getenv('NR_NUM_LIFESPAN', 60))
+    # Pool of pre-vetted NR numbers, topped up to NR_NUM_POOL_SIZE once it falls below NR_NUM_POOL_LOW_WATER
+    NR_NUM_POOL_SIZE = int(os.getenv('NR_NUM_POOL_SIZE', '500'))
+    NR_NUM_POOL_LOW_WATER = int(os.getenv('NR_NUM_POOL_LOW_WATER', '100'))
+    NR_NUM_POOL_CLAIM_ATTEMPTS = int(os.getenv('NR_NUM_POOL_CLAIM_ATTEMPTS', '10'))
+    # Claims between two checks of the pool size, an empty pool is refilled on the claim that finds it empty
+    NR_NUM_POOL_CHECK_INTERVAL = int(os.getenv('NR_NUM_POOL_CHECK_INTERVAL', '10'))
+    NR_NUM_POOL_REFILL_IN_BACKGROUND = os.getenv('NR_NUM_POOL_REFILL_IN_BACKGROUND', 'True').lower() == 'true'
+    # Seconds an identical submission (same email and name choices) is turned away as a duplicate
+    NR_SUBMISSION_FINGERPRINT_TTL = int(os.getenv('NR_SUBMISSION_FINGERPRINT_TTL', '120'))
 
 
 class DevConfig(Config):
@@ -145,6 +199,13 @@ class TestConfig(Config):
 
     DISABLE_NAMEREQUEST_SOLR_UPDATES = int(os.getenv('DISABLE_NAMEREQUEST_SOLR_UPDATES', 0))
 
+    # the pool refills in the test session
+    NR_NUM_POOL_REFILL_IN_BACKGROUND = False
+    # the test session never commits its outer transaction, the messages are published right away
+    QUEUE_OUTBOX_ENABLED = False
+    # the solr tests seed the cores between their lookups
+    SOLR_MATCH_CACHE_TIMEOUT = 0
+
     # JWT OIDC settings
     # JWT_OIDC_TEST_MODE will set jwt_manager to use
     JWT_OIDC_TEST_MODE = True
@@ -0,0 +1,31 @@
+"""Add nr_submission_fingerprints table
+
+Revision ID: a8b6c7d9e0f1
+Revises: f7a5b6c8d9e0
+Create Date: 2026-10-18 21:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8b6c7d9e0f1'
+down_revision = 'f7a5b6c8d9e0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('nr_submission_fingerprints',
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('nr_id', sa.Integer(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('fingerprint')
+    )
+    op.create_index(op.f('ix_nr_submission_fingerprints_expires_at'), 'nr_submission_fingerprints', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_nr_submission_fingerprints_expires_at'), table_name='nr_submission_fingerprints')
+    op.drop_table('nr_submission_fingerprints')
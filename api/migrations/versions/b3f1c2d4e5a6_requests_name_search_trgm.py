@@ -0,0 +1,27 @@
+"""requests name_search trigram index
+
+Revision ID: b3f1c2d4e5a6
+Revises: 179a7b0089ce
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f1c2d4e5a6'
+down_revision = '179a7b0089ce'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # serves the '%name%' ILIKE searches on name_search, which can't use the btree index
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE INDEX IF NOT EXISTS ' + op.f('ix_requests_name_search_trgm')
+               + ' ON public.requests USING gin (name_search gin_trgm_ops)')
+
+
+def downgrade():
+    op.drop_index(op.f('ix_requests_name_search_trgm'), table_name='requests')
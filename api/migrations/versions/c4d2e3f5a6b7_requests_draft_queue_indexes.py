@@ -0,0 +1,30 @@
+"""requests draft queue indexes
+
+Revision ID: c4d2e3f5a6b7
+Revises: b3f1c2d4e5a6
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d2e3f5a6b7'
+down_revision = 'b3f1c2d4e5a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # serve the examiner queue checkout, which only ever reads the DRAFT NRs in these orders
+    op.create_index(op.f('ix_requests_draft_priority_submitted_date'), 'requests',
+                    [sa.text('priority_cd DESC'), sa.text('submitted_date ASC')],
+                    unique=False, postgresql_where=sa.text("state_cd = 'DRAFT'"))
+    op.create_index(op.f('ix_requests_draft_submitted_date'), 'requests', ['submitted_date'],
+                    unique=False, postgresql_where=sa.text("state_cd = 'DRAFT'"))
+
+
+def downgrade():
+    op.drop_index(op.f('ix_requests_draft_submitted_date'), table_name='requests')
+    op.drop_index(op.f('ix_requests_draft_priority_submitted_date'), table_name='requests')
@@ -0,0 +1,31 @@
+"""Add nr_number_pool table
+
+Revision ID: d5e3f4a6b7c8
+Revises: c4d2e3f5a6b7
+Create Date: 2026-10-18 19:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e3f4a6b7c8'
+down_revision = 'c4d2e3f5a6b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('nr_number_pool',
+    sa.Column('nr_num', sa.String(length=10), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('nr_num')
+    )
+    # the lifespan sweep deletes on the timestamp
+    op.create_index(op.f('ix_nr_number_lifespan_nr_timestamp'), 'nr_number_lifespan', ['nr_timestamp'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_nr_number_lifespan_nr_timestamp'), table_name='nr_number_lifespan')
+    op.drop_table('nr_number_pool')
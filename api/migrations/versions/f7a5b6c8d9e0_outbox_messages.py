@@ -0,0 +1,35 @@
+"""Add outbox_messages table
+
+Revision ID: f7a5b6c8d9e0
+Revises: e6f4a5b7c8d9
+Create Date: 2026-10-18 20:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7a5b6c8d9e0'
+down_revision = 'e6f4a5b7c8d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('outbox_messages',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('nr_num', sa.String(length=10), nullable=True),
+    sa.Column('topic', sa.String(length=200), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('created_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(length=1000), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_outbox_messages_nr_num'), 'outbox_messages', ['nr_num'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_outbox_messages_nr_num'), table_name='outbox_messages')
+    op.drop_table('outbox_messages')
@@ -27,6 +27,7 @@ from sentry_sdk.integrations.flask import FlaskIntegration  # noqa: I001
 from namex.services.cache import cache
 from namex.services.lookup import nr_filing_actions
 from .services import queue
+from .services.outbox_relay import outbox_relay
 
 from namex import models
 from namex.models import db, ma
@@ -55,6 +56,7 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
 
     flags.init_app(app)
     queue.init_app(app)
+    outbox_relay.init_app(app)
 
     db.init_app(app)
     Migrate(app, db)
@@ -1,5 +1,9 @@
+from functools import lru_cache
 
 
+# Number of words the phonetic keys are memoized for
+PHONETIC_KEY_CACHE_SIZE = 100000
+
 
 def first_vowels(word, leading_vowel = False):
     vowels = ['A', 'E', 'I', 'O', 'U', 'Y']
@@ -167,3 +171,22 @@ def replace_special_leading_sounds(word):
             word = replacement + word[len(special_leading_sound):]
 
     return word
+
+
+DESIGNATIONS = frozenset(designations())
+
+
+@lru_cache(maxsize=PHONETIC_KEY_CACHE_SIZE)
+def phonetic_key(word):
+    """Return the sound of an upper case word, two words sound alike when their keys are equal."""
+    word = replace_special_leading_sounds(word)
+
+    if has_leading_vowel(word):
+        return first_vowels(word, True) + first_consonants(word)
+
+    return first_consonants(word) + first_vowels(word, False)
+
+
+def phonetic_keys(words):
+    """Return the set of keys of the words, designations excluded."""
+    return {phonetic_key(word) for word in words if word not in DESIGNATIONS}
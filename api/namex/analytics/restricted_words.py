@@ -1,8 +1,161 @@
+import threading
+import time
+from collections import deque
+
 from flask import jsonify, current_app
 from sqlalchemy import text, exc
 from namex.models import db
 
 
+'''
+The restricted words, their conditions and the matcher built from them are loaded once and shared by every request of
+the process. Every RESTRICTED_WORDS_TTL seconds the fingerprint of the three restricted word tables is checked, and
+the dictionary is rebuilt when it changed.
+'''
+
+RESTRICTED_WORDS_VERSION_SQL = text(
+    "select md5(concat("
+    "(select string_agg(concat_ws(':', word_id, word_phrase), ';' order by word_id) from restricted_word), '|', "
+    "(select string_agg(concat_ws(':', word_id, cnd_id), ';' order by word_id, cnd_id) "
+    "from restricted_word_condition), '|', "
+    "(select string_agg(concat_ws(':', cnd_id, cnd_text, allow_use, consent_required, consenting_body, instructions), "
+    "';' order by cnd_id) from restricted_condition)))"
+)
+
+RESTRICTED_WORDS_SQL = text("select word_id, word_phrase from restricted_word order by word_id")
+
+RESTRICTED_WORD_CONDITIONS_SQL = text(
+    "select rwc.word_id, rc.cnd_id, rc.cnd_text, rc.allow_use, rc.consent_required, rc.consenting_body, "
+    "rc.instructions "
+    "from restricted_word_condition rwc left join restricted_condition rc on rc.cnd_id = rwc.cnd_id "
+    "order by rwc.word_id, rwc.cnd_id"
+)
+
+CONDITION_NOT_AVAILABLE = 'Not Available'
+
+
+class PhraseMatcher(object):
+    """Aho-Corasick automaton, finds every occurrence of a set of phrases in a single scan of the text."""
+
+    def __init__(self, phrases):
+        """phrases is an iterable of (phrase, value), find returns the values of the phrases found."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for phrase, value in phrases:
+            node = 0
+            for char in phrase:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(value)
+
+        # breadth first, the failure link of a node is always built before the ones of its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, content):
+        node = 0
+        for char in content:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            yield from self._output[node]
+
+
+class RestrictedWordsDictionary(object):
+    """Snapshot of the restricted words and their condition info."""
+
+    def __init__(self, version, words, conditions):
+        """words is a list of (word_id, word_phrase), conditions maps a word id to its list of condition info."""
+        self.version = version
+        self.words = [{'id': word_id, 'phrase': phrase.upper()} for word_id, phrase in words if phrase is not None]
+        self.conditions = conditions
+        # a phrase is restricted when it is a whole word / phrase of the content, ie. surrounded with spaces
+        self._matcher = PhraseMatcher((' ' + word['phrase'].strip() + ' ', index)
+                                      for index, word in enumerate(self.words))
+
+    @classmethod
+    def load(cls, version=None):
+        words = db.engine.execute(RESTRICTED_WORDS_SQL).fetchall()
+
+        conditions = {}
+        for row in db.engine.execute(RESTRICTED_WORD_CONDITIONS_SQL):
+            word_conditions = conditions.setdefault(row[0], [])
+            if word_conditions == CONDITION_NOT_AVAILABLE:
+                continue
+            if row[1] is None:
+                # the word is linked to a condition that doesn't exist
+                conditions[row[0]] = CONDITION_NOT_AVAILABLE
+                continue
+
+            word_conditions.append({'id': row[1],
+                                    'text': row[2],
+                                    'allow_use': row[3],
+                                    'consent_required': row[4],
+                                    'consenting_body': row[5],
+                                    'instructions': row[6]})
+
+        return cls(version, words, conditions)
+
+    def find_words(self, content):
+        """Return the restricted words/phrases of the stripped content, in the order of the restricted word table."""
+        return [dict(self.words[index]) for index in sorted(set(self._matcher.find(content)))]
+
+    def find_cnd_info(self, word_id):
+        cnd_info = self.conditions.get(word_id, [])
+        if cnd_info == CONDITION_NOT_AVAILABLE:
+            return cnd_info
+        return [dict(cnd) for cnd in cnd_info]
+
+
+class RestrictedWordsDictionaryCache(object):
+    """Process wide holder of the current RestrictedWordsDictionary."""
+
+    def __init__(self):
+        self._dictionary = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._checked_at = 0.0
+
+    def get(self):
+        dictionary = self._dictionary
+        ttl = current_app.config.get('RESTRICTED_WORDS_TTL', 300)
+        if dictionary is not None and time.monotonic() - self._checked_at < ttl:
+            return dictionary
+
+        with self._lock:
+            # Another thread may have refreshed the dictionary while we were waiting for the lock
+            if self._dictionary is not None and time.monotonic() - self._checked_at < ttl:
+                return self._dictionary
+
+            version = db.engine.execute(RESTRICTED_WORDS_VERSION_SQL).scalar()
+            if self._dictionary is None or version != self._dictionary.version:
+                self._dictionary = RestrictedWordsDictionary.load(version)
+
+            self._checked_at = time.monotonic()
+            return self._dictionary
+
+
+restricted_words_dictionary = RestrictedWordsDictionaryCache()
+
+
 class RestrictedWords(object):
 
     RESTRICTED_WORDS = 'restricted_words'
@@ -21,31 +174,18 @@ class RestrictedWords(object):
         stripped_content = RestrictedWords.strip_content(content)
 
         try:
-            restricted_words_dict = RestrictedWords.find_restricted_words(stripped_content)
+            dictionary = restricted_words_dictionary.get()
 
         except exc.SQLAlchemyError as err:
             current_app.logger.debug(err.with_traceback(None))
             return None, 'An error occurred accessing the restricted words.', 500
-        except AttributeError:
-            return None, 'Could not find any restricted words.', 404
 
-        # Get condition info based on each word_id and pair each word with its cnd_info in a dict
+        # Pair each word with its cnd_info in a dict
         restricted_words_conditions = []
-        for word in restricted_words_dict:
-            try:
-                restricted_words_conditions.append(
-                    {'word_info': word, 'cnd_info': RestrictedWords.find_cnd_info(word['id'])}
-                )
-
-            except exc.SQLAlchemyError as sql_err:
-                current_app.logger.debug(sql_err.with_traceback(None))
-                return None, 'An error occurred accessing the condition for {}.'.format(word['phrase']), 500
-            except AttributeError:
-                return None, 'Could not find any condition info for {}.'.format(word['id']), 404
-            except Exception as err:
-                current_app.logger.debug(err.with_traceback(None))
-                cnd_info = 'Not Available'
-                restricted_words_conditions.append({'word_info': word, 'cnd_info': cnd_info})
+        for word in dictionary.find_words(stripped_content):
+            restricted_words_conditions.append(
+                {'word_info': word, 'cnd_info': dictionary.find_cnd_info(word['id'])}
+            )
 
         return {"restricted_words_conditions": restricted_words_conditions}, None, None
 
@@ -66,45 +206,12 @@ class RestrictedWords(object):
     @staticmethod
     def find_restricted_words(content):
         """ Get words/phrases in 'content' that are restricted
-                - query for list of all restricted words
-                    - strip each word/phrase of spaces and check if they are a substring of 'stripped_content'
+                - the restricted words/phrases are matched in a single scan of 'stripped_content'
         """
-        restricted_words_obj = db.engine.execute("select * from restricted_word;")
-        restricted_words_dict = []
-        for row in restricted_words_obj:
-            if ' ' + row[1].upper().strip() + ' ' in content:
-                restricted_words_dict.append({'id': row[0], 'phrase': row[1].upper()})
-
-        return restricted_words_dict
+        return restricted_words_dictionary.get().find_words(content)
 
     @staticmethod
     def find_cnd_info(word_id):
         """ Get the condition info corresponding to the given word id
         """
-        get_cnd_id_sql = text("select cnd_id from restricted_word_condition where word_id = {}".format(word_id))
-        cnd_id_obj = db.engine.execute(get_cnd_id_sql)
-        cnd_ids = cnd_id_obj.fetchall()
-
-        cnd_obj_list = []
-        for id in cnd_ids:
-            cnd_id = id[0]
-            get_cnd_sql = text("select * from restricted_condition where cnd_id = {}".format(cnd_id))
-            cnd_obj_list.append(db.engine.execute(get_cnd_sql))
-
-        cnd_info = []
-        for obj in cnd_obj_list:
-            obj_tuple = obj.fetchall()[0]
-            cnd_text = obj_tuple[1]
-            cnd_allow_use = obj_tuple[2]
-            cnd_consent_req = obj_tuple[3]
-            cnd_consent_body = obj_tuple[4]
-            cnd_instr = obj_tuple[5]
-
-            cnd_info.append({'id': cnd_id,
-                             'text': cnd_text,
-                             'allow_use': cnd_allow_use,
-                             'consent_required': cnd_consent_req,
-                             'consenting_body': cnd_consent_body,
-                             'instructions': cnd_instr})
-
-        return cnd_info
+        return restricted_words_dictionary.get().find_cnd_info(word_id)
@@ -6,7 +6,10 @@ from flask import current_app
 from urllib import request, parse
 from urllib.error import HTTPError
 import re
-from namex.analytics.phonetic import first_vowels, designations, first_consonants, has_leading_vowel, replace_special_leading_sounds
+from namex.analytics.solr_client import solr_client
+from namex.services.cache import cache
+from namex.services.synonyms import fetch_synonyms_version
+from namex.analytics.phonetic import DESIGNATIONS, phonetic_key, phonetic_keys
 
 
 # Use this character in the search strings to indicate that the word should not by synonymized.
@@ -25,6 +28,11 @@ NO_SYNONYMS_PREFIX = '&fq=name_copy:'
 # Prefix used to indicate that we have synonyms.
 SYNONYMS_PREFIX = '&fq=name_with_synonyms:'
 
+# Prefix of the cached Solr analysis and synonyms API lookups, the synonym table version follows it so that editing
+# the synonyms invalidates every lookup made before.
+LOOKUP_CACHE_KEY_PREFIX = 'solr_lookup/'
+SYNONYMS_VERSION_CACHE_KEY = 'solr_lookup_version'
+
 
 class SolrQueries:
     PROX_SYN_CONFLICTS = 'proxsynconflicts'
@@ -182,6 +190,12 @@ class SolrQueries:
         else:
             connections = cls.get_phonetic_results(solr_base_url, name, phon_search_strs, name_tokens)
 
+        return cls.order_conflict_results(connections, bucket, list_name_split, stemmed_words, synonyms_for_word,
+                                          start, rows)
+
+    @classmethod
+    def order_conflict_results(cls, connections, bucket, list_name_split, stemmed_words, synonyms_for_word, start=0,
+                               rows=100):
         try:
             solr = {
                 'response': {
@@ -194,16 +208,23 @@ class SolrQueries:
                 'highlighting': []
             }
 
-            seen_ids = []
-            # commented out here and below because it is updated but never used for anything
-            # passed_names = []
+            # ids of the names already listed, a name is only listed in the first stack it is sorted in
+            seen_ids = set()
+            # every name is pre-processed once, however many stacks, synonyms and pivots it is compared with
+            processed_names = {}
+
+            def get_processed_name(name):
+                processed_name = processed_names.get(name)
+                if processed_name is None:
+                    processed_name = processed_names[name] = cls.name_pre_processing(name).upper()
+                return processed_name
+
+            pivot_list = [key.upper() for key in reversed(stemmed_words)]
             previous_stack_title = ''
             stem_count = len(stemmed_words) * 2 + 1
             count = -1
 
             for connection in connections:
-                seen_ordered_ids = seen_ids.copy()
-
                 result = connection[0]
                 solr['response']['numFound'] += result['response']['numFound']
                 result_name = parse.unquote(connection[1])
@@ -219,136 +240,101 @@ class SolrQueries:
                     stem_count -= 1
                     previous_stack_title = result_name
 
-                if len(result['response']['docs']) > 0:
+                docs = result['response']['docs']
+                if len(docs) > 0:
                     ordered_names = []
-                    missed_ids = []
                     # if there is a bracket in the stack title then there is a 'synonyms:(...)' clause
                     if 'synonyms:(' in result_name:
                         synonyms = result_name[result_name.find('(') + 1:result_name.find(')')]
-                        synonyms = [x.strip() for x in synonyms.split(',')]
-                        for synonym in synonyms:
-                            if synonym.upper() in synonyms_for_word:
-                                for word in synonyms_for_word[synonym.upper()]:
-                                    for item in result['response']['docs']:
-                                        processed_name = cls.name_pre_processing(item['name']).upper()
-                                        if item['id'] not in seen_ordered_ids and item['id'] not in missed_ids:
-                                            missed_ids.append(item['id'])
-                                        if item['id'] not in seen_ordered_ids:
-
-                                            if word.upper() in processed_name.upper():
-                                                seen_ordered_ids.append(item['id'])
-                                                ordered_names.append({'name_info': item, 'stems': [word.upper()]})
-                                                missed_ids.remove(item['id'])
-
-                                            elif word.upper()[:-1] in processed_name.upper() and len(word) > 4:
-                                                seen_ordered_ids.append(item['id'])
-                                                ordered_names.append({'name_info': item, 'stems': [word.upper()[:-1]]})
-                                                missed_ids.remove(item['id'])
-
-                    else:
-                        for item in result['response']['docs']:
-                            if item['id'] not in seen_ordered_ids:
-                                seen_ordered_ids.append(item['id'])
-                                ordered_names.append({'name_info': item, 'stems': []})
-
-                    if len(missed_ids) > 0:
-                        current_app.logger.debug(f'In {previous_stack_title} stack UNSORTED results: {missed_ids}')
-                        for missed in missed_ids.copy():
-                            for item in result['response']['docs']:
-                                if missed == item['id']:
-                                    ordered_names.append({'name_info': item, 'stems': []})
-                                    missed_ids.remove(missed)
+                        synonyms = [x.strip().upper() for x in synonyms.split(',')]
+                        words = [(word.upper(), word.upper()[:-1], len(word) > 4)
+                                 for synonym in synonyms if synonym in synonyms_for_word
+                                 for word in synonyms_for_word[synonym]]
+
+                        # each name is sorted under the first word it contains, the names are then listed in the
+                        # order of the words, ie. ordered on (word, position) in a single pass over the names
+                        matches = {}
+                        missed = {}
+                        if words:
+                            for position, item in enumerate(docs):
+                                if item['id'] in seen_ids:
+                                    continue
+
+                                processed_name = get_processed_name(item['name'])
+                                for index, (word, word_stem, long_word) in enumerate(words):
+                                    if word in processed_name:
+                                        stem = word
+                                    elif word_stem in processed_name and long_word:
+                                        stem = word_stem
+                                    else:
+                                        continue
+
+                                    if item['id'] not in matches or index < matches[item['id']][0]:
+                                        matches[item['id']] = (index, position, stem)
                                     break
+                                else:
+                                    missed.setdefault(item['id'], item)
+
+                        for index, position, stem in sorted(matches.values(), key=lambda match: match[:2]):
+                            ordered_names.append({'name_info': docs[position], 'stems': [stem]})
+                        seen_ids.update(matches)
 
-                        if len(missed_ids) > 0:
-                            # should never get here
-                            current_app.logger.error(f'In {previous_stack_title} stack MISSED results: {missed_ids}')
+                        missed = {missed_id: item for missed_id, item in missed.items() if missed_id not in matches}
+                        if len(missed) > 0:
+                            current_app.logger.debug(f'In {previous_stack_title} stack UNSORTED results: {list(missed)}')
+                            for item in missed.values():
+                                ordered_names.append({'name_info': item, 'stems': []})
 
-                    final_names_list = []
+                    else:
+                        for item in docs:
+                            if item['id'] not in seen_ids:
+                                seen_ids.add(item['id'])
+                                ordered_names.append({'name_info': item, 'stems': []})
 
                     # order based on alphabetization of swapped in synonyms
                     if bucket == 'synonym':
-
-                        pivot_list = []
-                        for key in name_tokens['stemmed_words']:
-                            pivot_list.insert(0, key.upper())
-                        seen_for_pivot = []
                         if '*' not in connection[1]:
                             count += 1
                         for pivot in pivot_list[count:]:
+                            if pivot not in synonyms_for_word:
+                                continue
+
+                            pivot_synonyms = [(synonym.upper(), synonym.upper()[:-1], len(synonym) > 4)
+                                              for synonym in synonyms_for_word[pivot]]
+
+                            # each name is sorted under the first synonym it contains, ordered on (synonym, position)
+                            matches = []
+                            for position, name in enumerate(ordered_names):
+                                processed_name = ' ' + get_processed_name(name['name_info']['name'])
+                                for index, (synonym, synonym_stem, long_synonym) in enumerate(pivot_synonyms):
+                                    if ' ' + synonym in processed_name:
+                                        matches.append((index, position, synonym, False))
+                                        break
+                                    elif ' ' + synonym_stem in processed_name and long_synonym:
+                                        matches.append((index, position, synonym_stem, True))
+                                        break
+                            matches.sort(key=lambda match: match[:2])
+
                             sorted_names = []
-                            if pivot in synonyms_for_word:
-                                for synonym in synonyms_for_word[pivot]:
-                                    for name in ordered_names:
-                                        if name['name_info']['id'] in seen_for_pivot:
-                                            pass
-                                        else:
-                                            processed_name = cls.name_pre_processing(name['name_info']['name'])
-
-                                            if ' ' + synonym.upper() in ' ' + processed_name.upper():
-                                                stem = [synonym.upper()]
-                                                if stem[0] not in name['stems']:
-                                                    sorted_names.append(
-                                                        {
-                                                            'name_info': name['name_info'],
-                                                            'stems': stem + name['stems'].copy()
-                                                        }
-                                                    )
-                                                else:
-                                                    sorted_names.append(
-                                                        {'name_info': name['name_info'], 'stems': name['stems']})
-
-                                                seen_for_pivot.append(name['name_info']['id'])
-                                                # if name['name_info']['name'] in passed_names:
-                                                #     passed_names.remove(name['name_info']['name'])
-
-                                            elif ' ' + synonym.upper()[:-1] in ' ' + processed_name.upper() and len(synonym) > 4:
-                                                stem = [synonym.upper()[:-1]]
-                                                stack_title_info = solr['response']['docs'].pop()
-                                                if stem[0] not in name['stems']:
-                                                    sorted_names.append({'name_info': name['name_info'], 'stems': stem + name['stems'].copy()})
-                                                    if stem[0] not in stack_title_info['stems'] and synonym.upper() in stack_title_info['stems']:
-                                                        stack_title_info['stems'] += stem
-                                                else:
-                                                    sorted_names.append(
-                                                        {'name_info': name['name_info'], 'stems': name['stems']})
-                                                solr['response']['docs'].append(stack_title_info)
-
-                                                seen_for_pivot.append(name['name_info']['id'])
-                                                # if name['name_info']['name'] in passed_names:
-                                                #     passed_names.remove(name['name_info']['name'])
-
-                                            # elif name['name_info']['name'] not in passed_names:
-                                            #     passed_names.append(name['name_info']['name'])
-
-                            no_duplicates = []
-                            for ordered in ordered_names:
-                                duplicate = False
-                                for sorted in sorted_names:
-                                    if ordered['name_info']['name'] == sorted['name_info']['name']:
-                                        duplicate = True
-                                if not duplicate:
-                                    no_duplicates.append(ordered)
-
-                            ordered_names = sorted_names.copy() + no_duplicates.copy()
-
-                            for seen in seen_for_pivot:
-                                if seen not in seen_ordered_ids:
-                                    seen_ordered_ids.append(seen)
-
-                            seen_for_pivot.clear()
-                            sorted_names.clear()
-
-                        final_names_list += ordered_names
+                            for index, position, stem, is_synonym_stem in matches:
+                                name = ordered_names[position]
+                                if stem not in name['stems']:
+                                    sorted_names.append({'name_info': name['name_info'], 'stems': [stem] + name['stems']})
+                                    stack_title_info = solr['response']['docs'][-1]
+                                    if is_synonym_stem and stem not in stack_title_info['stems'] \
+                                            and pivot_synonyms[index][0] in stack_title_info['stems']:
+                                        stack_title_info['stems'] += [stem]
+                                else:
+                                    sorted_names.append({'name_info': name['name_info'], 'stems': name['stems']})
+                                seen_ids.add(name['name_info']['id'])
+
+                            sorted_name_values = {name['name_info']['name'] for name in sorted_names}
+                            ordered_names = sorted_names + [name for name in ordered_names
+                                                            if name['name_info']['name'] not in sorted_name_values]
                     else:
-                        for item in ordered_names:
-                            final_names_list.append(item)
-                            seen_ordered_ids.append(item['name_info']['id'])
-
-                    seen_ids += seen_ordered_ids.copy()
-                    seen_ordered_ids.clear()
+                        seen_ids.update(item['name_info']['id'] for item in ordered_names)
 
-                    solr['response']['docs'] += final_names_list
+                    solr['response']['docs'] += ordered_names
 
             results = {"response": {"numFound": solr['response']['numFound'],
                                     "maxScore": solr['response']['maxScore'],
@@ -367,7 +353,8 @@ class SolrQueries:
     def get_synonym_results(cls, solr_base_url, name, prox_search_strs, old_alg_search_strs, name_tokens, exact_phrase, start=0, rows=100):
 
         try:
-            connections = []
+            queries = []
+            labels = []
             if name == '':
                 name = '*'
                 prox_search_strs.append((['*'], '', '', 1))
@@ -390,10 +377,10 @@ class SolrQueries:
                             exact_phrase_clause=exact_phrase_clause,
                         )
                         current_app.logger.debug('Query: ' + query)
-                        connections.append((json.load(request.urlopen(query)),
-                                            '----' + prox_search_str.replace('\\', '').replace('*', '').replace('@', '')
-                                            + synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ')
-                                            + ' - PROXIMITY SEARCH'))
+                        queries.append(query)
+                        labels.append('----' + prox_search_str.replace('\\', '').replace('*', '').replace('@', '')
+                                      + synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ')
+                                      + ' - PROXIMITY SEARCH')
 
                 query = solr_base_url + SolrQueries.queries['oldsynconflicts'].format(
                     start=start,
@@ -404,11 +391,14 @@ class SolrQueries:
                     name_copy_clause=cls._get_name_copy_clause(name)
                 )
                 current_app.logger.debug('Query: ' + query)
-                connections.append((json.load(request.urlopen(query)), '----' +
-                                    old_alg_search_str.replace('\\', '').replace('%20', ' ').replace('**', '*') +
-                                    synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ') +
-                                    ' - EXACT WORD ORDER'))
-            return connections
+                queries.append(query)
+                labels.append('----' +
+                              old_alg_search_str.replace('\\', '').replace('%20', ' ').replace('**', '*') +
+                              synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ') +
+                              ' - EXACT WORD ORDER')
+
+            # The queries of the bucket run concurrently, the connections are kept in the order of the stacks
+            return list(zip(solr_client.get_all_json(queries), labels))
 
         except Exception as err:
             current_app.logger.error(err, query)
@@ -420,7 +410,8 @@ class SolrQueries:
             if search_strs == []:
                 connections = [({'response': {'numFound': 0, 'docs': []}, 'responseHeader':{'params': {'q': '*'}}}, '----*')]
             else:
-                connections = []
+                queries = []
+                labels = []
                 for str_tuple in search_strs:
                     synonyms_clause = cls._get_synonyms_clause(str_tuple[1], str_tuple[2], name_tokens)
                     for name in str_tuple[0]:
@@ -433,9 +424,10 @@ class SolrQueries:
                             exact_name='name_no_synonyms:\"' + start_str.replace(' ', '%20') + '\"~{}'.format(str_tuple[3]),
                         )
                         current_app.logger.debug('Query: ' + query)
-                        result = json.load(request.urlopen(query))
-                        connections.append((result, '----' + start_str.replace('*', '').replace('@', '') +
-                                            synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ')))
+                        queries.append(query)
+                        labels.append('----' + start_str.replace('*', '').replace('@', '') +
+                                      synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', '))
+                connections = list(zip(solr_client.get_all_json(queries), labels))
             return connections
 
         except Exception as err:
@@ -448,7 +440,9 @@ class SolrQueries:
             if search_strs == []:
                 connections = [({'response': {'numFound': 0, 'docs': []}, 'responseHeader':{'params': {'q': '*'}}}, '----*')]
             else:
-                connections = []
+                queries = []
+                start_strs = []
+                labels = []
                 for str_tuple in search_strs:
                     synonyms_clause = cls._get_synonyms_clause(str_tuple[1], str_tuple[2], name_tokens)
                     start_str = str_tuple[0]
@@ -460,11 +454,16 @@ class SolrQueries:
                         exact_name='name_no_synonyms:\"' + start_str.replace(' ', '%20') + '\"~{}'.format(str_tuple[3]),
                     )
                     current_app.logger.debug('Query: ' + query)
-                    result = json.load(request.urlopen(query))
+                    queries.append(query)
+                    start_strs.append(start_str)
+                    labels.append('----' + start_str.replace('*', '').replace('@', '') +
+                                  synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', '))
+
+                connections = []
+                for result, start_str, label in zip(solr_client.get_all_json(queries), start_strs, labels):
                     docs = result['response']['docs']
                     result['response']['docs'] = cls.post_treatment(docs, start_str)
-                    connections.append((result, '----' + start_str.replace('*', '').replace('@', '') +
-                                        synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ')))
+                    connections.append((result, label))
             return connections
 
         except Exception as err:
@@ -743,6 +742,25 @@ class SolrQueries:
 
         return multiples
 
+    # Version of the synonym table the cached lookups are keyed on, checked every REFERENCE_DATA_TTL seconds.
+    @classmethod
+    def _get_lookup_version(cls):
+        version = cache.get(SYNONYMS_VERSION_CACHE_KEY)
+        if version is None:
+            version = fetch_synonyms_version() or ''
+            cache.set(SYNONYMS_VERSION_CACHE_KEY, version, timeout=current_app.config.get('REFERENCE_DATA_TTL', 300))
+        return version
+
+    # Return the cached result of the lookup, calling fetch on a miss. Failed lookups raise and are not cached.
+    @classmethod
+    def _cached_lookup(cls, key, fetch):
+        key = LOOKUP_CACHE_KEY_PREFIX + cls._get_lookup_version() + '/' + key
+        value = cache.get(key)
+        if value is None:
+            value = fetch()
+            cache.set(key, value, timeout=current_app.config.get('SOLR_LOOKUP_CACHE_TIMEOUT', 300))
+        return value
+
     # Call the synonyms API for the given token.
 
     @classmethod
@@ -751,6 +769,11 @@ class SolrQueries:
         if not solr_synonyms_api_url:
             raise Exception('SOLR: SOLR_SYNONYMS_API_URL is not set')
 
+        return cls._cached_lookup('exists/' + col + '/' + parse.quote(token),
+                                  lambda: cls._fetch_synonyms_exist(solr_synonyms_api_url, token, col))
+
+    @classmethod
+    def _fetch_synonyms_exist(cls, solr_synonyms_api_url, token, col):
         # If the web service call fails, the caller will catch and then return a 500 for us.
         query = solr_synonyms_api_url + '/synonyms/' + col + '/' + parse.quote(token)
         current_app.logger.debug('Query: ' + query)
@@ -774,6 +797,11 @@ class SolrQueries:
         if not solr_synonyms_api_url:
             raise Exception('SOLR: SOLR_SYNONYMS_API_URL is not set')
 
+        return cls._cached_lookup('synonyms/' + parse.quote(token),
+                                  lambda: cls._fetch_synonym_list(solr_synonyms_api_url, token))
+
+    @classmethod
+    def _fetch_synonym_list(cls, solr_synonyms_api_url, token):
         # If the web service call fails, the caller will catch and then return a 500 for us.
         query = solr_synonyms_api_url + '/synonyms/' + 'stems_text' + '/' + parse.quote(token)
         current_app.logger.debug('Query: ' + query)
@@ -929,7 +957,11 @@ class SolrQueries:
 
     @classmethod
     def combine_multi_word_synonyms(cls, name, solr_base_url):
+        return cls._cached_lookup('combined/' + parse.quote(name.strip()),
+                                  lambda: cls._fetch_combined_multi_word_synonyms(name, solr_base_url))
 
+    @classmethod
+    def _fetch_combined_multi_word_synonyms(cls, name, solr_base_url):
         max_len = len(name.split()) * 2
         query = solr_base_url + \
             '/solr/possible.conflicts/analysis/field?analysis.fieldvalue={name}&analysis.fieldname=name' \
@@ -1037,6 +1069,11 @@ class SolrQueries:
     @classmethod
     def word_pre_processing(cls, list_of_words, type, solr_base_url):
         list_of_words = [w.replace('*', '') for w in list_of_words]
+        return cls._cached_lookup('analysis/' + type + '/' + parse.quote(json.dumps(list_of_words)),
+                                  lambda: cls._fetch_word_pre_processing(list_of_words, type, solr_base_url))
+
+    @classmethod
+    def _fetch_word_pre_processing(cls, list_of_words, type, solr_base_url):
         words_to_process = ''
         for item in list_of_words:
             words_to_process += ' ' + item
@@ -1137,63 +1174,27 @@ class SolrQueries:
 
     @classmethod
     def post_treatment(cls, docs, query_name):
-        query_name = query_name.upper()
-        names = []
-        count = 0
+        qwords = query_name.upper().split()
+        # a candidate is kept when every word of the query sounds like one of its words, designations never match
+        if any(qword in DESIGNATIONS for qword in qwords):
+            return []
+        query_keys = phonetic_keys(qwords)
+
+        names = {}
         for candidate in docs:
-            count += 1
             candidate_name = candidate['name'].upper()
-            words = candidate_name.split()
-            qwords = query_name.split()
-
-            count = 0
-            for qword in qwords:
-                found = False
-                for word in words:
-                    if word not in designations() and qword not in designations():
-                        should_keep = cls.keep_phonetic_match(word, qword)
-                        if should_keep:
-                            if not found:
-                                count += 1
-                            found = True
-
-            if count == len(qwords):
+            if query_keys <= phonetic_keys(candidate_name.split()):
                 cls.keep_candidate(candidate, candidate_name, names)
 
-        return names
+        return list(names.values())
 
     @classmethod
     def keep_phonetic_match(cls, word, query):
-        word = replace_special_leading_sounds(word)
-        query = replace_special_leading_sounds(query)
-
-        word_has_leading_vowel = has_leading_vowel(word)
-        query_has_leading_vowel = has_leading_vowel(query)
-
-        word_first_consonant = first_consonants(word)
-        query_first_consonant = first_consonants(query)
-
-        query_first_vowels = first_vowels(query, query_has_leading_vowel)
-        word_first_vowels = first_vowels(word, word_has_leading_vowel)
-
-        if query_has_leading_vowel:
-            query_sound = query_first_vowels + query_first_consonant
-        else:
-            query_sound = query_first_consonant + query_first_vowels
-
-        if word_has_leading_vowel:
-            word_sound = word_first_vowels + word_first_consonant
-        else:
-            word_sound = word_first_consonant + word_first_vowels
-
-        if word_sound == query_sound:
-            return True
-
-        return False
+        return phonetic_key(word) == phonetic_key(query)
 
     @classmethod
     def keep_candidate(cls, candidate, name, names):
-        if len([doc['id'] for doc in names if doc['id'] == candidate['id']]) == 0:
-            names.append({'name': name, 'id': candidate['id'], 'source': candidate['source'],
-                          'jurisdiction': candidate.get('jurisdiction', ''),
-                          'start_date': candidate.get('start_date', '')})
+        if candidate['id'] not in names:
+            names[candidate['id']] = {'name': name, 'id': candidate['id'], 'source': candidate['source'],
+                                      'jurisdiction': candidate.get('jurisdiction', ''),
+                                      'start_date': candidate.get('start_date', '')}
@@ -0,0 +1,122 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+from namex.services.cache import cache
+
+'''
+Shared HTTP client for the Solr queries.
+
+Connections to Solr are kept alive in a pool shared by every request of the process, and the queries of a conflict
+bucket are dispatched concurrently on a bounded thread pool. Results are always returned in the order of the queries.
+
+The results of the lookups the examiners repeat as they type can be cached, keyed on the index version of the core
+they query. The version is checked at most every SOLR_CORE_VERSION_CHECK_INTERVAL seconds, so a commit to the core by
+any process invalidates them, and right away when this process updates the core.
+'''
+
+# Prefixes of the cached match lookups and of the index version of a core they are keyed on
+MATCH_CACHE_KEY_PREFIX = 'solr_match/'
+CORE_VERSION_CACHE_KEY_PREFIX = 'solr_core_version/'
+
+
+class SolrClient:
+    def __init__(self):
+        self._session = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    max_queries = current_app.config.get('SOLR_MAX_CONCURRENT_QUERIES', 8)
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=max_queries, pool_maxsize=max_queries)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+                    self._executor = ThreadPoolExecutor(max_workers=max_queries, thread_name_prefix='solr')
+        return self._session, self._executor
+
+    @staticmethod
+    def _get_timeout():
+        return current_app.config.get('SOLR_CONNECT_TIMEOUT', 5), current_app.config.get('SOLR_QUERY_TIMEOUT', 30)
+
+    @staticmethod
+    def _get(session, query, timeout):
+        start = time.perf_counter()
+        response = session.get(query, timeout=timeout)
+        response.raise_for_status()
+        return response.json(), time.perf_counter() - start
+
+    def get_json(self, query):
+        """Run a single Solr query, reusing a pooled connection."""
+        return self.get_all_json([query])[0]
+
+    def get_all_json(self, queries):
+        """Run the Solr queries concurrently and return their json results in the order of the queries.
+
+        The first failing query raises, as urllib.request.urlopen would have.
+        """
+        if not queries:
+            return []
+
+        session, executor = self._get_pool()
+        timeout = self._get_timeout()
+
+        start = time.perf_counter()
+        futures = [executor.submit(self._get, session, query, timeout) for query in queries]
+        results = []
+        for query, future in zip(queries, futures):
+            result, elapsed = future.result()
+            current_app.logger.debug('SOLR query took {:.3f}s: {}'.format(elapsed, query))
+            results.append(result)
+
+        current_app.logger.debug('SOLR {} queries took {:.3f}s'.format(len(queries), time.perf_counter() - start))
+        return results
+
+    def get_core_version(self, core):
+        """Return the index version of the core, or None when Solr can't tell."""
+        key = CORE_VERSION_CACHE_KEY_PREFIX + core
+        version = cache.get(key)
+        if version is None:
+            session, _ = self._get_pool()
+            url = current_app.config.get('SOLR_BASE_URL') + '/solr/' + core + '/admin/luke?show=index&numTerms=0&wt=json'
+            try:
+                answer, _ = self._get(session, url, self._get_timeout())
+                version = str(answer['index']['version'])
+            except Exception as err:  # pylint: disable=broad-except
+                current_app.logger.warning('SOLR index version of {} unavailable: {}'.format(core, repr(err)))
+                return None
+            cache.set(key, version, timeout=current_app.config.get('SOLR_CORE_VERSION_CHECK_INTERVAL', 5))
+        return version
+
+    def get_cached_json(self, core, query_key, query):
+        """Run the Solr query on the core, reusing the result of the same query_key until the core is updated.
+
+        Nothing is cached when SOLR_MATCH_CACHE_TIMEOUT is 0 or the index version of the core is unavailable.
+        """
+        timeout = current_app.config.get('SOLR_MATCH_CACHE_TIMEOUT', 60)
+        version = self.get_core_version(core) if timeout else None
+        if version is None:
+            return self.get_json(query)
+
+        key = MATCH_CACHE_KEY_PREFIX + core + '/' + version + '/' + query_key
+        result = cache.get(key)
+        if result is None:
+            result = self.get_json(query)
+            cache.set(key, result, timeout=timeout)
+        return result
+
+    @staticmethod
+    def invalidate(core):
+        """Check the index version of the core again, after this process updated it."""
+        cache.delete(CORE_VERSION_CACHE_KEY_PREFIX + core)
+
+
+solr_client = SolrClient()
@@ -26,6 +26,9 @@ from .virtual_word_condition import VirtualWordCondition
 from .nr_number import NRNumber
 from .nr_number_exclude import NRNumberExclude
 from .nr_number_lifespan import NRNumberLifespan
+from .nr_number_pool import NRNumberPool
+from .nr_submission_fingerprint import NRSubmissionFingerprint
+from .outbox_message import OutboxMessage
 from .payment import Payment
 from .hotjar_tracking import HotjarTracking
 from .payment_society import PaymentSociety
@@ -1,7 +1,7 @@
 """Events keep an audit trail of all changes submitted to the datastore
 
 """
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, literal_column
 
 from . import db
 from namex.exceptions import BusinessException
@@ -23,6 +23,8 @@ class Event(db.Model):
     action = db.Column(db.String(1000))
     jsonZip = db.Column('json_zip', db.Text)
     eventJson = db.Column('event_json', JSONB)
+    # compact events store the changes from the last full snapshot of the NR here instead of in eventJson
+    eventJsonDiff = db.Column('event_json_diff', JSONB(none_as_null=True))
 
     # relationships
     stateCd = db.Column('state_cd', db.String(20), db.ForeignKey('states.cd'))
@@ -54,6 +56,46 @@ class Event(db.Model):
         db.session.add(self)
         db.session.commit()
 
+    # keys of the json of an NR, only the events holding it are full snapshots (not the GETs, partial PATCHes, ...)
+    SNAPSHOT_KEYS = ('nrNum', 'names')
+
+    @classmethod
+    def get_last_snapshots(cls, nr_ids):
+        """Return the (event id, eventJson) of the last full snapshot event of each NR."""
+        if not nr_ids:
+            return {}
+        # the json is mostly stored as a json string, #>> '{}' gives its text either way
+        event_text = cls.eventJson.op('#>>', return_type=db.Text)(literal_column("'{}'"))
+        rows = db.session.query(cls.nrId, cls.id, cls.eventJson). \
+            filter(cls.nrId.in_(nr_ids), cls.eventJsonDiff.is_(None),
+                   *[event_text.like('%"{}": %'.format(key)) for key in cls.SNAPSHOT_KEYS]). \
+            distinct(cls.nrId). \
+            order_by(cls.nrId, cls.id.desc()).all()
+        return {row.nrId: (row.id, row.eventJson) for row in rows}
+
+    @classmethod
+    def is_snapshot(cls, data):
+        """Whether the data of an event is the full json of an NR."""
+        return isinstance(data, dict) and all(key in data for key in cls.SNAPSHOT_KEYS)
+
+    @staticmethod
+    def create_json_diff(base_id, base_data, data):
+        """Return the diff from the data of the base event to the data, None when they aren't both dicts."""
+        if not isinstance(base_data, dict) or not isinstance(data, dict):
+            return None
+        return {
+            'base': base_id,
+            'changed': {key: value for key, value in data.items() if key not in base_data or base_data[key] != value},
+            'removed': [key for key in base_data if key not in data]
+        }
+
+    @staticmethod
+    def apply_json_diff(base_data, diff):
+        """Return the data of a compact event, from the data of its base event."""
+        data = {key: value for key, value in base_data.items() if key not in diff['removed']}
+        data.update(diff['changed'])
+        return data
+
     def save_to_session(self):
         db.session.add(self)
 
@@ -5,7 +5,7 @@ from . import db, ma
 class NRNumberLifespan(db.Model):
     __tablename__ = 'nr_number_lifespan'
     nr_num = db.Column(db.String(10), primary_key=True)
-    nr_timestamp = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    nr_timestamp = db.Column(db.DateTime(timezone=True), default=datetime.utcnow, index=True)
 
     @classmethod
     def check_nr_num_lifespan(cls, nr_num):
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from sqlalchemy import text
+
+from . import db
+
+
+# Pops a pooled number and starts its lifespan in a single statement. A number that got used or excluded since it
+# was pooled is dropped from the pool without being returned.
+CLAIM_NR_NUM_SQL = text(
+    "with claimed as ("
+    " delete from nr_number_pool where nr_num = ("
+    "  select nr_num from nr_number_pool limit 1 for update skip locked)"
+    " returning nr_num) "
+    "insert into nr_number_lifespan (nr_num, nr_timestamp) "
+    "select claimed.nr_num, now() from claimed "
+    "where not exists (select 1 from requests r where r.nr_num = claimed.nr_num) "
+    "and not exists (select 1 from nr_number_exclude e where e.nr_num = claimed.nr_num) "
+    "on conflict (nr_num) do nothing "
+    "returning nr_num"
+)
+
+# Random candidates in the NR 0000001 - NR 9999999 range, less the ones used, excluded, in their lifespan or pooled
+REFILL_NR_NUM_POOL_SQL = text(
+    "insert into nr_number_pool (nr_num, created_at) "
+    "select distinct candidate.nr_num, now() from ("
+    " select 'NR ' || lpad((floor(random() * 9999999) + 1)::int::text, 7, '0') as nr_num"
+    " from generate_series(1, :count)) candidate "
+    "where not exists (select 1 from requests r where r.nr_num = candidate.nr_num) "
+    "and not exists (select 1 from nr_number_exclude e where e.nr_num = candidate.nr_num) "
+    "and not exists (select 1 from nr_number_lifespan l where l.nr_num = candidate.nr_num) "
+    "on conflict (nr_num) do nothing"
+)
+
+
+class NRNumberPool(db.Model):
+    __tablename__ = 'nr_number_pool'
+    nr_num = db.Column(db.String(10), primary_key=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+
+    @classmethod
+    def claim_nr_num(cls):
+        """Claim a pooled number, returns None when the claimed number can't be used or the pool is empty."""
+        nr_num = db.session.execute(CLAIM_NR_NUM_SQL).scalar()
+        db.session.commit()
+        return nr_num
+
+    @classmethod
+    def refill(cls, count):
+        """Add up to count new numbers to the pool, returns the number added."""
+        added = db.session.execute(REFILL_NR_NUM_POOL_SQL, {'count': count}).rowcount
+        db.session.commit()
+        return added
+
+    @classmethod
+    def get_size(cls):
+        return db.session.query(db.func.count(cls.nr_num)).scalar()
+
+    def json(self):
+        return {'nr_num': self.nr_num, 'created_at': self.created_at}
@@ -0,0 +1,68 @@
+import hashlib
+import re
+from datetime import datetime
+
+from sqlalchemy import text
+
+from . import db
+
+
+# Takes the fingerprint unless it is held by a submission that is still in its window and whose NR, once created,
+# is still waiting on payment or examination. The primary key makes concurrent claims of the same fingerprint
+# race safe: only one of them gets the row back.
+CLAIM_FINGERPRINT_SQL = text(
+    "insert into nr_submission_fingerprints (fingerprint, nr_id, expires_at) "
+    "values (:fingerprint, null, now() + make_interval(secs => :ttl)) "
+    "on conflict (fingerprint) do update set nr_id = null, expires_at = excluded.expires_at "
+    "where nr_submission_fingerprints.expires_at <= now() "
+    "or (nr_submission_fingerprints.nr_id is not null and not exists ("
+    " select 1 from requests r where r.id = nr_submission_fingerprints.nr_id"
+    " and r.state_cd in ('DRAFT', 'PENDING_PAYMENT'))) "
+    "returning fingerprint"
+)
+
+# Drops a few expired fingerprints, skipping the ones another submission is busy with
+SWEEP_FINGERPRINTS_SQL = text(
+    "delete from nr_submission_fingerprints where fingerprint in ("
+    " select fingerprint from nr_submission_fingerprints where expires_at <= now()"
+    " limit :limit for update skip locked)"
+)
+
+
+class NRSubmissionFingerprint(db.Model):
+    """Short lived fingerprint of a public NR submission, used to turn away the same submission made twice."""
+
+    __tablename__ = 'nr_submission_fingerprints'
+    fingerprint = db.Column(db.String(64), primary_key=True)
+    nr_id = db.Column(db.Integer, nullable=True)
+    expires_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow, index=True)
+
+    SWEEP_LIMIT = 20
+
+    @staticmethod
+    def build(email, names):
+        """Fingerprint of the submitter email and the name choices, in order, ignoring case and extra whitespace."""
+        normalized = [(email or '').strip().lower()]
+        normalized.extend(re.sub(r'\s+', ' ', (name or '').strip()).upper() for name in names)
+        return hashlib.sha256('|'.join(normalized).encode('utf-8')).hexdigest()
+
+    @classmethod
+    def claim(cls, fingerprint, ttl):
+        """Claim the fingerprint for ttl seconds, returns False when the same submission was already made."""
+        db.session.execute(SWEEP_FINGERPRINTS_SQL, {'limit': cls.SWEEP_LIMIT})
+        claimed = db.session.execute(CLAIM_FINGERPRINT_SQL, {'fingerprint': fingerprint, 'ttl': ttl}).scalar()
+        db.session.commit()
+        return claimed is not None
+
+    @classmethod
+    def assign(cls, fingerprint, nr_id):
+        """Link the claimed fingerprint to the NR created for it."""
+        cls.query.filter_by(fingerprint=fingerprint).update({'nr_id': nr_id}, synchronize_session=False)
+        db.session.commit()
+
+    @classmethod
+    def release(cls, fingerprint):
+        """Give the fingerprint back, so a submission that failed can be retried straight away."""
+        db.session.rollback()
+        cls.query.filter_by(fingerprint=fingerprint).delete(synchronize_session=False)
+        db.session.commit()
@@ -0,0 +1,20 @@
+"""Messages waiting to be published to the queue, written in the transaction of the change they announce."""
+from datetime import datetime
+
+from . import db
+
+
+class OutboxMessage(db.Model):
+    __tablename__ = 'outbox_messages'
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    nrNum = db.Column('nr_num', db.String(10), index=True)
+    topic = db.Column(db.String(200), nullable=False)
+    payload = db.Column(db.LargeBinary, nullable=False)
+    createdDate = db.Column('created_date', db.DateTime(timezone=True), default=datetime.utcnow)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    lastError = db.Column('last_error', db.String(1000))
+
+    @classmethod
+    def insert_values(cls, topic, payload, nr_num):
+        return {'nr_num': nr_num, 'topic': topic, 'payload': payload, 'created_date': datetime.utcnow(), 'attempts': 0}
@@ -113,7 +113,7 @@ def update_nr_state(mapper, connection, target):
                     WHERE id={nr.id}
                     """
                 )
-                queue_util.send_name_request_state_msg(nr.nrNum, State.DRAFT, State.PENDING_PAYMENT)
+                queue_util.send_name_request_state_msg(nr.nrNum, State.DRAFT, State.PENDING_PAYMENT, connection)
 
 
 
@@ -127,4 +127,4 @@ def after_update_payment(mapper, connection, target):
     if target.payment_action in [Payment.PaymentActions.REAPPLY.value, Payment.PaymentActions.UPGRADE.value] \
             and len(payment_completion_date_history.added) > 0:
         option = 'renewal' if target.payment_action == Payment.PaymentActions.REAPPLY.value else 'upgrade'
-        queue_util.publish_email_notification(nr.nrNum, option)
+        queue_util.publish_email_notification(nr.nrNum, option, connection=connection)
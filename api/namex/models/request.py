@@ -11,11 +11,12 @@ from . import db, ma
 from flask import current_app
 # TODO: Only trace if LOCAL_DEV_MODE / DEBUG conf exists
 # from flask_sqlalchemy import get_debug_queries
+from namex.services.cache import cache
 from namex.services.lookup import nr_filing_actions
 from namex.exceptions import BusinessException
 from namex.utils import queue_util
 from sqlalchemy import event
-from sqlalchemy.orm import backref
+from sqlalchemy.orm import Session, backref, joinedload
 from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.dialects import postgresql
 from sqlalchemy import and_, func, Date
@@ -29,6 +30,7 @@ from .payment import Payment
 from .event import Event
 from .state import State, StateSchema
 from datetime import datetime, timedelta
+import copy
 import re
 
 from namex.constants import ValidSources, NameState, \
@@ -39,6 +41,10 @@ from namex.constants import ValidSources, NameState, \
 from ..criteria.request.query_criteria import RequestConditionCriteria
 from ..services.statistics import UnitTime
 
+REQUEST_JSON_CACHE_KEY_PREFIX = 'request_json/'
+# session.info key of the json snapshots of the NRs serialized in the session, by NR id
+REQUEST_JSON_SNAPSHOTS = 'request_json_snapshots'
+
 
 class Request(db.Model):
     __tablename__ = 'requests'
@@ -166,16 +172,58 @@ class Request(db.Model):
         pass
 
     def json(self):
-        # get previous NR number from legacy requestId and previousRequestId fields
-        previousNr = None
-        if self.previousRequestId:
-            previousNr = self.query.filter_by(requestId=self.previousRequestId).first()
-        try:
-            # we just want the NR number, or null if it doesn't exist
-            previousNr = previousNr.nrNum
-        except:
-            previousNr = None
+        return Request.json_list([self])[0]
 
+    @classmethod
+    def json_list(cls, nrs):
+        """Serialize the NRs, their related rows are loaded with a fixed number of queries whatever the number of NRs.
+
+        The json of an NR is kept as a snapshot in the session, reused until the session flushes a change of the NR
+        or its related rows, so an NR serialized for its event, the logs and the response is only serialized once.
+
+        With REQUEST_JSON_CACHE_TIMEOUT set, the json of the unmodified NRs is cached by id and lastUpdate. Edits of
+        the related rows that don't touch the NR itself aren't seen until the cached json expires.
+        """
+        cache_timeout = current_app.config.get('REQUEST_JSON_CACHE_TIMEOUT', 0)
+        results = [None] * len(nrs)
+
+        # the snapshots of the session are only valid while it has no pending change
+        snapshots = db.session.info.setdefault(REQUEST_JSON_SNAPSHOTS, {})
+        use_snapshots = not (db.session.new or db.session.dirty or db.session.deleted)
+        if use_snapshots:
+            for index, nr in enumerate(nrs):
+                snapshot = snapshots.get(nr.id) if nr.id is not None else None
+                if snapshot is not None and snapshot[0] == nr.lastUpdate:
+                    results[index] = copy.deepcopy(snapshot[1])
+
+        cache_keys = {}
+        if cache_timeout:
+            for index, nr in enumerate(nrs):
+                if results[index] is not None:
+                    continue
+                state = sqlalchemy.inspect(nr)
+                if state.persistent and not state.modified and nr.lastUpdate:
+                    cache_keys[index] = '{}{}/{}'.format(REQUEST_JSON_CACHE_KEY_PREFIX, nr.id,
+                                                         nr.lastUpdate.isoformat())
+            cached = cache.get_many(*cache_keys.values()) if cache_keys else []
+            for index, nr_json in zip(cache_keys, cached):
+                results[index] = nr_json
+
+        to_serialize = [index for index, nr_json in enumerate(results) if nr_json is None]
+        graph = RequestJsonGraph([nrs[index] for index in to_serialize])
+        for index in to_serialize:
+            results[index] = nrs[index]._json(graph)
+            if index in cache_keys:
+                cache.set(cache_keys[index], results[index], timeout=cache_timeout)
+
+        if use_snapshots:
+            for index, nr in enumerate(nrs):
+                if nr.id is not None and sqlalchemy.inspect(nr).persistent:
+                    snapshots[nr.id] = (nr.lastUpdate, copy.deepcopy(results[index]))
+
+        return results
+
+    def _json(self, graph):
         nr_json = {
             'id': self.id,
             'submittedDate': self.submittedDate.isoformat() if self.submittedDate else None,
@@ -202,15 +250,16 @@ class Request(db.Model):
             'furnished': self.furnished if (self.furnished is not None) else 'N',
             'hasBeenReset': self.hasBeenReset,
             'previousRequestId': self.previousRequestId,
-            'previousNr': previousNr,
+            # we just want the NR number, or null if it doesn't exist
+            'previousNr': graph.previous_nr_nums.get(self.previousRequestId),
             'submitCount': self.submitCount,
             'corpNum': self.corpNum,
             'tradeMark': self.tradeMark,
             'homeJurisNum': self.homeJurisNum,
             'names': [name.as_dict() for name in self.names],
             'applicants': '' if (len(self.applicants) < 1) else self.applicants[0].as_dict(),
-            'comments': [comment.as_dict() for comment in self.comments.all()],
-            'nwpta': [partner_name.as_dict() for partner_name in self.partnerNS.all()],
+            'comments': [comment.as_dict() for comment in graph.get_comments(self)],
+            'nwpta': [partner_name.as_dict() for partner_name in graph.get_partner_names(self)],
             'checkedOutBy': self.checkedOutBy,
             'checkedOutDt': self.checkedOutDt.isoformat() if self.checkedOutDt else None,
             'notifiedBeforeExpiry': self.notifiedBeforeExpiry,
@@ -254,35 +303,25 @@ class Request(db.Model):
         }, 403)
 
     @classmethod
-    def get_queued_oldest(cls, userObj, priority_queue):
+    def get_queued_oldest(cls, userObj, priority_queue=False):
         """
         Gets the Next NR# from the database
         It sets the STATUS == INPROGRESS
         and then returns the NR or
         error out with a SQLAlchemy Error type
+        The checkout is recorded as a GET event, in the same transaction as the INPROGRESS transition
         """
+        from namex.services import EventRecorder
+
         existing_nr = Request.get_inprogress(userObj)
 
         if existing_nr:
             current_app.logger.info('Existing NR found, returning: {}'.format(existing_nr.nrNum))
+            db.session.add(EventRecorder.create_event(userObj, Event.GET, existing_nr, {}))
+            db.session.commit()
             return existing_nr
 
-        # this will error if there's nothing in the queue - likelihood ~ 0
-        result = None
-        if priority_queue:
-            result = db.session.query(Request). \
-                filter(
-                    Request.stateCd.in_([State.DRAFT]),
-                    Request.nrNum.notlike('NR L%')). \
-                order_by(Request.priorityCd.desc(), Request.submittedDate.asc()). \
-                with_for_update().first()
-        else:
-            result = db.session.query(Request). \
-                filter(
-                    Request.stateCd.in_([State.DRAFT]),
-                    Request.nrNum.notlike('NR L%')). \
-                order_by(Request.submittedDate.asc()). \
-                with_for_update().first()
+        result = Request.get_queued_oldest_query(db.session, priority_queue).first()
 
         if result is None:
             raise BusinessException(None, 404)
@@ -292,9 +331,28 @@ class Request(db.Model):
         result.userId = userObj.id
 
         db.session.add(result)
+        db.session.add(EventRecorder.create_event(userObj, Event.GET, result, {}))
         db.session.commit()
         return result
 
+    @classmethod
+    def get_queued_oldest_query(cls, session, priority_queue=False):
+        """
+        Query locking the oldest queued NR
+        The NRs locked by a concurrent checkout are skipped instead of waited for, so concurrent checkouts each get a
+        distinct NR without blocking each other. Served by the ix_requests_draft_* partial indexes.
+        """
+        query = session.query(Request). \
+            filter(
+                Request.stateCd.in_([State.DRAFT]),
+                Request.nrNum.notlike('NR L%'))
+        if priority_queue:
+            query = query.order_by(Request.priorityCd.desc(), Request.submittedDate.asc())
+        else:
+            query = query.order_by(Request.submittedDate.asc())
+
+        return query.with_for_update(skip_locked=True)
+
     @classmethod
     def get_oldest_draft(cls):
         """Get the oldest NR in DRAFT state."""
@@ -326,27 +384,6 @@ class Request(db.Model):
         name_by_choice = next((name for name in names if name.choice == choice), None)
         return name_by_choice
 
-    @classmethod
-    def find_existing_name_by_user(cls, user_name_search_string, email):
-        """	
-        Gets requests submited by user with given name choice in state draft
-        """
-        current_time = datetime.utcnow()
-        existing_nr = db.session.query(Request). \
-            join(Applicant, and_(Applicant.nrId == Request.id)). \
-            filter(
-                Applicant.emailAddress == email,
-                #Check if status of request is in pending payment state (payment failed/stuck) within 5 mins
-                #check if status of request is in draft (payment successful/request in for name examination) 
-                (Request.stateCd == 'DRAFT') | (Request.stateCd == 'PENDING_PAYMENT'),
-                (Request.submittedDate >= current_time - timedelta(minutes=2)),
-                (Request.nameSearch == ('('+user_name_search_string+')')) | ( Request.nameSearch == user_name_search_string )). \
-            one_or_none()
-        
-        if(existing_nr):
-            return True
-        return False
-        
     @classmethod
     def validNRFormat(cls, nr):
         """NR should be of the format 'NR 1234567'"""
@@ -566,11 +603,16 @@ class Request(db.Model):
         return dist_criteria
 
     @classmethod
-    def get_descriptive_query(cls, desc, criteria, name_criteria):
+    def get_descriptive_criteria(cls, desc):
         special_characters_descriptive = Request.set_special_characters_descriptive(desc)
+        substitutions = ' ?| '.join(map(str, special_characters_descriptive)) + ' ?'
+        return r'.*({})\y'.format(substitutions)
+
+    @classmethod
+    def get_descriptive_query(cls, desc, criteria, name_criteria):
+        desc_criteria = cls.get_descriptive_criteria(desc)
         for e in criteria:
-            substitutions = ' ?| '.join(map(str, special_characters_descriptive)) + ' ?'
-            name_criteria += r'.*({})\y'.format(substitutions)
+            name_criteria += desc_criteria
             e.filters.insert(len(e.filters), [func.lower(Name.name).op('~')(name_criteria)])
 
         return criteria
@@ -654,11 +696,77 @@ class Request(db.Model):
         return result[0] if result else None
 
 
+class RequestJsonGraph:
+    """The rows related to a list of NRs, each kind of row loaded with a single query for all the NRs."""
+
+    def __init__(self, nrs):
+        persistent = [nr for nr in nrs if nr.id is not None]
+        nr_ids = [nr.id for nr in persistent]
+
+        self._load_collection(persistent, 'names',
+                              Name.query.options(joinedload(Name.comment).joinedload(Comment.examiner))
+                              .filter(Name.nrId.in_(nr_ids)).order_by(Name.choice))
+        self._load_collection(persistent, 'applicants', Applicant.query.filter(Applicant.nrId.in_(nr_ids)))
+        self._load_users(persistent)
+
+        self.comments = {}
+        self.partner_names = {}
+        self.previous_nr_nums = {}
+        if nr_ids:
+            for comment in Comment.query.options(joinedload(Comment.examiner)) \
+                    .filter(Comment.nrId.in_(nr_ids)).order_by(Comment.timestamp):
+                self.comments.setdefault(comment.nrId, []).append(comment)
+            for partner_name in PartnerNameSystem.query.filter(PartnerNameSystem.nrId.in_(nr_ids)):
+                self.partner_names.setdefault(partner_name.nrId, []).append(partner_name)
+
+        previous_request_ids = {nr.previousRequestId for nr in nrs if nr.previousRequestId}
+        if previous_request_ids:
+            for request_id, nr_num in db.session.query(Request.requestId, Request.nrNum) \
+                    .filter(Request.requestId.in_(previous_request_ids)):
+                self.previous_nr_nums.setdefault(request_id, nr_num)
+
+    @staticmethod
+    def _load_collection(nrs, key, query):
+        nrs = [nr for nr in nrs if key in sqlalchemy.inspect(nr).unloaded]
+        if not nrs:
+            return
+        rows = {}
+        for row in query:
+            rows.setdefault(row.nrId, []).append(row)
+        for nr in nrs:
+            set_committed_value(nr, key, rows.get(nr.id, []))
+
+    @staticmethod
+    def _load_users(nrs):
+        unloaded = []
+        for nr in nrs:
+            state = sqlalchemy.inspect(nr)
+            unloaded += [(nr, key, user_id) for key, user_id in (('activeUser', nr.userId),
+                                                                 ('submitter', nr.submitter_userid))
+                         if user_id is not None and key in state.unloaded]
+        if not unloaded:
+            return
+        users = {user.id: user for user in User.query.filter(User.id.in_({user_id for _, _, user_id in unloaded}))}
+        for nr, key, user_id in unloaded:
+            set_committed_value(nr, key, users.get(user_id))
+
+    def get_comments(self, nr):
+        if nr.id is None:
+            return nr.comments.all()
+        return self.comments.get(nr.id, [])
+
+    def get_partner_names(self, nr):
+        if nr.id is None:
+            return nr.partnerNS.all()
+        return self.partner_names.get(nr.id, [])
+
+
 @event.listens_for(Request, 'after_insert')
 @event.listens_for(Request, 'after_update')
 def on_insert_or_update_nr(mapper, connection, request):
     """Send a new cloud event message on changes for stateCd in the Request model.
 
+       The message is written to the outbox in the flush transaction, and published once it commits.
        Temporary NRs (nrNum starting with 'NR L') are discarded.
     """
     if not request.nrNum.startswith('NR L'):
@@ -667,8 +775,32 @@ def on_insert_or_update_nr(mapper, connection, request):
         if len(nr_num_history.added) or len(state_cd_history.added):
             old_state_cd = state_cd_history.deleted[0] if len(state_cd_history.deleted) else ''
             if is_reset(request.stateCd, old_state_cd):
-                queue_util.send_name_request_state_msg(request.nrNum, 'RESET', old_state_cd)
-            queue_util.send_name_request_state_msg(request.nrNum, request.stateCd, old_state_cd)
+                queue_util.send_name_request_state_msg(request.nrNum, 'RESET', old_state_cd, connection)
+            queue_util.send_name_request_state_msg(request.nrNum, request.stateCd, old_state_cd, connection)
+
+@event.listens_for(Session, 'after_flush')
+def invalidate_json_snapshots(session, flush_context):
+    """Drop the json snapshots of the NRs changed by the flush."""
+    snapshots = session.info.get(REQUEST_JSON_SNAPSHOTS)
+    if not snapshots:
+        return
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Event):
+            # not part of the json of an NR
+            continue
+        if isinstance(obj, Request):
+            snapshots.pop(obj.id, None)
+        elif getattr(obj, 'nrId', None) is not None:
+            snapshots.pop(obj.nrId, None)
+        else:
+            snapshots.clear()
+            return
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def clear_json_snapshots(session, previous_transaction):
+    session.info.pop(REQUEST_JSON_SNAPSHOTS, None)
+
 
 def is_reset(new_state, previous_state):
     """Determine whether NR state change is a reset based on current and previous state."""
@@ -2,6 +2,8 @@
 Virtual word classification classifies all words in a name approved by an examiner to be used for auto-approval
 """
 
+import re
+
 from . import db, ma
 from datetime import datetime, date
 from sqlalchemy import func, or_
@@ -52,6 +54,22 @@ class WordClassification(db.Model):
         cls.close_session()
         return results
 
+    '''
+    Bulk version of find_word_classification, returns the rows matching any of the words in a single query.
+    '''
+
+    @classmethod
+    def find_words_classification(cls, words):
+        alternation = '|'.join(re.escape(word.lower()) for word in words)
+        results = db.session.query(cls.word, cls.classification).distinct(cls.word, cls.classification) \
+            .filter(func.lower(cls.word).op('~')(r"(^({0})(''[a-zA-Z])?\y)".format(alternation))) \
+            .filter(cls.end_dt.is_(None)) \
+            .filter(cls.start_dt <= date.today()) \
+            .filter(cls.approved_dt <= date.today()) \
+            .order_by(cls.word, cls.classification).all()
+        cls.close_session()
+        return results
+
     @classmethod
     def find_word_by_classification(cls, word, classification):
         results = db.session.query(cls) \
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 import json
 
@@ -6,6 +7,7 @@ from flask import current_app, jsonify, make_response
 from flask_restx import Namespace, Resource, cors
 from namex.exceptions import EntityServiceException
 from namex.models.request import Request
+from namex.services.cache import cache
 
 from namex.utils.api_resource import handle_exception
 from namex.utils.auth import MSG_CLIENT_CREDENTIALS_REQ_FAILED, cors_preflight
@@ -20,6 +22,8 @@ MSG_SERVER_ERROR = 'Server Error!'
 MSG_NOT_FOUND = 'Resource not found'
 MSG_COULD_NOT_FIND_CORP = 'Error: Could not find corporation details'
 
+COLIN_LOOKUP_CACHE_KEY_PREFIX = 'colin_lookup'
+
 
 # Register a local namespace for the NR reserve
 colin_api = Namespace('colin', description='COLIN API')
@@ -41,32 +45,45 @@ class ColinApi(Resource):
             Response: A Flask response object with the business data in JSON format.
         """
         try:
-            # Build the Colin public endpoint URL
-            colin_url = f'{current_app.config.get("COLIN_SVC_URL")}/businesses/{corp_num}/public'
-            # Fetch the business information
-            response = EntityUtils.make_authenticated_request(colin_url)
-
-            if response.status_code != HTTPStatus.OK:
-                error_message = f"Error retrieving {corp_num}: "
-
-                # If response is JSON, modify the JSON object
-                response_body = response.json()
-                if isinstance(response_body, dict):
-                    response_body['error'] = error_message + response_body.get('message', 'Unknown error')
-                else:
-                    # Handle cases where the JSON response is not a dictionary
-                    response_body = {'error': error_message + str(response_body)}
-                return make_response(jsonify(response_body), response.status_code)
-            
-            business_info = response.json().get('business', {})
-            legal_type = business_info.get('legalType')
-
-            # Fetch office and parties information
-            office_info = self._get_office_data(corp_num, legal_type)
-            parties_info = self._get_parties_data(corp_num, legal_type)
-
-            # Fetch nature business info
-            nature_business_info = self._get_nature_of_business(corp_num)
+            cache_key = f'{COLIN_LOOKUP_CACHE_KEY_PREFIX}/{corp_num}'
+            if (response_dict := cache.get(cache_key)) is not None:
+                return make_response(jsonify(response_dict), 200)
+
+            # The requests of the lookup share a token and their connections to COLIN
+            with EntityUtils.get_authenticated_session() as session:
+                # Build the Colin public endpoint URL
+                colin_url = f'{current_app.config.get("COLIN_SVC_URL")}/businesses/{corp_num}/public'
+                # Fetch the business information
+                response = session.get(colin_url)
+
+                if response.status_code != HTTPStatus.OK:
+                    error_message = f"Error retrieving {corp_num}: "
+
+                    # If response is JSON, modify the JSON object
+                    response_body = response.json()
+                    if isinstance(response_body, dict):
+                        response_body['error'] = error_message + response_body.get('message', 'Unknown error')
+                    else:
+                        # Handle cases where the JSON response is not a dictionary
+                        response_body = {'error': error_message + str(response_body)}
+                    return make_response(jsonify(response_body), response.status_code)
+
+                business_info = response.json().get('business', {})
+                legal_type = business_info.get('legalType')
+
+                # Fetch office and parties information concurrently, they only depend on the corp num and legal type
+                app = current_app._get_current_object()
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    office_future = executor.submit(self._in_app_context, app, self._get_office_data,
+                                                    corp_num, legal_type, session)
+                    parties_future = executor.submit(self._in_app_context, app, self._get_parties_data,
+                                                     corp_num, legal_type, session)
+
+                    # Fetch nature business info
+                    nature_business_info = self._get_nature_of_business(corp_num)
+
+                    office_info = office_future.result()
+                    parties_info = parties_future.result()
 
             # Construct the response dictionary
             response_dict = {
@@ -85,6 +102,7 @@ class ColinApi(Resource):
                 'attorney names': parties_info.get('attorneyNames'),
                 'nature of business': nature_business_info,
             }
+            cache.set(cache_key, response_dict, timeout=current_app.config.get('COLIN_LOOKUP_CACHE_TIMEOUT', 60))
 
             # Return the response as JSON
             return make_response(jsonify(response_dict), 200)
@@ -98,13 +116,19 @@ class ColinApi(Resource):
             return handle_exception(err, 'Internal Server Error', 500)
 
 
-    def _get_office_data(self, corp_num, legal_type):
+    @staticmethod
+    def _in_app_context(app, func, *args):
+        with app.app_context():
+            return func(*args)
+
+    def _get_office_data(self, corp_num, legal_type, session):
         """
         Process the office data for a given corporation number.
 
         Args:
             corp_num (str): The corporation number.
             legal_type (str): the legal type
+            session (requests.Session): The authenticated session of the lookup.
 
         Returns:
             dict: A dictionary containing address components for registered and records offices.
@@ -116,7 +140,7 @@ class ColinApi(Resource):
             office_endpoint = f'{colin_service_url}/businesses/{legal_type}/{corp_num}/office'
 
             # Make the authenticated request
-            response = EntityUtils.make_authenticated_request(office_endpoint)
+            response = session.get(office_endpoint)
             if response.status_code != HTTPStatus.OK:
                 office_data = {}
             else:
@@ -145,13 +169,14 @@ class ColinApi(Resource):
             current_app.logger.error(f"Error while processing office data for {corp_num}: {e}")
             raise ValueError(f"Failed to retrieve or process office data for {corp_num}: {e}")
 
-    def _get_parties_data(self, corp_num, legal_type):
+    def _get_parties_data(self, corp_num, legal_type, session):
         """
         Process the parties data for a given corporation number.
 
         Args:
             corp_num (str): The corporation number.
             legal_type (str): The legal type.
+            session (requests.Session): The authenticated session of the lookup.
 
         Returns:
             list: A list of director names in the format "FirstName MiddleInitial LastName".
@@ -162,7 +187,7 @@ class ColinApi(Resource):
             parties_endpoint = f"{colin_service_url}/businesses/{legal_type}/{corp_num}/parties/all"
 
             # Make the authenticated request
-            response = EntityUtils.make_authenticated_request(parties_endpoint)
+            response = session.get(parties_endpoint)
             parties_data = {}
             if response.status_code == HTTPStatus.OK:
                 parties_data = response.json()
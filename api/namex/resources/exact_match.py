@@ -1,10 +1,10 @@
-import json
 import urllib
 
 from flask import current_app, jsonify, request
 from flask_restx import Namespace, Resource, cors
 
 from namex import jwt
+from namex.analytics.solr_client import solr_client
 from namex.utils.auth import cors_preflight
 
 
@@ -27,8 +27,7 @@ class ExactMatch(Resource):
             '&wt=json' + \
             '&q=' + urllib.parse.quote(query)
         current_app.logger.debug('Exact-match query: ' + url)
-        connection = urllib.request.urlopen(url)
-        answer = json.loads(connection.read())
+        answer = solr_client.get_cached_json('possible.conflicts', 'exact_match/' + query, url)
         docs = answer['response']['docs']
         names = [{'name': doc['name'], 'id':doc['id'], 'source':doc['source'], 'start_date':doc['start_date'], 'jurisdiction':doc['jurisdiction']} for doc in docs]
 
@@ -1,10 +1,10 @@
-import json
 import urllib
 
 from flask import current_app, jsonify, request
 from flask_restx import Namespace, Resource, cors
 
 from namex import jwt
+from namex.analytics.solr_client import solr_client
 from namex.utils.auth import cors_preflight
 
 
@@ -30,8 +30,7 @@ class Histories(Resource):
             '&rows=' + MAX_RESULTS + \
             '&q=' + urllib.parse.quote(query)
         current_app.logger.debug('Histories match query: ' + url)
-        connection = urllib.request.urlopen(url)
-        answer = json.loads(connection.read())
+        answer = solr_client.get_cached_json('names', 'histories/' + query, url)
 
         docs = answer['response']['docs']
 
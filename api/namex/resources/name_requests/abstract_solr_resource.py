@@ -5,6 +5,7 @@ from flask_restx import Resource
 
 from namex.utils.logging import setup_logging
 from namex.models import State
+from namex.analytics.solr_client import solr_client
 
 from namex.services.name_request.exceptions import SolrUpdateError
 
@@ -41,6 +42,7 @@ class AbstractSolrResource(Resource):
             SOLR_API_URL = f'{current_app.config.get("SOLR_BASE_URL")}/solr/'
             solr = pysolr.Solr(SOLR_API_URL + solr_core + '/', timeout=10)
             result = solr.add(solr_docs, commit=True)
+            solr_client.invalidate(solr_core)
         except Exception as err:
             raise SolrUpdateError(err)
 
@@ -52,6 +54,7 @@ class AbstractSolrResource(Resource):
             SOLR_API_URL = f'{current_app.config.get("SOLR_BASE_URL")}/solr/'
             solr = pysolr.Solr(SOLR_API_URL + solr_core + '/', timeout=10)
             result = solr.delete(id=doc_id, commit=True)
+            solr_client.invalidate(solr_core)
 
         except Exception as err:
             raise SolrUpdateError(err)
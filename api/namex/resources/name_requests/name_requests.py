@@ -21,7 +21,7 @@ from namex.utils.logging import setup_logging
 from namex.utils.auth import cors_preflight, full_access_to_name_request
 from namex.utils.api_resource import handle_exception
 
-from namex.models import Request, Event, State, Applicant
+from namex.models import Request, Event, State, Applicant, NRSubmissionFingerprint
 from namex.criteria.request import RequestQueryCriteria
 
 from namex.services import EventRecorder
@@ -128,7 +128,7 @@ class NameRequestsResource(BaseNameRequestResource):
             # We won't add the list of valid Name Request actions for the given state to the response if we're sending back a list
             # If the user / client accessing this data needs the Name Request actions, GET the individual record using NameRequest.get
             # This method, NameRequests.get is for Existing NR Search
-            return make_response(jsonify(list(map(lambda result: result.json(), results))), 200)
+            return make_response(jsonify(Request.json_list(results)), 200)
 
         # We won't add the list of valid Name Request actions for the given state to the response if we're sending back a list
         # If the user / client accessing this data needs the Name Request actions, GET the individual record using NameRequest.get
@@ -143,7 +143,6 @@ class NameRequestsResource(BaseNameRequestResource):
             self.initialize()
             nr_svc = self.nr_service
 
-            name_search_string = ""
             user_email = ""
             # user id 
             submitter = nr_svc.request_data.get("applicants")
@@ -151,22 +150,25 @@ class NameRequestsResource(BaseNameRequestResource):
                 user_email = item.get("emailAddress")
                 
             # collect submitted user data names choices
-            customer_data = nr_svc.request_names
-            # loop through the list of choices obtained
-            for item, index in zip(customer_data, range(len(customer_data))):
-                #concat them with format saving as namesearch
-                name_search_string += f'|{index + 1}{item.get("name")}{index + 1}|'
-            #if same user submitted the request of same name choices again raise exception otherwise continue creating nr
-            if(Request().find_existing_name_by_user(name_search_string, user_email)):
+            name_choices = [item.get("name") for item in nr_svc.request_names]
+            # if same user submitted the request of same name choices again raise exception otherwise continue creating nr
+            fingerprint = NRSubmissionFingerprint.build(user_email, name_choices)
+            if not NRSubmissionFingerprint.claim(fingerprint, current_app.config.get('NR_SUBMISSION_FINGERPRINT_TTL')):
                 raise NameRequestIsAlreadySubmittedError()
-            # Create a new DRAFT name request
-            nr_model = nr_svc.create_name_request()
-
-            # Handle state changes
-            # Use update_nr as it enforces the State change pattern
-            # Transition the DRAFT to the state specified in the request:
-            # eg. one of [State.DRAFT, State.COND_RESERVE, State.RESERVED]
-            nr_model = self.update_nr(nr_model, nr_svc.request_state_code, self.handle_nr_create)
+            try:
+                # Create a new DRAFT name request
+                nr_model = nr_svc.create_name_request()
+
+                # Handle state changes
+                # Use update_nr as it enforces the State change pattern
+                # Transition the DRAFT to the state specified in the request:
+                # eg. one of [State.DRAFT, State.COND_RESERVE, State.RESERVED]
+                nr_model = self.update_nr(nr_model, nr_svc.request_state_code, self.handle_nr_create)
+            except Exception:
+                # nothing was created, let the user submit again
+                NRSubmissionFingerprint.release(fingerprint)
+                raise
+            NRSubmissionFingerprint.assign(fingerprint, nr_model.id)
 
             # Record the event
             EventRecorder.record(nr_svc.user, Event.POST, nr_model, nr_model.json())
@@ -185,8 +187,8 @@ class NameRequestsResource(BaseNameRequestResource):
                 SOLR_CORE = 'possible.conflicts'
                 self.create_solr_nr_doc(SOLR_CORE, nr_model)
 
-            current_app.logger.debug(nr_model.json())
             response_data = nr_model.json()
+            current_app.logger.debug(response_data)
             # Add the list of valid Name Request actions for the given state to the response
             response_data['actions'] = nr_svc.current_state_actions
             return make_response(jsonify(response_data), 201)
@@ -19,7 +19,7 @@ from namex.services.name_request.name_request_state import get_nr_state_actions,
 from namex.services.name_request.utils import get_active_payment, has_active_payment
 from namex.services.payment.exceptions import PaymentServiceError, SBCPaymentError, SBCPaymentException
 from namex.services.payment.models import PaymentRequest
-from namex.services.payment.payments import cancel_payment, create_payment, get_payment, refund_payment
+from namex.services.payment.payments import cancel_payment, create_payment, get_payment, get_payments, refund_payment
 from namex.utils.api_resource import clean_url_path_param, handle_exception
 from namex.utils.auth import cors_preflight, validate_roles
 from namex.utils.logging import setup_logging
@@ -254,13 +254,14 @@ class FindNameRequestPayments(PaymentNameRequestResource):
         """Get endpoint."""
         try:
             nr_model = RequestDAO.query.get(nr_id)
-            nr_payments = nr_model.payments.all()
+            nr_payments = [payment for payment in nr_model.payments.all() if payment.payment_token]
+            payment_responses = get_payments(nr_payments)
 
             response_data = []
             # Wrap our payment
             for payment in nr_payments:
                 if (payment.payment_token):
-                    payment_response = get_payment(payment.payment_token)
+                    payment_response = payment_responses[payment.payment_token]
                     receipts = payment_response.receipts
                     if not receipts and payment_response.statusCode == PaymentState.APPROVED.value:
                         # generate temp receipts for approved payments
@@ -700,8 +701,8 @@ class NameRequestPaymentAction(AbstractNameRequestResource):
                 # This handles updates if the NR state is 'patchable'
                 nr_model = self.handle_payment_actions(payment_action, nr_model, payment_id)
 
-            current_app.logger.debug(nr_model.json())
             response_data = nr_model.json()
+            current_app.logger.debug(response_data)
             # Add the list of valid Name Request actions for the given state to the response
             response_data['actions'] = nr_svc.current_state_actions
             return make_response(jsonify(response_data), 200)
@@ -40,6 +40,7 @@ from namex.utils.common import (convert_to_ascii,
 from namex.utils.auth import cors_preflight
 from namex.analytics import SolrQueries, RestrictedWords, VALID_ANALYSIS as ANALYTICS_VALID_ANALYSIS
 from namex.utils import queue_util
+from namex.utils.sql_alchemy import capped_count, decode_cursor, encode_cursor, estimate_count, keyset_criteria
 from .utils import DateUtils
 
 
@@ -130,8 +131,7 @@ class RequestsQueue(Resource):
         if 'nr' not in locals() or not nr:
             return make_response(jsonify(message='No more NRs in Queue to process'), 200)
 
-        EventRecorder.record(user, Event.GET, nr, {})
-
+        # the GET event was recorded with the checkout
         return make_response(jsonify(nameRequest='{}'.format(nr.nrNum)), 200)
 
 
@@ -146,6 +146,11 @@ class Requests(Resource):
     START = 0
     ROWS = 10
 
+    COUNT_EXACT = 'exact'
+    COUNT_ESTIMATE = 'estimate'
+    COUNT_CAPPED = 'capped'
+    COUNT_MODES = [COUNT_EXACT, COUNT_ESTIMATE, COUNT_CAPPED]
+
     @staticmethod
     @jwt.requires_auth
     def get(*args, **kwargs):
@@ -159,6 +164,20 @@ class Requests(Resource):
             current_app.logger.info('start or rows not an int, err: {}'.format(err))
             return make_response(jsonify({'message': 'paging parameters were not integers'}), 406)
 
+        # after is the 'next' token of the previous page, the page then starts after its last row instead of at start
+        after = request.args.get('after', None)
+        if after:
+            try:
+                after = decode_cursor(after)
+            except ValueError as err:
+                current_app.logger.info('after is not a valid paging token, err: {}'.format(err))
+                return make_response(jsonify({'message': 'paging parameters were not valid'}), 406)
+
+        # count may be 'exact' (the default), 'estimate' (query planner statistics) or 'capped' (counts up to a limit)
+        count_mode = request.args.get('count', Requests.COUNT_EXACT)
+        if count_mode not in Requests.COUNT_MODES:
+            return make_response(jsonify({'message': '\'{}\' is not a valid count'.format(count_mode)}), 406)
+
         # queue must be a list of states
         queue = request.args.get('queue', None)
         if queue:
@@ -179,6 +198,7 @@ class Requests(Resource):
         col_keys = cols.keys()
         sort_by = ''
         order_list = ''
+        sort_keys = []
         for k, v in ((x.split(":")) for x in order.split(',')):
             vl = v.lower()
             if (k in col_keys) and (vl == 'asc' or vl == 'desc'):
@@ -187,6 +207,13 @@ class Requests(Resource):
                     order_list = order_list + ', '
                 sort_by = sort_by + '{columns} {direction} NULLS LAST'.format(columns=cols[k], direction=vl)
                 order_list = order_list + '{attribute} {direction} NULLS LAST'.format(attribute=k, direction=vl)
+                sort_keys.append((k, vl))
+
+        # the id breaks the ties, so that every row has a unique place to seek to
+        sort_by = (sort_by + ', ' if sort_by else '') + '{columns} asc'.format(columns=cols['id'])
+        sort_keys.append(('id', 'asc'))
+        if after and len(after) != len(sort_keys):
+            return make_response(jsonify({'message': 'paging parameters were not valid'}), 406)
 
         # Assemble the query
         nrNum = request.args.get('nrNum', None)
@@ -227,6 +254,8 @@ class Requests(Resource):
             compName1 = '%|1%' + compName + '%1|%'
             compName2 = '%|2%' + compName + '%2|%'
             compName3 = '%|3%' + compName + '%3|%'
+            # the trigram index on nameSearch serves the plain match, the or then checks it is within a single name
+            q = q.filter(RequestDAO.nameSearch.ilike('%' + compName + '%'))
             q = q.filter(or_(
                 RequestDAO.nameSearch.ilike(compName1),
                 RequestDAO.nameSearch.ilike(compName2),
@@ -333,26 +362,46 @@ class Requests(Resource):
                 and submittedEndDateTimeUtcObj < submittedStartDateTimeUtcObj:
             return make_response(jsonify({"message": "submittedEndDate must be after submittedStartDate"}), 400)
 
-        q = q.order_by(text(sort_by))
-
         # get a count of the full set size, this ignore the offset & limit settings
-        count_q = q.statement.with_only_columns([func.count()]).order_by(None)
-        count = db.session.execute(count_q).scalar()
+        count_exact = True
+        if count_mode == Requests.COUNT_ESTIMATE:
+            count = estimate_count(db.session, q.statement.order_by(None))
+            count_exact = False
+        elif count_mode == Requests.COUNT_CAPPED:
+            count_cap = current_app.config.get('REQUESTS_SEARCH_COUNT_CAP', 10000)
+            count = capped_count(db.session, q.statement.order_by(None), count_cap)
+            count_exact = count < count_cap
+        else:
+            count_q = q.statement.with_only_columns([func.count()]).order_by(None)
+            count = db.session.execute(count_q).scalar()
+
+        q = q.order_by(text(sort_by))
 
         # Add the paging
-        q = q.offset(start)
+        if after:
+            q = q.filter(keyset_criteria([(cols[k], vl) for k, vl in sort_keys], after))
+        else:
+            q = q.offset(start)
         q = q.limit(rows)
+        nrs = q.all()
+
+        # the token to send as 'after' to get the next page, None on the last page
+        next_page = None
+        if rows > 0 and len(nrs) == rows:
+            next_page = encode_cursor([getattr(nrs[-1], k) for k, _ in sort_keys])
 
         # create the response
         rep = {'response': {'start': start,
                             'rows': rows,
                             'numFound': count,
+                            'numFoundExact': count_exact,
                             'numPriorities': 0,
                             'numUpdatedToday': 0,
                             'queue': queue,
-                            'order': order_list
+                            'order': order_list,
+                            'next': next_page
                             },
-               'nameRequests': [request_search_schemas.dump(q.all()), {}]
+               'nameRequests': [request_search_schemas.dump(nrs), {}]
                }
 
         return make_response(jsonify(rep), 200)
@@ -699,6 +748,7 @@ class Request(Resource):
 
         if state in [State.APPROVED, State.CONDITIONAL, State.REJECTED]:
             queue_util.publish_email_notification(nrd.nrNum, state)
+            db.session.commit()
 
         return make_response(jsonify(message='Request:{} - patched'.format(nr)), 200)
 
@@ -40,3 +40,14 @@ class EntityUtils:
 
         response = requests.get(endpoint, headers=headers)
         return response
+
+    @staticmethod
+    def get_authenticated_session():
+        """Return a session sending the entity service token, to share a token and connections between requests."""
+        token = EntityUtils.get_entity_token()
+        session = requests.Session()
+        session.headers.update({
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        })
+        return session
@@ -0,0 +1,249 @@
+import json
+
+from namex.models import db, Event, Payment, State, User
+
+
+class EventHistory(object):
+    """Transaction history of an NR, built in a single forward pass over its events.
+
+    Each transaction is a snapshot of the NR info after its event. The snapshots share the values that didn't change,
+    the names are copied on write so an event never alters the snapshots taken before it.
+    """
+
+    PAYMENT_DISPLAY = {
+        Payment.PaymentActions.CREATE.value: 'Created NR',
+        Payment.PaymentActions.REAPPLY.value: 'Reapplied NR',
+        Payment.PaymentActions.UPGRADE.value: 'Upgraded Priority',
+        Payment.PaymentActions.RESUBMIT.value: 'Resubmitted NR'
+    }
+
+    @staticmethod
+    def get_events(nr_id):
+        """Return the events of the NR as dicts, in the order they were recorded.
+
+        The json data of the compact events is rebuilt from the full snapshot event they were recorded against.
+        """
+        rows = db.session.query(Event.id, Event.eventDate, Event.action, Event.stateCd, Event.eventJson,
+                                Event.eventJsonDiff, Event.userId). \
+            filter(Event.nrId == nr_id). \
+            order_by(Event.id).all()
+
+        json_data = {row.id: row.eventJson for row in rows}
+        parsed = {}
+        events = []
+        for row in rows:
+            event_json = row.eventJson
+            if row.eventJsonDiff is not None:
+                base_id = row.eventJsonDiff['base']
+                if base_id not in parsed:
+                    base_json = json_data.get(base_id)
+                    parsed[base_id] = json.loads(base_json) if isinstance(base_json, str) else base_json
+                event_json = json.dumps(Event.apply_json_diff(parsed[base_id] or {}, row.eventJsonDiff))
+            events.append({'id': row.id, 'eventDate': row.eventDate, 'action': row.action, 'stateCd': row.stateCd,
+                           'jsonData': event_json, 'requestId': nr_id, 'userId': row.userId})
+        return events
+
+    @staticmethod
+    def get_usernames(events):
+        """Return the username of every user of the events, loaded with a single query."""
+        user_ids = {e_dict['userId'] for e_dict in events if e_dict['userId'] is not None}
+        if not user_ids:
+            return {}
+        return dict(db.session.query(User.id, User.username).filter(User.id.in_(user_ids)))
+
+    @staticmethod
+    def build_transactions(events, usernames, since=None, limit=None):
+        """Return the transactions of the events, most recent first.
+
+        since only keeps the transactions of the events recorded from that date, and limit the most recent ones.
+        """
+        # info needed for each event
+        nr_event_info = {
+            'additionalInfo': None,
+            'consent_dt': None,
+            'consentFlag': None,
+            'corpNum': None,
+            'eventDate': None,
+            'expirationDate': None,
+            'furnished': None,
+            'names': [],
+            'priorityCd': None,
+            'requestTypeCd': None,
+            'request_action_cd': None,
+            'stateCd': None,
+            'user_action': None,
+            'user_name': None
+        }
+        # previous event (used for 'user_action' logic)
+        e_dict_previous = dict()
+        # transaction history, oldest first
+        e_txn_history = []
+
+        for e_dict in events:
+            previous_furnished = nr_event_info['furnished']
+
+            # skip unneeded events for transaction history due to workflow:
+            # - 1. patch[checkout] changes the NR state to inprogress
+            # - 2. patch[edit] changes NR information (not including state)
+            # - 3. patch[checkin] changes the NR state back to it's previous state
+            if e_dict['action'] in ['patch [checkout]', 'patch [checkin]']:
+                continue
+
+            # handle parsing new and older data
+            event_json_data = dict(json.loads(e_dict['jsonData'])) if type(e_dict['jsonData']) == str else e_dict['jsonData']
+
+            # update NR state unless action was a patch [edit] (see comment above for why)
+            if e_dict['action'] != 'patch [edit]':
+                nr_event_info['stateCd'] = e_dict['stateCd']
+                # TODO: capture below cases in the event record data
+                # if state is CONDITIONAL and consentFlag is null, then set it to Y
+                if nr_event_info['stateCd'] == State.CONDITIONAL and nr_event_info['consentFlag'] in ['N', None]:
+                    nr_event_info['consentFlag'] = 'Y'
+                # if state is not CONDITIONAL remove event consent data
+                if nr_event_info['stateCd'] != State.CONDITIONAL:
+                    nr_event_info['consentFlag'] = 'N'
+                    nr_event_info['consent_dt'] = None
+
+            # TODO: make event data consistent across all events (requires changes in event recording across the api)
+            # - current process is to save payload given, but we need the nr info that was updated saved too
+
+            # if data is a name, update nr_event_info with corresponding name choice
+            if event_json_data:
+                if all(key in event_json_data.keys() for key in ['choice', 'name']):
+                    names = list(nr_event_info['names'])
+                    if len(names) > 0:
+                        update_index = 0
+                        for i, name in enumerate(names):
+                            if name['choice'] == event_json_data['choice']:
+                                # save index so we can update it
+                                update_index = i
+                                break
+                        # paste new name info over the old one
+                        names[update_index] = event_json_data
+                    else:
+                        names.append(event_json_data)
+                    nr_event_info['names'] = names
+
+                elif 'state' in event_json_data and event_json_data['state'] == 'CONSUMED':
+                    nr_event_info['names'] = [
+                        dict(name_info, corpNum=event_json_data['corpNum'])
+                        if name_info.get('state') in ('APPROVED', 'CONDITION') else name_info
+                        for name_info in nr_event_info['names']
+                    ]
+                # else update nr_event_info with any changed event data (should be formatted same as an NR json)
+                else:
+                    for key in nr_event_info.keys():
+                        if key in event_json_data.keys():
+                            # stateCd updated from e_dict already (not always accurate in event_json_data)
+                            if key == 'stateCd':
+                                continue
+                            # otherwise update nr_event_info
+                            nr_event_info[key] = event_json_data[key]
+                    # entity_type_cd for namerequest is used to change requestTypeCd in namex (it is being mapped incorrectly)
+                    if 'entity_type_cd' in event_json_data.keys() and 'requestTypeCd' not in event_json_data.keys():
+                        nr_event_info['requestTypeCd'] = event_json_data['entity_type_cd']
+
+            # update event date
+            nr_event_info['eventDate'] = e_dict['eventDate']
+
+            # update username
+            nr_event_info['user_name'] = usernames.get(e_dict['userId'])
+
+            nr_event_info['user_action'] = EventHistory._get_user_action(e_dict, e_dict_previous, event_json_data,
+                                                                         previous_furnished, nr_event_info)
+
+            # add a snapshot of the event to the transaction history
+            if since is None or e_dict['eventDate'] >= since:
+                e_txn_history.append(dict(nr_event_info))
+
+            # set previous event
+            e_dict_previous = e_dict
+
+        e_txn_history.reverse()
+        return e_txn_history if limit is None else e_txn_history[:limit]
+
+    @staticmethod
+    def _get_user_action(e_dict, e_dict_previous, event_json_data, previous_furnished, nr_event_info):
+        """Return the user action of the event, some actions also update the NR info of the event."""
+        user_action = e_dict["action"]
+        if e_dict["action"] == "patch [edit]":
+            user_action = "Edit NR Details (Name Request)"
+        if e_dict["action"] == "update_from_nro":
+            user_action = "Get NR Details from NRO"
+        if e_dict["action"] == "get" and e_dict["stateCd"] == State.INPROGRESS:
+            user_action = "Get Next NR"
+        if e_dict["action"] == "patch" and e_dict["stateCd"] == State.INPROGRESS:
+            user_action = "Load NR"
+        if e_dict["action"] == "patch" and e_dict["stateCd"] == State.HOLD:
+            user_action = "Hold Request"
+        if e_dict["action"] == "marked_on_hold" and e_dict["stateCd"] == State.HOLD:
+            user_action = "Marked on Hold"
+        if e_dict["action"] == "put" and e_dict["stateCd"] == State.DRAFT:
+            user_action = "Edit NR Details (NameX)"
+        if e_dict["action"] == "put" and e_dict["stateCd"] == State.INPROGRESS and "additional" in e_dict["jsonData"]:
+            if len(e_dict_previous) == 0 or (e_dict_previous["stateCd"] in [State.HOLD, State.DRAFT, State.INPROGRESS]):
+                user_action = "Edit NR Details (NameX)"
+            if e_dict_previous and e_dict_previous["stateCd"] in [State.APPROVED, State.REJECTED, State.CONDITIONAL]:
+                # event data will still have an expiration date, but actual NR will have cleared
+                nr_event_info['expirationDate'] = None
+                if previous_furnished == 'Y':
+                    user_action = "Reset"
+                else:
+                    user_action = "Re-Open"
+        if e_dict["action"] == "put" and (e_dict["stateCd"] == State.APPROVED or e_dict["stateCd"] == State.REJECTED or e_dict["stateCd"] == State.CONDITIONAL):
+            user_action = "Edit NR Details after Completion"
+        if e_dict["action"] == "put" and e_dict["stateCd"] == State.INPROGRESS and "additional" not in e_dict["jsonData"] and '"state": "NE"' not in e_dict["jsonData"]:
+            user_action = "Complete the Name Choice"
+        if e_dict["action"] == "patch" and (e_dict["stateCd"] == State.APPROVED or e_dict["stateCd"] == State.REJECTED or e_dict["stateCd"] == State.CONDITIONAL):
+            user_action = "Decision"
+        if e_dict["action"] == "put" and e_dict["stateCd"] == State.INPROGRESS and "additional" not in e_dict["jsonData"] and '"state": "NE"' in e_dict["jsonData"]:
+            user_action = "Undo Decision"
+        if e_dict["action"] == "nro_update" and (e_dict["stateCd"] == State.APPROVED or e_dict["stateCd"] == State.REJECTED or e_dict["stateCd"] == State.CONDITIONAL):
+            user_action = "Updated NRO"
+        if e_dict["action"] == "post" and (event_json_data and "comment" in event_json_data):
+            user_action = "Staff Comment"
+            nr_event_info['comment'] = event_json_data["comment"]
+        if e_dict["stateCd"] == State.CANCELLED and (e_dict["action"] == "post" or e_dict["action"] == "update_from_nro"):
+            user_action = "Cancelled in NRO"
+        if e_dict["stateCd"] == State.CANCELLED and (e_dict["action"] == "patch" or e_dict["action"] == "put"):
+            user_action = "Cancelled in Namex"
+        if e_dict["stateCd"] == State.EXPIRED and e_dict["action"] == "post":
+            user_action = "Expired by NRO"
+        if e_dict["stateCd"] == State.HISTORICAL and e_dict["action"] == "post":
+            user_action = "Set to Historical by NRO(Migration)"
+        if e_dict["stateCd"] == State.COMPLETED and (e_dict["action"] == "post" or e_dict["action"] == "update_from_nro"):
+            user_action = "Migrated by NRO"
+        if e_dict["action"] == "post" and (e_dict["stateCd"] in [State.DRAFT, State.PENDING_PAYMENT] and not e_dict_previous):
+            # state of these will be DRAFT, but show as PENDING_PAYMENT to avoid confusion
+            user_action = "Created NRL"
+            nr_event_info['stateCd'] = State.PENDING_PAYMENT
+        if '[rollback]' in e_dict['action']:
+            user_action = "UI Error - NR Rolled Back"
+        if '[cancel]' in e_dict['action']:
+            user_action = "Cancelled in Name Request"
+        if user_action == Event.NR_DAY_JOB:
+            user_action = "NR Day Job"
+
+        payment_action = ''
+        for action in Payment.PaymentActions:
+            if action.value in e_dict['action']:
+                payment_action = action.value
+                break
+        if payment_action:
+            payment_display = EventHistory.PAYMENT_DISPLAY[payment_action]
+            if '[payment created]' in e_dict['action']:
+                user_action = f'{payment_display} (Payment Initialized)'
+            elif '[payment completed]' in e_dict['action']:
+                user_action = f'{payment_display} (Payment Completed)'
+            elif '[payment cancelled]' in e_dict['action']:
+                user_action = f'{payment_display} (Payment Cancelled)'
+            elif '[payment refunded]' in e_dict['action']:
+                user_action = f'{payment_display} (Payment Refunded)'
+            else:
+                user_action = f'{payment_display} (Unknown)'
+
+        # case where they refund the whole NR (not just a specific payment/event)
+        if "request-refund" in e_dict["action"]:
+            user_action = "Refund Requested"
+
+        return user_action
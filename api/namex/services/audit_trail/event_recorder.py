@@ -3,7 +3,7 @@ from datetime import datetime
 
 from flask import current_app
 
-from namex.models import Event, User
+from namex.models import db, Event, Request, User
 
 
 class EventRecorder(object):
@@ -50,3 +50,50 @@ class EventRecorder(object):
             userId=user.id if user else None
         )
         return event
+
+    @staticmethod
+    def record_many(user, action, nrs, data_dicts=None, compact=False):
+        """Record an event for each of the NRs with a single insert, as part of the caller's transaction.
+
+        data_dicts defaults to the json of the NRs, serialized together. With compact, the data of an NR that already
+        has a full snapshot event is stored as the changes from that snapshot, in eventJsonDiff.
+        """
+        if not nrs:
+            return
+        try:
+            if data_dicts is None:
+                data_dicts = Request.json_list(nrs)
+
+            snapshots = Event.get_last_snapshots([nr.id for nr in nrs]) if compact else {}
+            event_date = datetime.utcnow()
+            full_rows = []
+            compact_rows = []
+            for nr, data_dict in zip(nrs, data_dicts):
+                row = {
+                    'event_dt': event_date,
+                    'action': action,
+                    'nr_id': nr.id,
+                    'state_cd': nr.stateCd,
+                    'user_id': user.id if user else None
+                }
+                diff = None
+                if nr.id in snapshots:
+                    base_id, base_json = snapshots[nr.id]
+                    base_data = json.loads(base_json) if isinstance(base_json, str) else base_json
+                    if Event.is_snapshot(base_data):
+                        diff = Event.create_json_diff(base_id, base_data, data_dict)
+                if diff is None:
+                    row['event_json'] = json.dumps(data_dict)
+                    full_rows.append(row)
+                else:
+                    row['event_json'] = None
+                    row['event_json_diff'] = diff
+                    compact_rows.append(row)
+
+            for rows in (full_rows, compact_rows):
+                if rows:
+                    db.session.execute(Event.__table__.insert(), rows)
+        except Exception as err:
+            current_app.logger.error(err.with_traceback(None))
+            current_app.logger.error('AUDIT BROKEN: changes were - NRNUMS: {}, ACTION: {}, USER {}'
+                                     .format([nr.nrNum for nr in nrs], action, user.username if user else None))
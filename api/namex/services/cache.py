@@ -1,4 +1,5 @@
 from flask_caching import Cache
 
 cache = Cache(config={ "CACHE_TYPE": "simple",
-                       "CACHE_DEFAULT_TIMEOUT": 300 } )
\ No newline at end of file
+                       "CACHE_DEFAULT_TIMEOUT": 300,
+                       "CACHE_THRESHOLD": 5000 } )
\ No newline at end of file
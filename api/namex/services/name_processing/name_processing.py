@@ -5,14 +5,14 @@ from datetime import datetime
 
 from flask.globals import current_app
 
-from . import LanguageCodes
 from ..name_request.auto_analyse.mixins.get_designations_lists import GetDesignationsListsMixin
 from ..name_request.auto_analyse.name_analysis_utils import remove_french, remove_stop_words, check_numbers_beginning
 from namex.services.word_classification.word_classification import WordClassificationService
 
 from .mixins.get_synonym_lists import GetSynonymListsMixin
+from .reference_data import reference_data
 
-from swagger_client import SynonymsApi as SynonymService
+from namex.services.synonyms import SynonymsApi as SynonymService
 
 from ..virtual_word_condition.virtual_word_condition import VirtualWordConditionService
 
@@ -113,6 +113,10 @@ class NameProcessingService(GetSynonymListsMixin, GetDesignationsListsMixin):
     def synonym_service(self, svc):
         self._synonym_service = svc
 
+    @property
+    def reference_data(self):
+        return self._reference_data
+
     @property
     def virtual_word_condition_service(self):
         return self._virtual_word_condition_service
@@ -125,6 +129,7 @@ class NameProcessingService(GetSynonymListsMixin, GetDesignationsListsMixin):
         self.synonym_service = SynonymService()
         self.word_classification_service = WordClassificationService()
         self.virtual_word_condition_service = VirtualWordConditionService()
+        self._reference_data = None
         self.name_as_submitted = None
         self._name_first_part = None
         self.name_as_submitted_tokenized = None
@@ -146,24 +151,34 @@ class NameProcessingService(GetSynonymListsMixin, GetDesignationsListsMixin):
         self._process_name(np_svc_prep_data)
 
     def set_name_tokenized(self, name):
-        all_designations = self._designated_all_words
-        all_designations.sort(key=len, reverse=True)
-        designation_alternators = '|'.join(map(re.escape, all_designations))
-        regex = re.compile(r'(?<!\w)({}|[a-z-A-Z0-9]+)(?!\w)'.format(designation_alternators))
+        if self._reference_data is not None:
+            regex = self._reference_data.name_tokenized_regex
+        else:
+            all_designations = self._designated_all_words
+            all_designations.sort(key=len, reverse=True)
+            designation_alternators = '|'.join(map(re.escape, all_designations))
+            regex = re.compile(r'(?<!\w)({}|[a-z-A-Z0-9]+)(?!\w)'.format(designation_alternators))
         self.name_as_submitted_tokenized = regex.findall(name.lower())
 
-    def _clean_name_words(self, name, stop_words=[], designation_all=[], prefix_list=[], number_list=[]):
+    def _clean_name_words(self, name, stop_words=[], designation_all=[], prefix_list=[], number_list=[],
+                          reference_data=None):
         if not name or not stop_words or not designation_all or not prefix_list or not number_list:
             warnings.warn("Parameters in clean_name_words function are not set.", Warning)
 
         syn_svc = self.synonym_service
         # vwc_svc = self.virtual_word_condition_service
         designation_all.sort(key=len, reverse=True)
-        designation_alternators = '|'.join(map(re.escape, designation_all))
 
         exception_designation = self.exception_designation(name)
-        exception_stop_words_designation = list(set(self.exception_designation_stop_word(stop_words, designation_all)))
-        exception_stop_words_designation.sort(key=len, reverse=True)
+        if reference_data is not None:
+            # The word lists come from the reference data snapshot, reuse what was built from them
+            designation_alternators = reference_data.designation_alternators
+            exception_stop_words_designation = list(reference_data.exception_stop_words_designation)
+        else:
+            designation_alternators = '|'.join(map(re.escape, designation_all))
+            exception_stop_words_designation = list(
+                set(self.exception_designation_stop_word(stop_words, designation_all)))
+            exception_stop_words_designation.sort(key=len, reverse=True)
 
         name_original_tokens = [x for x in [x.strip() for x in re.split('([ &/-])', name.lower())] if x]
         self.name_original_tokens = name_original_tokens
@@ -231,28 +246,31 @@ class NameProcessingService(GetSynonymListsMixin, GetDesignationsListsMixin):
         return exception_stopword_designation
 
     def prepare_data(self):
-        """Prep the analysis."""
-        syn_svc = self.synonym_service
+        """Prep the analysis.
+
+        The word lists come from the process wide reference data snapshot, see reference_data.py.
+        Each service gets its own copy of the lists as some of the analysis sorts them in place.
+        """
+        snapshot = reference_data.get()
+        self._reference_data = snapshot
 
-        # Query database for word designations
         # These properties are mixed in via GetSynonymListsMixin
         # See the class constructor
-        self._stop_words = syn_svc.get_stop_words().data
-        self._prefixes = syn_svc.get_prefixes().data
-        self._number_words = syn_svc.get_number_words().data
-        self._stand_alone_words = syn_svc.get_stand_alone().data
+        self._stop_words = list(snapshot.stop_words)
+        self._prefixes = list(snapshot.prefixes)
+        self._number_words = list(snapshot.number_words)
+        self._stand_alone_words = list(snapshot.stand_alone_words)
 
-        self._eng_designated_end_words = syn_svc.get_designated_end_all_words(lang=LanguageCodes.ENG.value).data
-        self._eng_designated_any_words = syn_svc.get_designated_any_all_words(lang=LanguageCodes.ENG.value).data
+        self._eng_designated_end_words = list(snapshot.eng_designated_end_words)
+        self._eng_designated_any_words = list(snapshot.eng_designated_any_words)
 
-        self._fr_designated_end_words = syn_svc.get_designated_end_all_words(lang=LanguageCodes.FR.value).data
-        self._fr_designated_any_words = syn_svc.get_designated_any_all_words(lang=LanguageCodes.FR.value).data
+        self._fr_designated_end_words = list(snapshot.fr_designated_end_words)
+        self._fr_designated_any_words = list(snapshot.fr_designated_any_words)
 
-        self._designated_end_words = self._eng_designated_end_words + self._fr_designated_end_words
-        self._designated_any_words = self._eng_designated_any_words + self._fr_designated_any_words
+        self._designated_end_words = list(snapshot.designated_end_words)
+        self._designated_any_words = list(snapshot.designated_any_words)
 
-        self._designated_all_words = list(set(self._designated_any_words + self._designated_end_words))
-        self._designated_all_words.sort(key=len, reverse=True)
+        self._designated_all_words = list(snapshot.designated_all_words)
 
     def _process_name(self, np_svc_prep_data):
         """Split a name string into classifiable tokens.
@@ -268,7 +286,8 @@ class NameProcessingService(GetSynonymListsMixin, GetDesignationsListsMixin):
                 np_svc_prep_data.get_stop_words(),
                 np_svc_prep_data.get_designated_all_words(),
                 np_svc_prep_data.get_prefixes(),
-                np_svc_prep_data.get_number_words()
+                np_svc_prep_data.get_number_words(),
+                np_svc_prep_data.reference_data
             )
 
             # Store clean, processed name to instance
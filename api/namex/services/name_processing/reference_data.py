@@ -0,0 +1,108 @@
+import re
+import threading
+import time
+
+from flask import current_app
+
+from namex.services.synonyms import SynonymsApi as SynonymService, fetch_synonyms_version, synonym_engine
+
+from . import LanguageCodes
+
+'''
+Reference data used to pre-process every name: stop words, prefixes, number words, stand-alone words, designations,
+and the regexes built from them.
+
+The data only changes when the synonym table does, so a single snapshot is shared read-only by every request and
+thread of the process. Every REFERENCE_DATA_TTL seconds the synonym table version is checked, and the snapshot is
+rebuilt when it changed. When the version can't be read the snapshot is rebuilt anyway, the TTL being the fallback.
+A rebuild that fails keeps the current snapshot until the next check.
+'''
+
+
+class NameProcessingReferenceData:
+    """Immutable snapshot of the name processing reference data."""
+
+    def __init__(self, version, stop_words, prefixes, number_words, stand_alone_words,
+                 eng_designated_end_words, eng_designated_any_words, fr_designated_end_words, fr_designated_any_words):
+        self.version = version
+        self.stop_words = tuple(stop_words)
+        self.prefixes = tuple(prefixes)
+        self.number_words = tuple(number_words)
+        self.stand_alone_words = tuple(stand_alone_words)
+
+        self.eng_designated_end_words = tuple(eng_designated_end_words)
+        self.eng_designated_any_words = tuple(eng_designated_any_words)
+        self.fr_designated_end_words = tuple(fr_designated_end_words)
+        self.fr_designated_any_words = tuple(fr_designated_any_words)
+
+        self.designated_end_words = self.eng_designated_end_words + self.fr_designated_end_words
+        self.designated_any_words = self.eng_designated_any_words + self.fr_designated_any_words
+
+        designated_all_words = list(set(self.designated_any_words + self.designated_end_words))
+        designated_all_words.sort(key=len, reverse=True)
+        self.designated_all_words = tuple(designated_all_words)
+
+        self.designation_alternators = '|'.join(map(re.escape, self.designated_all_words))
+        self.name_tokenized_regex = re.compile(r'(?<!\w)({}|[a-z-A-Z0-9]+)(?!\w)'.format(self.designation_alternators))
+
+        exception_stop_words_designation = list({designation for word in self.stop_words
+                                                 for designation in self.designated_all_words
+                                                 if re.search(r'\b{0}\b'.format(word), designation)})
+        exception_stop_words_designation.sort(key=len, reverse=True)
+        self.exception_stop_words_designation = tuple(exception_stop_words_designation or ['null'])
+
+    @classmethod
+    def load(cls, version=None):
+        syn_svc = SynonymService()
+        return cls(
+            version=version,
+            stop_words=syn_svc.get_stop_words().data,
+            prefixes=syn_svc.get_prefixes().data,
+            number_words=syn_svc.get_number_words().data,
+            stand_alone_words=syn_svc.get_stand_alone().data,
+            eng_designated_end_words=syn_svc.get_designated_end_all_words(lang=LanguageCodes.ENG.value).data,
+            eng_designated_any_words=syn_svc.get_designated_any_all_words(lang=LanguageCodes.ENG.value).data,
+            fr_designated_end_words=syn_svc.get_designated_end_all_words(lang=LanguageCodes.FR.value).data,
+            fr_designated_any_words=syn_svc.get_designated_any_all_words(lang=LanguageCodes.FR.value).data
+        )
+
+
+class ReferenceDataCache:
+    """Process wide holder of the current NameProcessingReferenceData snapshot."""
+
+    def __init__(self):
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._checked_at = 0.0
+
+    def get(self):
+        snapshot = self._snapshot
+        ttl = current_app.config.get('REFERENCE_DATA_TTL', 300)
+        if snapshot is not None and time.monotonic() - self._checked_at < ttl:
+            return snapshot
+
+        with self._lock:
+            # Another thread may have refreshed the snapshot while we were waiting for the lock
+            if self._snapshot is not None and time.monotonic() - self._checked_at < ttl:
+                return self._snapshot
+
+            version = fetch_synonyms_version()
+            if self._snapshot is None or version is None or version != self._snapshot.version:
+                try:
+                    if self._snapshot is not None and current_app.config.get('SYNONYMS_IN_PROCESS', False):
+                        synonym_engine.reload()
+                    self._snapshot = NameProcessingReferenceData.load(version)
+                except Exception as err:  # pylint: disable=broad-except
+                    if self._snapshot is None:
+                        raise
+                    current_app.logger.error('Reference data reload failed, keeping the current snapshot: {}'
+                                             .format(repr(err)))
+
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+
+reference_data = ReferenceDataCache()
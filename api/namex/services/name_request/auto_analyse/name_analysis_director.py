@@ -2,7 +2,7 @@ import os
 from datetime import datetime
 
 from flask import current_app
-from swagger_client import SynonymsApi as SynonymService
+from namex.services.synonyms import SynonymsApi as SynonymService
 
 from namex.constants import BCUnprotectedNameEntityTypes
 from namex.services.name_processing.name_processing import NameProcessingService
@@ -0,0 +1,133 @@
+import abc
+import re
+
+from flask import current_app
+
+from namex.models.request import Request
+
+'''
+Candidate retrieval for NameAnalysisBuilder.get_conflicts_db.
+
+The conflict search looks for names matching every (distinctive, descriptive) substitution pair. For a given
+distinctive word, the descriptive filters accumulate: the pair (dist, desc_n) only matches names which also match the
+pairs (dist, desc_0) ... (dist, desc_n-1). Done pair by pair this is one regex scan of the names table per pair.
+
+BatchedConflictCandidates issues a single query per search, filtering on the alternation of all the distinctive and
+descriptive substitutions, and then applies the exact per pair filters to the returned rows, so every pair answers the
+same rows as PairwiseConflictCandidates does with one query each.
+'''
+
+
+class ConflictCandidates(abc.ABC):
+    def __init__(self, dist_substitution_dict, desc_synonym_criteria_dict, stop_words, change_filter,
+                 check_name_is_well_formed, queue):
+        self.dist_substitution_dict = dist_substitution_dict
+        self.desc_synonym_criteria_dict = desc_synonym_criteria_dict
+        self.stop_words = stop_words
+        self.change_filter = change_filter
+        self.check_name_is_well_formed = check_name_is_well_formed
+        self.queue = queue
+
+    def get_distinctive_criteria(self, key_dist):
+        return Request.get_distinctive_query(self.dist_substitution_dict[key_dist], self.stop_words,
+                                             self.check_name_is_well_formed)
+
+    '''
+    Yield (key_desc, matches) for every descriptive word, in order, for the given distinctive word.
+    '''
+
+    @abc.abstractmethod
+    def matches(self, key_dist):
+        pass
+
+
+class PairwiseConflictCandidates(ConflictCandidates):
+    """One query per (distinctive, descriptive) pair."""
+
+    def matches(self, key_dist):
+        criteria = Request.get_general_query(self.change_filter, self.queue)
+        name_criteria = self.get_distinctive_criteria(key_dist)
+        for key_desc, value_desc in self.desc_synonym_criteria_dict.items():
+            criteria = Request.get_descriptive_query(value_desc, criteria, name_criteria)
+            yield key_desc, Request.find_by_criteria_array(criteria, self.queue)
+
+
+class BatchedConflictCandidates(ConflictCandidates):
+    """One query per conflict search, the pairs are matched against the returned rows."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._rows = None
+        self._desc_criteria = {key: Request.get_descriptive_criteria(value)
+                               for key, value in self.desc_synonym_criteria_dict.items()}
+
+    @property
+    def rows(self):
+        if self._rows is None:
+            self._rows = self._find_candidates()
+        return self._rows
+
+    def _find_candidates(self):
+        if not self.dist_substitution_dict or not self.desc_synonym_criteria_dict:
+            return []
+
+        dist_criteria = '|'.join('({})'.format(self.get_distinctive_criteria(key_dist))
+                                 for key_dist in self.dist_substitution_dict)
+        desc_values = [value for values in self.desc_synonym_criteria_dict.values() for value in values]
+
+        criteria = Request.get_general_query(self.change_filter, self.queue)
+        criteria = Request.get_descriptive_query(desc_values, criteria, '({})'.format(dist_criteria))
+        return Request.find_by_criteria_array(criteria, self.queue)
+
+    def _criteria_index(self, row):
+        # get_descriptive_query repeats the descriptive criteria once per criteria element, see get_general_query:
+        # the queue and consumed queries (no nrNum) come first, the not consumed query is second.
+        if self.queue or row.nrNum is None:
+            return 0
+        return 1
+
+    def matches(self, key_dist):
+        dist_criteria = self.get_distinctive_criteria(key_dist)
+        try:
+            desc_patterns = [
+                (key_desc, [compile_name_criteria(dist_criteria + desc_criteria * (index + 1)) for index in range(2)])
+                for key_desc, desc_criteria in self._desc_criteria.items()
+            ]
+        except re.error as err:
+            current_app.logger.warning('Conflict criteria for %s not supported in Python, querying per pair: %s',
+                                       key_dist, err)
+            yield from PairwiseConflictCandidates.matches(self, key_dist)
+            return
+
+        candidates = [row for row in self.rows if row.name]
+        for key_desc, patterns in desc_patterns:
+            candidates = [row for row in candidates
+                          if patterns[self._criteria_index(row)].search(row.name.lower())]
+            yield key_desc, list(candidates)
+
+
+def compile_name_criteria(name_criteria):
+    """Compile a Postgres name criteria regex, the only construct without a Python equivalent is \\y."""
+    return re.compile(name_criteria.replace(r'\y', r'\b'), re.DOTALL)
+
+
+def get_conflict_candidates(dist_substitution_dict, desc_synonym_criteria_dict, stop_words, change_filter,
+                            check_name_is_well_formed, queue):
+    candidates_class = BatchedConflictCandidates \
+        if current_app.config.get('CONFLICT_CANDIDATES_BATCHED', True) else PairwiseConflictCandidates
+
+    return candidates_class(dist_substitution_dict, desc_synonym_criteria_dict, stop_words, change_filter,
+                            check_name_is_well_formed, queue)
+
+
+def diff_conflict_candidates(expected, actual):
+    """Compare the matches of two ConflictCandidates, returns {(key_dist, key_desc): (missing, unexpected)}."""
+    differences = {}
+    for key_dist in expected.dist_substitution_dict:
+        for (key_desc, expected_matches), (_, actual_matches) in zip(expected.matches(key_dist),
+                                                                     actual.matches(key_dist)):
+            expected_set, actual_set = set(map(tuple, expected_matches)), set(map(tuple, actual_matches))
+            if expected_set != actual_set:
+                differences[(key_dist, key_desc)] = (expected_set - actual_set, actual_set - expected_set)
+
+    return differences
@@ -3,10 +3,12 @@ import re
 import itertools
 from collections import ChainMap
 import warnings
+from http import HTTPStatus
 
 import requests
 from . import EXACT_MATCH, HIGH_CONFLICT_RECORDS, HIGH_SIMILARITY, CURRENT_YEAR, LOWER_LIMIT_TIME, \
     UPPER_LIMIT_TIME, EXCEPTION_YEARS, CURRENT_MONTH, CURRENT_DAY
+from .conflict_candidates import get_conflict_candidates
 from ..auto_analyse.abstract_name_analysis_builder import AbstractNameAnalysisBuilder, ProcedureResult
 from ..auto_analyse import AnalysisIssueCodes, MAX_LIMIT, MAX_MATCHES_LIMIT, porter
 from ..auto_analyse.name_analysis_utils import get_conflicts_same_classification, \
@@ -239,22 +241,26 @@ class NameAnalysisBuilder(AbstractNameAnalysisBuilder):
         else:
             print("Search conflicts for APPROVED, CONDITIONAL, COND_RESERVED, RESERVED")
 
-        for key_dist, value_dist in dist_substitution_dict.items():
-            criteria = Request.get_general_query(change_filter, queue)
-            name_criteria = Request.get_distinctive_query(value_dist, stop_words, check_name_is_well_formed)
-            for key_desc, value_desc in desc_synonym_criteria_dict.items():
+        candidates = get_conflict_candidates(dist_substitution_dict, desc_synonym_criteria_dict, stop_words,
+                                             change_filter, check_name_is_well_formed, queue)
+        list_matches = []
+        for key_dist in dist_substitution_dict:
+            for key_desc, matches in candidates.matches(key_dist):
                 print(key_dist, ":DIST ", key_desc, ":DESC")
-                criteria = Request.get_descriptive_query(value_desc, criteria, name_criteria)
-                matches = Request.find_by_criteria_array(criteria, queue)
-                matches = self.skip_name_matches_processed(matches)
-                list_conflicts_details, forced = self.get_most_similar_names(
-                    dict_highest_counter,
-                    set(matches), dist_substitution_dict,
-                    desc_synonym_dict, list_name)
-                list_details.extend(list_conflicts_details)
+                list_matches.append(set(self.skip_name_matches_processed(matches)))
 
-                if forced:
-                    return list_details, forced
+        # Score the matches of every pair in one call, the results are still processed pair by pair
+        list_matches_counter = self.get_conflicts_scores(list_matches, dist_substitution_dict, desc_synonym_dict,
+                                                         list_name)
+        for matches, dict_matches_counter in zip(list_matches, list_matches_counter):
+            list_conflicts_details, forced = self.get_most_similar_names(
+                dict_highest_counter,
+                matches, dist_substitution_dict,
+                desc_synonym_dict, list_name, dict_matches_counter)
+            list_details.extend(list_conflicts_details)
+
+            if forced:
+                return list_details, forced
 
         return list_details, forced
 
@@ -473,31 +479,55 @@ class NameAnalysisBuilder(AbstractNameAnalysisBuilder):
 
         return result
 
+    def get_analyze_request(self, db_matches, dist_substitution_dict, desc_synonym_dict, list_name):
+        return {'names': [match.name for match in db_matches],
+                'list_name': list_name,
+                'list_dist': list(dist_substitution_dict.keys()),
+                'list_desc': list(desc_synonym_dict.keys()),
+                'dict_substitution': dist_substitution_dict,
+                'dict_synonyms': desc_synonym_dict
+                }
+
+    def get_conflicts_scores(self, list_matches, dist_substitution_dict, desc_synonym_dict, list_name):
+        """Score every set of matches with a single auto analyze call, returns one {name: score} per set."""
+        auto_analyze_url = current_app.config.get('AUTO_ANALYZE_URL', None)
+        json_batches = [self.get_analyze_request(matches, dist_substitution_dict, desc_synonym_dict, list_name)
+                        for matches in list_matches if matches]
+        if not json_batches:
+            return [{} for _ in list_matches]
+
+        conflict_response = requests.post(url=auto_analyze_url.rstrip('/') + '/batch', json={'batches': json_batches})
+        if conflict_response.status_code == HTTPStatus.NOT_FOUND:
+            # The auto analyze service predates the batch endpoint, score the sets one by one
+            results = [requests.post(url=auto_analyze_url, json=json_analyze).json().get('result')
+                       for json_analyze in json_batches]
+        else:
+            if not conflict_response:
+                warnings.warn("Quart Service did not return a result", Warning)
+            results = conflict_response.json().get('results')
+
+        results = iter(results)
+        return [dict(ChainMap(*next(results))) if matches else {} for matches in list_matches]
+
     def get_most_similar_names(self, dict_highest_counter, db_matches, dist_substitution_dict, desc_synonym_dict,
-                               list_name):
+                               list_name, dict_matches_counter=None):
         auto_analyze_url = current_app.config.get('AUTO_ANALYZE_URL', None)
         list_details, selected_matches = [], []
         forced = False
-        list_dist = list(dist_substitution_dict.keys())
-        list_desc = list(desc_synonym_dict.keys())
 
         if db_matches:
             total = len(db_matches)
             print("Possible conflicts returned: ", total)
 
-            json_analyze = {'names': [match.name for match in db_matches],
-                            'list_name': list_name,
-                            'list_dist': list_dist,
-                            'list_desc': list_desc,
-                            'dict_substitution': dist_substitution_dict,
-                            'dict_synonyms': desc_synonym_dict
-                            }
-            conflict_response = requests.post(url=''.join([auto_analyze_url]),
-                                              json=json_analyze)
-            if not conflict_response:
-                warnings.warn("Quart Service did not return a result", Warning)
-            conflicts = conflict_response.json()
-            dict_matches_counter = dict(ChainMap(*conflicts.get('result')))
+            if dict_matches_counter is None:
+                json_analyze = self.get_analyze_request(db_matches, dist_substitution_dict, desc_synonym_dict,
+                                                        list_name)
+                conflict_response = requests.post(url=''.join([auto_analyze_url]),
+                                                  json=json_analyze)
+                if not conflict_response:
+                    warnings.warn("Quart Service did not return a result", Warning)
+                conflicts = conflict_response.json()
+                dict_matches_counter = dict(ChainMap(*conflicts.get('result')))
 
             selected_matches = [match for match in db_matches if match.name in dict_matches_counter.keys()]
 
@@ -1,27 +1,66 @@
 from flask import current_app
-from namex.models import NRNumberLifespan, NRNumberExclude, Request
+from namex.models import db, NRNumberLifespan, NRNumberPool
 
-import random
+import itertools
+import threading
+import time
 import logging
 
 
-def set_nr_num_lifespan(nr_num, span):
-    """Set the lifespan of a number by deleting old entries and inserting the new one."""
-    NRNumberLifespan.delete_old_entries(span)
-    if NRNumberLifespan.check_nr_num_lifespan(nr_num):
-        return False
-    NRNumberLifespan.insert_nr_num(nr_num)
-    return True
+'''
+NR numbers are claimed from a pool of pre-vetted random numbers, in a single statement per number.
 
+The size of the pool is checked every NR_NUM_POOL_CHECK_INTERVAL claims, or when a claim finds it empty, and it is
+topped up once it falls below NR_NUM_POOL_LOW_WATER, in a background thread unless NR_NUM_POOL_REFILL_IN_BACKGROUND
+is off. The expired lifespan entries are swept at most once every NR_NUM_LIFESPAN seconds along with a refill.
+'''
 
-def check_nr_num_exists(nr_num):
-    """Check if a number exists in the NRNumber table."""
-    return bool(Request.find_by_nr(nr_num))
 
+class NRNumberPoolRefiller:
+    """Tops up the NR number pool, one refill at a time per process."""
 
-def check_nr_num_exclude(nr_num):
-    """Check if a number exists in the NRNumExclude table."""
-    return NRNumberExclude.check_nr_num_exclude(nr_num)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._swept_at = 0.0
+        self._claims = itertools.count(1)
+
+    def should_check(self):
+        """Whether the pool size is due for a check, every NR_NUM_POOL_CHECK_INTERVAL claims."""
+        return next(self._claims) % current_app.config.get('NR_NUM_POOL_CHECK_INTERVAL', 10) == 0
+
+    def refill(self, wait=False):
+        """Refill the pool and sweep the expired lifespans, unless another refill is already running and not waited."""
+        if not self._lock.acquire(blocking=wait):
+            return 0
+        try:
+            span = current_app.config.get('NR_NUM_LIFESPAN')
+            if time.monotonic() - self._swept_at >= span:
+                NRNumberLifespan.delete_old_entries(span)
+                self._swept_at = time.monotonic()
+
+            missing = current_app.config.get('NR_NUM_POOL_SIZE') - NRNumberPool.get_size()
+            if missing <= 0:
+                return 0
+            return NRNumberPool.refill(missing)
+        finally:
+            self._lock.release()
+
+    def refill_in_background(self):
+        app = current_app._get_current_object()
+
+        def run():
+            with app.app_context():
+                try:
+                    self.refill()
+                except Exception as e:
+                    logging.error(f'Exception refilling the NR number pool; {str(e)}')
+                finally:
+                    db.session.remove()
+
+        threading.Thread(target=run, name='nr-number-pool-refill', daemon=True).start()
+
+
+nr_number_pool_refiller = NRNumberPoolRefiller()
 
 
 class NRNumberService:
@@ -35,38 +74,38 @@ class NRNumberService:
     @classmethod
     def get_new_nr_num(cls):
         """
-        Generate a new NR number that is unique and within the specified lifespan.
+        Claim a new NR number that is unique and within the specified lifespan.
 
         Returns:
             str: A new unique NR number.
         """
         try:
-            floor = 1  # assumed there is no NR 0000000
-            ceiling = 9999999
-            attempts = 100000000
+            attempts = current_app.config.get('NR_NUM_POOL_CLAIM_ATTEMPTS')
             count = 0
 
-            span = current_app.config.get('NR_NUM_LIFESPAN')
-
             while count < attempts:
-                random_num = random.randint(floor, ceiling)
-                nr_num = f'NR {str(random_num).zfill(7)}'
                 count += 1
+                nr_num = NRNumberPool.claim_nr_num()
 
-                if not set_nr_num_lifespan(nr_num, span):
-                    continue
+                if nr_num:
+                    if nr_number_pool_refiller.should_check():
+                        cls._top_up_pool()
+                    return nr_num
 
-                if check_nr_num_exists(nr_num):
-                    continue
+                # the pool is empty, or the claimed number got used since it was pooled
+                if not NRNumberPool.get_size():
+                    nr_number_pool_refiller.refill(wait=True)
 
-                if check_nr_num_exclude(nr_num):
-                    continue
-
-                return nr_num
-
-            raise Exception(
-                f'Unable to generate random number from range {floor} to {ceiling} after {count} attempts.'
-                )
+            raise Exception(f'Unable to claim a NR number from the pool after {count} attempts.')
         except Exception as e:
             logging.error(f'Exception in get_new_nr_num; {str(e)}')
             raise
+
+    @classmethod
+    def _top_up_pool(cls):
+        if NRNumberPool.get_size() >= current_app.config.get('NR_NUM_POOL_LOW_WATER'):
+            return
+        if current_app.config.get('NR_NUM_POOL_REFILL_IN_BACKGROUND'):
+            nr_number_pool_refiller.refill_in_background()
+        else:
+            nr_number_pool_refiller.refill()
@@ -0,0 +1,126 @@
+"""Relay of the outbox messages to the queue.
+
+The messages are written to the outbox_messages table in the transaction of the change they announce, so a message
+is never published for a rolled back change nor lost for a committed one. Once a transaction that wrote messages
+commits, the relay of the process publishes the pending messages in batches, oldest first. The messages that
+failed to publish are retried on the next pass, the later messages of the same NR wait for them so the NR messages
+are always published in order. The relay also wakes up every QUEUE_OUTBOX_RELAY_INTERVAL seconds to pick up the
+messages left by a process that stopped before relaying them.
+"""
+import threading
+
+from flask import current_app
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from namex.models import db
+from namex.models.outbox_message import OutboxMessage
+from namex.services import queue
+
+
+OUTBOX_PENDING = 'outbox_pending'
+# a single relay drains the outbox at a time, across the processes
+OUTBOX_LOCK_KEY = 7010001
+
+
+class OutboxRelay:
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def drain(self, connection, publish=None):
+        """Publish a batch of the pending messages in the transaction of connection, returns the number published.
+
+        Returns None when another relay is draining the outbox.
+        """
+        publish = publish or queue.publish
+        table = OutboxMessage.__table__
+
+        if not connection.execute(text('select pg_try_advisory_xact_lock(:key)'), {'key': OUTBOX_LOCK_KEY}).scalar():
+            return None
+
+        rows = connection.execute(
+            table.select().
+            where(table.c.attempts < current_app.config.get('QUEUE_OUTBOX_MAX_ATTEMPTS', 10)).
+            order_by(table.c.id).
+            limit(current_app.config.get('QUEUE_OUTBOX_BATCH_SIZE', 100))).fetchall()
+
+        published_ids = []
+        failed_nr_nums = set()
+        for row in rows:
+            if row.nr_num in failed_nr_nums:
+                continue
+            try:
+                publish(topic=row.topic, payload=row.payload)
+                published_ids.append(row.id)
+            except Exception as err:  # noqa: B902
+                current_app.logger.error('Unable to publish outbox message {} of {}: {}'.format(row.id, row.nr_num, err))
+                failed_nr_nums.add(row.nr_num)
+                connection.execute(table.update().where(table.c.id == row.id).
+                                   values(attempts=table.c.attempts + 1, last_error=str(err)[:1000]))
+
+        if published_ids:
+            connection.execute(table.delete().where(table.c.id.in_(published_ids)))
+        return len(published_ids)
+
+    def relay(self, publish=None):
+        """Drain the outbox, each batch in its own transaction."""
+        batch_size = current_app.config.get('QUEUE_OUTBOX_BATCH_SIZE', 100)
+        while True:
+            with db.engine.begin() as connection:
+                published = self.drain(connection, publish)
+            if not published or published < batch_size:
+                return
+
+    def init_app(self, app):
+        """Start the relay of the process with its first request, to relay the messages left by other processes."""
+        if app.config.get('QUEUE_OUTBOX_ENABLED', True) and app.config.get('QUEUE_OUTBOX_RELAY_IN_BACKGROUND', True):
+            app.before_request(self._start)
+
+    def trigger(self):
+        """Have the messages of a committed transaction relayed."""
+        if not current_app.config.get('QUEUE_OUTBOX_RELAY_IN_BACKGROUND', True):
+            self.relay()
+            return
+
+        self._start()
+        self._wakeup.set()
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    app = current_app._get_current_object()
+                    self._thread = threading.Thread(target=self._run, args=(app,), name='outbox-relay', daemon=True)
+                    self._thread.start()
+
+    def _run(self, app):
+        with app.app_context():
+            interval = app.config.get('QUEUE_OUTBOX_RELAY_INTERVAL', 30)
+            while True:
+                self._wakeup.wait(interval)
+                self._wakeup.clear()
+                try:
+                    self.relay()
+                except Exception as err:  # noqa: B902
+                    app.logger.error('Outbox relay failed: {}'.format(err))
+
+
+outbox_relay = OutboxRelay()
+
+
+@event.listens_for(Session, 'after_commit')
+def relay_after_commit(session):
+    """Relay the messages the committed transaction wrote to the outbox."""
+    if session.info.pop(OUTBOX_PENDING, False):
+        try:
+            outbox_relay.trigger()
+        except Exception as err:  # noqa: B902
+            # the messages stay in the outbox for the next relay
+            current_app.logger.error('Unable to relay the outbox: {}'.format(err))
+
+
+@event.listens_for(Session, 'after_rollback')
+def clear_outbox_pending(session):
+    session.info.pop(OUTBOX_PENDING, None)
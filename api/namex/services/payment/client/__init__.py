@@ -1,6 +1,8 @@
 import json
 import os
 import tempfile
+import threading
+import time
 from enum import Enum
 from functools import wraps
 
@@ -11,6 +13,29 @@ from flask import current_app
 MSG_CLIENT_CREDENTIALS_REQ_FAILED = 'Client credentials request failed'
 MSG_INVALID_HTTP_VERB = 'Invalid HTTP verb'
 
+# a client credentials token is renewed this many seconds before it expires
+TOKEN_EXPIRY_MARGIN = 30
+
+# the client credentials tokens of the process, by (auth url, client id), as (token, expires at)
+_tokens = {}
+_tokens_lock = threading.Lock()
+# each thread keeps its own keep-alive connections to the payment and auth services
+_sessions = threading.local()
+
+
+def get_session():
+    """Return the requests session of the thread."""
+    session = getattr(_sessions, 'session', None)
+    if session is None:
+        session = _sessions.session = requests.Session()
+    return session
+
+
+def clear_client_credentials(auth_url, client_id):
+    """Forget the token of the client, the next request gets a new one."""
+    with _tokens_lock:
+        _tokens.pop((auth_url, client_id), None)
+
 
 class ApiClientException(Exception):
     def __init__(self, wrapped_err=None, body=None, message='Exception', status_code=500):
@@ -142,7 +167,13 @@ class BaseClient:
 
     @staticmethod
     def get_client_credentials(auth_url, client_id, secret):
-        auth = requests.post(
+        """Return the client credentials token, reused by the requests of the process until it expires."""
+        with _tokens_lock:
+            token, expires_at = _tokens.get((auth_url, client_id), (None, 0))
+        if token and time.monotonic() < expires_at:
+            return True, token
+
+        auth = get_session().post(
             auth_url,
             auth=(client_id, secret),
             headers={
@@ -161,7 +192,11 @@ class BaseClient:
             # return True, 'asdf-asdf-asdf-adsf'
             return False, auth.json()
 
-        token = dict(auth.json())['access_token']
+        auth_json = dict(auth.json())
+        token = auth_json['access_token']
+        expires_in = auth_json.get('expires_in') or 0
+        with _tokens_lock:
+            _tokens[(auth_url, client_id)] = (token, time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN)
         return True, token
 
     def set_api_client_auth_header(self, token):
@@ -194,11 +229,13 @@ class BaseClient:
         try:
             if method not in HttpVerbs:
                 raise ApiClientError(message=MSG_INVALID_HTTP_VERB)
+            client_credentials = None
             if not headers or 'Authorization' not in headers:
                 PAYMENT_SVC_AUTH_URL = current_app.config.get('PAYMENT_SVC_AUTH_URL')
                 PAYMENT_SVC_AUTH_CLIENT_ID = current_app.config.get('PAYMENT_SVC_AUTH_CLIENT_ID')
                 PAYMENT_SVC_CLIENT_SECRET = current_app.config.get('PAYMENT_SVC_CLIENT_SECRET')
-                authenticated, token = self.get_client_credentials(PAYMENT_SVC_AUTH_URL, PAYMENT_SVC_AUTH_CLIENT_ID, PAYMENT_SVC_CLIENT_SECRET)
+                client_credentials = (PAYMENT_SVC_AUTH_URL, PAYMENT_SVC_AUTH_CLIENT_ID, PAYMENT_SVC_CLIENT_SECRET)
+                authenticated, token = self.get_client_credentials(*client_credentials)
                 if not authenticated:
                     raise ApiAuthError(token, message=MSG_CLIENT_CREDENTIALS_REQ_FAILED)
                 headers = {
@@ -210,22 +247,15 @@ class BaseClient:
                 headers['Account-Id'] = str(headers['Account-Id'])
 
             url = self.build_url(url)
-            if data:
-                response = requests.request(
-                    method.value,
-                    url,
-                    params=params,
-                    # Dump and load to serialize dates
-                    json=json.loads(json.dumps(data, default=str)) if data else None,
-                    headers=headers
-                )
-            else:
-                response = requests.request(
-                    method.value,
-                    url,
-                    params=params,
-                    headers=headers
-                )
+            response = self.send_request(method, url, params, data, headers)
+            if response.status_code == 401 and client_credentials:
+                # the reused token was revoked before it expired, retry once with a new one
+                clear_client_credentials(*client_credentials[:2])
+                authenticated, token = self.get_client_credentials(*client_credentials)
+                if not authenticated:
+                    raise ApiAuthError(token, message=MSG_CLIENT_CREDENTIALS_REQ_FAILED)
+                headers['Authorization'] = f'Bearer {token}'
+                response = self.send_request(method, url, params, data, headers)
 
             if not response or not response.ok:
                 raise ApiRequestError(response)
@@ -241,6 +271,24 @@ class BaseClient:
         except Exception as ex:
             raise ex
 
+    @staticmethod
+    def send_request(method, url, params, data, headers):
+        if data:
+            return get_session().request(
+                method.value,
+                url,
+                params=params,
+                # Dump and load to serialize dates
+                json=json.loads(json.dumps(data, default=str)) if data else None,
+                headers=headers
+            )
+        return get_session().request(
+            method.value,
+            url,
+            params=params,
+            headers=headers
+        )
+
     def deserialize_file(self, response):
         """
         Deserializes body to file
@@ -1,22 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from flask import current_app
 from http import HTTPStatus
 
+from namex.constants import PaymentState, PaymentStatusCode
+from namex.services.cache import cache
+
 from .client import SBCPaymentClient
 from .models import PaymentInvoice
 from .exceptions import SBCPaymentException
 
 
+PAYMENT_INVOICE_CACHE_KEY_PREFIX = 'sbc_payment_invoice'
+
+# the invoices in these states are not updated anymore by SBC Pay
+FINAL_INVOICE_STATUS_CODES = [
+    PaymentStatusCode.COMPLETED.value,
+    PaymentStatusCode.REFUNDED.value,
+    PaymentStatusCode.CANCELLED.value
+]
+
+# shared by the requests of the process, so its threads keep their connections to SBC Pay alive
+_executor = None
+_executor_lock = threading.Lock()
+
+
 def get_payment(payment_identifier):
+    return PaymentInvoice(**_fetch_payment(payment_identifier))
+
+
+def get_payments(payments):
+    """Return the SBC Pay invoice of each payment, by payment token.
+
+    The invoices are fetched concurrently. The ones in a final state are cached, by payment token and payment status
+    code so a payment refunded or cancelled by namex is fetched again.
+    """
+    invoices = {}
+    to_fetch = []
+    for payment in payments:
+        api_response = cache.get(_get_invoice_cache_key(payment))
+        if api_response is None:
+            to_fetch.append(payment)
+        else:
+            invoices[payment.payment_token] = PaymentInvoice(**api_response)
+
+    if len(to_fetch) == 1:
+        responses = [_fetch_payment(to_fetch[0].payment_token)]
+    elif to_fetch:
+        app = current_app._get_current_object()
+        futures = [_get_executor().submit(_fetch_payment_in_context, app, payment.payment_token) for payment in to_fetch]
+        # wait for all of them, the first error in the order of the payments is raised
+        responses = [future.exception() or future.result() for future in futures]
+        for response in responses:
+            if isinstance(response, Exception):
+                raise response
+    else:
+        responses = []
+
+    for payment, api_response in zip(to_fetch, responses):
+        invoices[payment.payment_token] = PaymentInvoice(**api_response)
+        if _is_final_invoice(payment, api_response):
+            cache.set(_get_invoice_cache_key(payment), api_response,
+                      timeout=current_app.config.get('PAYMENT_INVOICE_CACHE_TIMEOUT', 0))
+    return invoices
+
+
+def _fetch_payment(payment_identifier):
     try:
-        api_instance = SBCPaymentClient()
-        api_response = api_instance.get_payment(payment_identifier)
+        api_response = SBCPaymentClient().get_payment(payment_identifier)
         current_app.logger.debug(api_response)
-        return PaymentInvoice(**api_response)
+        return api_response
 
     except Exception as err:
         raise SBCPaymentException(err)
 
 
+def _fetch_payment_in_context(app, payment_identifier):
+    with app.app_context():
+        return _fetch_payment(payment_identifier)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=current_app.config.get('PAYMENT_SVC_FETCH_WORKERS', 4),
+                                               thread_name_prefix='sbc-pay')
+    return _executor
+
+
+def _get_invoice_cache_key(payment):
+    return f'{PAYMENT_INVOICE_CACHE_KEY_PREFIX}/{payment.payment_token}/{payment.payment_status_code}'
+
+
+def _is_final_invoice(payment, api_response):
+    status_code = api_response.get('statusCode')
+    if status_code == PaymentStatusCode.COMPLETED.value:
+        # SBC Pay only reports the refund requested by namex once it is processed
+        return payment.payment_status_code != PaymentState.REFUND_REQUESTED.value
+    return status_code in FINAL_INVOICE_STATUS_CODES
+
+
 def create_payment(model, headers):
     try:
         data = model
@@ -0,0 +1,7 @@
+"""In-process synonym and designation lookups.
+
+The synonym engine loads the synonym table once and answers the synonyms API operations from memory,
+see SynonymEngine and SynonymsApi.
+"""
+from .engine import SynonymEngine, SynonymIndex
+from .synonyms_api import LocalSynonymsApi, SynonymsApi, fetch_synonyms_version, synonym_engine
@@ -0,0 +1,366 @@
+import re
+import string
+import threading
+from collections import defaultdict
+
+from nltk.stem import PorterStemmer
+from pyinflect import getInflection
+
+from namex.constants import LanguageCodes
+from namex.services.exceptions import ApiServiceException
+from namex.utils.entity_type import get_entity_type_code_DEPRECATED, get_designation_position_code
+
+from .mixins.designation import SynonymDesignationMixin
+from .mixins.model import SynonymModelMixin
+
+porter = PorterStemmer()
+
+WORD_TOKEN_RX = re.compile(r'\w+')
+WORD_ONLY_RX = re.compile(r'^\w+$')
+
+# Column positions in SynonymIndex.rows
+CATEGORY = 0
+SYNONYMS_TEXT = 1
+STEMS_TEXT = 2
+
+'''
+In-process replacement for the per-word queries in solr-synonyms-api (synonyms.services.synonyms.SynonymService).
+The whole synonym table is loaded once into a SynonymIndex; every lookup the REST service answers with a Postgres
+regex filter is answered here with set operations over that index. Results keep the same content and ordering as the
+REST service, which returns rows in table (id) order.
+'''
+
+
+class SynonymIndex:
+    """Immutable, in-memory view of the synonym table.
+
+    Words are indexed by their \\w+ tokens, which is exactly what a Postgres '\\y<word>\\y' filter matches for a word
+    made of word characters. Category filters are evaluated once per distinct category and cached, as the table only
+    has a handful of categories.
+    """
+
+    def __init__(self, rows):
+        self.rows = []
+        self.categories = defaultdict(list)
+        self.synonym_tokens = defaultdict(set)
+        self.stem_tokens = defaultdict(set)
+        self.memo = {}
+        self._category_rows = {}
+
+        for idx, row in enumerate(sorted(rows, key=lambda r: r.get('id') or 0)):
+            category = row.get('category').lower() if row.get('category') else None
+            synonyms_text = row.get('synonymsText') or ''
+            stems_text = row.get('stemsText') or ''
+            self.rows.append((category, synonyms_text, stems_text))
+
+            # lower(NULL) ~ '...' is NULL in Postgres, so rows without a category never match a category filter
+            if category is not None:
+                self.categories[category].append(idx)
+            for token in WORD_TOKEN_RX.findall(synonyms_text.lower()):
+                self.synonym_tokens[token].add(idx)
+            for token in WORD_TOKEN_RX.findall(stems_text.lower()):
+                self.stem_tokens[token].add(idx)
+
+    def category_rows(self, pattern=None):
+        """Return the ids of the rows whose category matches the pattern, or of every categorized row."""
+        rows = self._category_rows.get(pattern)
+        if rows is None:
+            rx = re.compile(pattern) if pattern else None
+            rows = frozenset(
+                idx
+                for category, ids in self.categories.items() if rx is None or rx.search(category)
+                for idx in ids
+            )
+            self._category_rows[pattern] = rows
+        return rows
+
+    def word_rows(self, word, stem=False):
+        """Return the ids of the rows containing the word, like a '\\y<word>\\y' filter on the lowered column."""
+        term = porter.stem(word).replace(' ', '') if stem else word.replace(' ', '')
+        tokens = self.stem_tokens if stem else self.synonym_tokens
+        if WORD_ONLY_RX.match(term):
+            return tokens.get(term, frozenset())
+
+        # Words with punctuation are still regular expressions to the REST service, e.g. 'co.'
+        try:
+            rx = re.compile(r'\b{}\b'.format(term))
+        except re.error:
+            return frozenset()
+        column = STEMS_TEXT if stem else SYNONYMS_TEXT
+        return frozenset(idx for idx, row in enumerate(self.rows) if rx.search(row[column].lower()))
+
+    def select(self, include=(), exclude=(), word=None, stem=False):
+        """Return the ids, in table order, of the rows matching every include and none of the exclude patterns."""
+        candidates = None
+        for pattern in include:
+            rows = self.category_rows(pattern)
+            candidates = rows if candidates is None else candidates & rows
+        if candidates is None:
+            candidates = self.category_rows()
+        for pattern in exclude:
+            candidates = candidates - self.category_rows(pattern)
+        if word:
+            candidates = candidates & self.word_rows(word, stem)
+
+        return sorted(candidates)
+
+    def flatten(self, ids, columns):
+        """Flatten the CSV columns of the given rows, as SynonymService.flatten_synonyms_text does."""
+        values = [self.rows[idx][column].strip() for idx in ids for column in columns]
+        items = [item for value in values for item in value.split(',')]
+        return list(map(str.strip, filter(None, items)))
+
+
+class SynonymEngine(SynonymDesignationMixin, SynonymModelMixin):
+    """Embeddable synonym / designation service backed by a SynonymIndex.
+
+    The engine is loaded lazily through the loader callable on first use, or eagerly with load(rows), where rows are
+    dicts shaped like synonyms.models.synonym.Synonym.json(). Swapping the index is atomic, readers never see a
+    partially built snapshot.
+    """
+
+    def __init__(self, rows=None, loader=None):
+        self._loader = loader
+        self._index = None
+        self._lock = threading.Lock()
+        if rows is not None:
+            self.load(rows)
+
+    @property
+    def loaded(self):
+        return self._index is not None
+
+    def load(self, rows):
+        self._index = SynonymIndex(rows)
+
+    def reload(self):
+        if not self._loader:
+            raise ApiServiceException(message='Synonym engine has no loader configured.')
+        self.load(self._loader())
+
+    def get_index(self):
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self.reload()
+                index = self._index
+        return index
+
+    def memoize(self, key, factory):
+        """Cache a value derived from the synonym table for the lifetime of the current snapshot."""
+        memo = self.get_index().memo
+        if key not in memo:
+            memo[key] = factory()
+        return memo[key]
+
+    def _lookup(self, include=(), exclude=(), word=None, stem=False, columns=(STEMS_TEXT, SYNONYMS_TEXT)):
+        index = self.get_index()
+        if word:
+            return index.flatten(index.select(include, exclude, word, stem), columns)
+
+        # Word-less lookups (stop words, prefixes, designations...) only depend on the table contents
+        key = ('lookup', tuple(include), tuple(exclude), columns)
+        if key not in index.memo:
+            index.memo[key] = tuple(index.flatten(index.select(include, exclude), columns))
+        return list(index.memo[key])
+
+    '''
+    Designations, distinctives and descriptives return stems_text
+    '''
+
+    def get_synonyms(self, word=None, category=False):
+        word = word.lower() if isinstance(word, str) else None
+        columns = (SYNONYMS_TEXT,) if category else (STEMS_TEXT, SYNONYMS_TEXT)
+        exclude = [r'\bsub\b', r'\bstop\b']
+
+        results = self._lookup(exclude=exclude, word=word, columns=columns)
+        if not results:
+            # Search the stems instead; without a word the REST service drops the stop filter instead
+            if word:
+                results = self._lookup(exclude=exclude, word=word, stem=True, columns=columns)
+            else:
+                results = self._lookup(exclude=exclude[:1], columns=columns)
+
+        return results
+
+    def get_substitutions(self, word=None):
+        word = word.lower() if isinstance(word, str) else None
+        include = [r'\bsub\b']
+
+        results = self._lookup(include=include, word=word)
+        if not results:
+            # Add ing to the word if applicable
+            results = self.get_gerund_word(word)
+
+        return results
+
+    def get_stop_words(self, word=None):
+        word = word.lower() if isinstance(word, str) else None
+        include = [r'\bstop word[s]?\b']
+
+        results = self._lookup(include=include, word=word)
+
+        return sorted(set(results), key=len, reverse=True)
+
+    def get_prefixes(self):
+        return self._lookup(include=[r'\bprefix(es)?\b'])
+
+    def get_standalone(self):
+        results = self._lookup(include=[r'\bstand-alone\b'], columns=(SYNONYMS_TEXT,))
+
+        return sorted(set(results), key=len, reverse=True)
+
+    def get_number_words(self):
+        return self._lookup(include=[r'\bnumber(s)? sub\b'])
+
+    def get_designations(self, entity_type_str, position_str, lang):
+        lang = lang if isinstance(lang, str) else LanguageCodes.ENG.value
+
+        entity_type_code = get_entity_type_code_DEPRECATED(entity_type_str)
+        position_code = get_designation_position_code(position_str) if isinstance(position_str, str) else position_str
+
+        include = []
+        if entity_type_code is not None:
+            include.append(r'\b{}[-_]+valid\b'.format(entity_type_code.value.lower()))
+
+        if position_code is not None:
+            include.append(r'\b{}\b'.format('designation[s]?[_-]+' + position_code.value.lower()))
+        else:
+            include.append(r'\b{}\b'.format('designation[s]?[_-]'))
+
+        include.append(r'\b{}\b'.format(lang.lower()))
+
+        def build():
+            columns = (STEMS_TEXT,) if entity_type_code else (STEMS_TEXT, SYNONYMS_TEXT)
+            flattened = list(set(self._lookup(include=include, columns=columns)))
+            flattened.sort(key=len, reverse=True)
+            return tuple(flattened)
+
+        return list(self.memoize(('designations',) + tuple(include), build))
+
+    def find(self, term, col):
+        """Return the CSV synonym lists containing term, as synonyms.models.synonym.Synonym.find does."""
+        term = term.lower()
+        column = SYNONYMS_TEXT if col == 'synonyms_text' else STEMS_TEXT
+        index = self.get_index()
+
+        # A list entry made of word characters is always a whole token of the column
+        tokens = index.synonym_tokens if column == SYNONYMS_TEXT else index.stem_tokens
+        candidates = tokens.get(term, ()) if WORD_ONLY_RX.match(term) else range(len(index.rows))
+
+        results = []
+        for idx in sorted(candidates):
+            text = index.rows[idx][column]
+            if term in [synonym.strip().lower() for synonym in text.split(',')]:
+                results.append(text)
+
+        return results
+
+    def get_gerund_word(self, word):
+        gerund = getInflection(word, 'VBG') if word else None
+        return [gerund[0]] if gerund is not None else []
+
+    def exception_regex(self, text):
+        # Build exception list to avoid separation of numbers and letters when they are part of synonym table such as H20, 4MULA, ACTIV8
+        exceptions_ws = []
+        for word in re.sub(r'[^a-zA-Z0-9 -\']+', ' ', text, 0, re.IGNORECASE).split():
+            if self.get_substitutions(word) and bool(re.search(r'\d', word)):
+                exceptions_ws.append(word)
+
+        if not exceptions_ws:
+            exceptions_ws.append('null')
+
+        return exceptions_ws
+
+    '''
+    Text transforms, see SynonymService.regex_transform in solr-synonyms-api for the full list of rules.
+    '''
+
+    def regex_transform(self, text, designation_all, prefix_list, number_list, exceptions_ws):
+        designation_all_regex = '|'.join(designation_all)
+
+        ordinal_suffixes = 'ST|[RN]D|TH'
+        internet_domains = '.COM|.ORG|.NET|.EDU'
+
+        text = self.regex_remove_designations(text, internet_domains, designation_all_regex)
+        text = self.regex_numbers_lot(text)
+        text = self.regex_repeated_strings(text)
+        text = self.regex_separated_ordinals(text, ordinal_suffixes)
+        text = self.regex_punctuation(text)
+        text = self.regex_together_one_letter(text)
+        text = self.regex_remove_extra_spaces(text)
+
+        return text
+
+    @classmethod
+    def regex_remove_designations(cls, text, internet_domains, designation_all_regex):
+        text = re.sub(r'\b({0})\b|(?<=\d),(?=\d)|(?<!\w)({1})(?![A-Za-z0-9_.])(?=.*$)'.format(
+            internet_domains,
+            designation_all_regex),
+            '',
+            text,
+            0,
+            re.IGNORECASE)
+        return " ".join(text.split())
+
+    @classmethod
+    def regex_prefixes(cls, text, prefixes, exception_designation):
+        exception_designation_rx = '|'.join(map(re.escape, exception_designation))
+        ws_generic_rx = r'(?<![a-zA-Z0-9_.])({0})\s*([ &/.-])\s*([A-Za-z]+)'.format(prefixes)
+        designation_rx = re.compile(r'({0})|{1}'.format(exception_designation_rx, ws_generic_rx), re.I)
+
+        text = designation_rx.sub(lambda x: x.group(1) or (x.group(2) + x.group(4)), text)
+
+        return " ".join(text.split())
+
+    @classmethod
+    def regex_numbers_lot(cls, text):
+        text = re.sub(r'(?<=[a-zA-Z\.])\'[Ss]|\(.*\d+.*\)|\(?No.?\s*\d+\)?|\(?lot.?\s*\d+[-]?\d*\)?',
+                      '',
+                      text,
+                      0,
+                      re.IGNORECASE)
+        return " ".join(text.split())
+
+    @classmethod
+    def regex_repeated_strings(cls, text):
+        text = re.sub(r'\b(\w{2,})(\b\W+\b\1\b)*',
+                      r'\1',
+                      text,
+                      0,
+                      re.IGNORECASE)
+        return " ".join(text.split())
+
+    @classmethod
+    def regex_separated_ordinals(cls, text, ordinal_suffixes):
+        text = re.sub(r'\b(\d+({}))(\w+)\b'.format(ordinal_suffixes),
+                      r'\1 \3',
+                      text,
+                      0,
+                      re.IGNORECASE)
+        return " ".join(text.split())
+
+    @classmethod
+    def regex_punctuation(cls, text):
+        text = re.sub(rf"[{string.punctuation}]", " ", text)
+
+        return " ".join(text.split())
+
+    @classmethod
+    def regex_together_one_letter(cls, text):
+        text = re.sub(r'(\b[A-Za-z]{1,2}\b)\s+(?=[a-zA-Z]{1,2}\b)|\s+$',
+                      r'\1',
+                      text,
+                      0,
+                      re.IGNORECASE)
+        return " ".join(text.split())
+
+    @classmethod
+    def regex_remove_extra_spaces(cls, text):
+        text = re.sub(r'\s+',
+                      ' ',
+                      text,
+                      0,
+                      re.IGNORECASE)
+        return " ".join(text.split())
@@ -0,0 +1,21 @@
+import abc
+
+
+class SynonymEngineMixin(abc.ABC):
+    """Lookups the mixins build on, implemented by the host class (SynonymEngine)."""
+
+    @abc.abstractmethod
+    def get_designations(self, entity_type_str, position_str, lang):
+        pass
+
+    @abc.abstractmethod
+    def get_synonyms(self, word=None, category=False):
+        pass
+
+    @abc.abstractmethod
+    def get_substitutions(self, word=None):
+        pass
+
+    @abc.abstractmethod
+    def memoize(self, key, factory):
+        """Cache the value built by factory for the lifetime of the current synonym table."""
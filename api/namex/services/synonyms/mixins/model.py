@@ -0,0 +1,37 @@
+from . import SynonymEngineMixin
+
+"""
+Dictionary accessors for the synonym engine, mirrors synonyms.services.synonyms.mixins.model in solr-synonyms-api.
+"""
+
+
+class SynonymModelMixin(SynonymEngineMixin):
+    def get_all_substitutions_synonyms(self, list_d, distinctive=True):
+        dict_subs = {}
+
+        for word in list_d:
+            if distinctive:
+                aux_list = self.get_substitutions(word)
+            else:
+                aux_list = self.get_synonyms(word)
+            if aux_list:
+                dict_subs.update({word: aux_list})
+            else:
+                dict_subs.update({word: [word.lower()]})
+
+        # Return {'mountain': ['mount', 'mountain', 'mt', 'mtn']} based on list_d
+        return dict_subs
+
+    def get_all_categories_synonyms(self, list_d):
+        dict_subs = {}
+
+        for word in list_d:
+            aux_list = list(map(lambda d: d.lower(), self.get_synonyms(word, True)))
+            if aux_list:
+                dict_subs.update({word: aux_list})
+            else:
+                dict_subs.update({word: None})
+
+        # Return {'shop': ['beauty', 'store', 'sales', 'reatail'],
+        #         'coffee': ['non-alcoholic-beverages','restaurant']} based on list_d
+        return dict_subs
@@ -0,0 +1,176 @@
+from collections import namedtuple
+
+import requests
+from flask import current_app
+from swagger_client import SynonymsApi as RemoteSynonymsApi
+
+from namex.constants import DesignationPositionCodes, LanguageCodes
+from namex.services.exceptions import ApiServiceException
+
+from .engine import SynonymEngine
+
+'''
+swagger_client.SynonymsApi compatible access to the synonym engine.
+
+Every auto-analyse / name processing call site talks to the synonyms service through the generated swagger client,
+eg. syn_svc.get_designations(entity_type_code=..., position_code=..., lang=...).data
+LocalSynonymsApi answers the same calls in process, and SynonymsApi picks the local or the remote implementation
+depending on the SYNONYMS_IN_PROCESS setting, so the call sites don't need to know where the data comes from.
+'''
+
+SynonymsApiResponse = namedtuple('SynonymsApiResponse', ['data'])
+DictionaryList = namedtuple('DictionaryList', ['key', 'list'])
+
+SNAPSHOT_PATH = '/synonyms/snapshot'
+VERSION_PATH = '/synonyms/version'
+
+
+def fetch_synonym_rows():
+    """Load the full synonym table from the synonyms API in a single call."""
+    solr_synonyms_api_url = current_app.config.get('SOLR_SYNONYMS_API_URL', None)
+    if not solr_synonyms_api_url:
+        raise ApiServiceException(message='SOLR_SYNONYMS_API_URL is not set')
+
+    try:
+        response = requests.get(solr_synonyms_api_url + SNAPSHOT_PATH,
+                                timeout=current_app.config.get('SYNONYMS_SNAPSHOT_TIMEOUT', 30))
+        response.raise_for_status()
+    except requests.exceptions.RequestException as err:
+        raise ApiServiceException(wrapped_err=err, message='Unable to load the synonym table.') from err
+
+    return response.json().get('data', [])
+
+
+def fetch_synonyms_version():
+    """Return the fingerprint of the synonym table, None when the synonyms API can't be reached."""
+    solr_synonyms_api_url = current_app.config.get('SOLR_SYNONYMS_API_URL', None)
+    if not solr_synonyms_api_url:
+        return None
+
+    try:
+        response = requests.get(solr_synonyms_api_url + VERSION_PATH,
+                                timeout=current_app.config.get('SYNONYMS_SNAPSHOT_TIMEOUT', 30))
+        response.raise_for_status()
+    except requests.exceptions.RequestException as err:
+        current_app.logger.warning('Unable to get the synonym table version: %s', err)
+        return None
+
+    return response.json().get('version')
+
+
+synonym_engine = SynonymEngine(loader=fetch_synonym_rows)
+
+
+def _dictionary_list(results):
+    return [DictionaryList(key=key, list=value) for key, value in results.items()]
+
+
+class LocalSynonymsApi:
+    """Serve the synonyms API operations from an in-process SynonymEngine."""
+
+    def __init__(self, engine=None):
+        self.engine = engine or synonym_engine
+
+    def get_word_synonyms(self, word=None):
+        return SynonymsApiResponse(data=self.engine.get_synonyms(word))
+
+    def get_word_substitutions(self, word=None):
+        return SynonymsApiResponse(data=self.engine.get_substitutions(word))
+
+    def get_all_substitutions_synonyms(self, words=None, words_are_distinctive=False):
+        results = self.engine.get_all_substitutions_synonyms(words or [], words_are_distinctive)
+        return SynonymsApiResponse(data=_dictionary_list(results))
+
+    def get_all_categories_synonyms(self, list_desc=None):
+        results = self.engine.get_all_categories_synonyms(list_desc or [])
+        return SynonymsApiResponse(data=_dictionary_list(results))
+
+    def get_stop_words(self, word=None):
+        return SynonymsApiResponse(data=self.engine.get_stop_words(word))
+
+    def get_prefixes(self):
+        return SynonymsApiResponse(data=self.engine.get_prefixes())
+
+    def get_stand_alone(self):
+        return SynonymsApiResponse(data=self.engine.get_standalone())
+
+    def get_number_words(self):
+        return SynonymsApiResponse(data=self.engine.get_number_words())
+
+    def get_designations(self, entity_type_code=None, position_code=None, lang=None):
+        return SynonymsApiResponse(data=self.engine.get_designations(entity_type_code, position_code, lang))
+
+    def get_designated_end_all_words(self, lang=LanguageCodes.ENG.value):
+        return SynonymsApiResponse(data=self.engine.get_designations(None, DesignationPositionCodes.END.value, lang))
+
+    def get_designated_any_all_words(self, lang=LanguageCodes.ENG.value):
+        return SynonymsApiResponse(data=self.engine.get_designations(None, DesignationPositionCodes.ANY.value, lang))
+
+    def get_misplaced_end_designations(self, name, designation_end_entity_type):
+        return SynonymsApiResponse(
+            data=self.engine.get_misplaced_end_designations(name, designation_end_entity_type))
+
+    def get_incorrect_designation_end_in_name(self, tokenized_name, designation_end_list):
+        return SynonymsApiResponse(
+            data=self.engine.get_incorrect_designation_end_in_name(tokenized_name, designation_end_list))
+
+    def get_entity_type_end_designation(self, entity_end_designation_dict, all_designation_any_end_list):
+        return SynonymsApiResponse(data=self.engine.get_entity_type_end_designation(
+            entity_end_designation_dict, all_designation_any_end_list))
+
+    def get_entity_type_any_designation(self, entity_any_designation_dict, all_designation_any_end_list):
+        return SynonymsApiResponse(data=self.engine.get_entity_type_any_designation(
+            entity_any_designation_dict, all_designation_any_end_list))
+
+    def get_designation_end_in_name(self, name):
+        return SynonymsApiResponse(data=self.engine.get_designation_end_in_name(name))
+
+    def get_designation_all_in_name(self, name):
+        return SynonymsApiResponse(data=self.engine.get_designation_all_in_name(name))
+
+    def get_designation_any_in_name(self, name):
+        return SynonymsApiResponse(data=self.engine.get_designation_any_in_name(name))
+
+    def get_all_end_designations(self):
+        return SynonymsApiResponse(data=_dictionary_list(self.engine.get_all_end_designations()))
+
+    def get_all_any_designations(self):
+        return SynonymsApiResponse(data=_dictionary_list(self.engine.get_all_any_designations()))
+
+    def get_entity_type_by_value(self, entity_type_dicts, designation):
+        return SynonymsApiResponse(data=self.engine.get_entity_type_by_value(entity_type_dicts, designation))
+
+    def get_exception_regex(self, text):
+        return SynonymsApiResponse(data=self.engine.exception_regex(text))
+
+    def get_transform_text(self, text, designation_all, prefix_list, number_list, exceptions_ws=None):
+        return SynonymsApiResponse(data=self.engine.regex_transform(
+            text, designation_all, prefix_list, number_list, exceptions_ws or []))
+
+    def get_regex_prefixes(self, text, prefixes_str, exception_designation=None):
+        return SynonymsApiResponse(data=self.engine.regex_prefixes(text, prefixes_str, exception_designation or []))
+
+
+class SynonymsApi:
+    """Drop-in replacement for swagger_client.SynonymsApi.
+
+    Calls are answered by LocalSynonymsApi when SYNONYMS_IN_PROCESS is enabled and by the synonyms API otherwise.
+    The choice is made per call, as instances are created at import time, outside of any app context.
+    """
+
+    def __init__(self):
+        self._local = None
+        self._remote = None
+
+    def __getattr__(self, name):
+        return getattr(self._backend(), name)
+
+    def _backend(self):
+        if current_app.config.get('SYNONYMS_IN_PROCESS', False):
+            if self._local is None:
+                self._local = LocalSynonymsApi()
+            return self._local
+
+        if self._remote is None:
+            self._remote = RemoteSynonymsApi()
+        return self._remote
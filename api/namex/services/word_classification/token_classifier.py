@@ -1,9 +1,5 @@
-import pandas as pd
-
 from enum import Enum
 
-from ..name_request.auto_analyse.name_analysis_utils import data_frame_to_list
-
 
 class DataFrameFields(Enum):
     FIELD_SYNONYMS = 'synonyms_text'
@@ -105,30 +101,31 @@ class TokenClassifier:
 
     def _classify_tokens(self, word_tokens):
         try:
-            cf = pd.DataFrame(columns=['word', 'word_classification'])
+            classified_tokens = {
+                DataFrameFields.DISTINCTIVE.value: [],
+                DataFrameFields.DESCRIPTIVE.value: [],
+                DataFrameFields.UNCLASSIFIED.value: []
+            }
 
             wc_svc = self.word_classification_service
 
-            # Get the word classification for each word in the supplied name name
+            # Get the word classification for every word in the supplied name at once
+            word_classifications = wc_svc.find_classifications(word_tokens)
             for word in word_tokens:
-                word_classification = wc_svc.find_one(word)
-                new_row = []
-                if not word_classification:
+                token = word.lower().strip()
+                classifications = word_classifications.get(word.lower())
+                if not classifications:
                     print('No word classification found for: ' + word)
-                    new_row.append({
-                        'word': word.lower().strip(),
-                        'word_classification': DataFrameFields.UNCLASSIFIED.value
-                    })
-                else:
-                    for row in word_classification:
-                        new_row.append({
-                            'word': word.lower().strip(),
-                            'word_classification': row.classification.strip()
-                        })
-
-                cf = cf.append(new_row, ignore_index=True)
-
-            self.distinctive_word_tokens, self.descriptive_word_tokens, self.unclassified_word_tokens = data_frame_to_list(cf)
+                    classifications = [DataFrameFields.UNCLASSIFIED.value]
+
+                for classification in classifications:
+                    tokens = classified_tokens.get(classification.strip())
+                    if tokens is not None:
+                        tokens.append(token)
+
+            self.distinctive_word_tokens = classified_tokens[DataFrameFields.DISTINCTIVE.value]
+            self.descriptive_word_tokens = classified_tokens[DataFrameFields.DESCRIPTIVE.value]
+            self.unclassified_word_tokens = classified_tokens[DataFrameFields.UNCLASSIFIED.value]
 
         except Exception as error:
             print('Token classification failed! ' + repr(error))
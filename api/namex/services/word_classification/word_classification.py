@@ -1,11 +1,18 @@
-from namex.models import WordClassification
+import re
+
 from datetime import datetime
 
+from flask import current_app
+
+from namex.models import WordClassification
 from namex.models import User
+from namex.services.cache import cache
 # from namex.services.name_request.utils import get_or_create_user_by_jwt
 
 from .token_classifier import TokenClassifier
 
+CACHE_KEY_PREFIX = 'word_classification/'
+
 
 class WordClassificationService:
     def __init__(self):
@@ -17,6 +24,40 @@ class WordClassificationService:
     def find_one_by_class(word=None, classification=None):
         return WordClassification.find_word_by_classification(word, classification)
 
+    '''
+    Return {word: [classification, ...]} for every word, the classifications find_one would return for it.
+    Words are looked up in the cache first, the others are resolved with a single query.
+    '''
+
+    def find_classifications(self, words):
+        words = list(dict.fromkeys(word.lower() for word in words))
+        if not words:
+            return {}
+
+        keys = [CACHE_KEY_PREFIX + word for word in words]
+        classifications = {word: value for word, value in zip(words, cache.get_many(*keys)) if value is not None}
+
+        missing_words = [word for word in words if word not in classifications]
+        if missing_words:
+            rows = WordClassification.find_words_classification(missing_words)
+            found = {}
+            for word in missing_words:
+                word_regex = re.compile(r"{0}(''[a-zA-Z])?\b".format(re.escape(word)))
+                found[word] = tuple(row.classification for row in rows if word_regex.match(row.word.lower()))
+
+            cache.set_many({CACHE_KEY_PREFIX + word: value for word, value in found.items()},
+                           timeout=current_app.config.get('WORD_CLASSIFICATION_CACHE_TIMEOUT', 300))
+            classifications.update(found)
+
+        return classifications
+
+    @classmethod
+    def invalidate_cache(cls, word):
+        """Drop the cached classifications the word can be returned for, ie. every leading part of the word."""
+        word = word.lower()
+        prefixes = {word[:match.start()] for match in re.finditer(r'\b', word) if match.start()}
+        cache.delete_many(*[CACHE_KEY_PREFIX + prefix for prefix in prefixes])
+
     @classmethod
     def create(cls, word_classification, user_id):
         entity = WordClassification()
@@ -31,6 +72,7 @@ class WordClassificationService:
         entity.last_updated_by = user_id
 
         entity.save_to_db()
+        cls.invalidate_cache(entity.word)
 
         return entity
 
@@ -6,11 +6,32 @@ from flask import current_app
 from simple_cloudevent import SimpleCloudEvent
 from sbc_common_components.utils.enums import QueueMessageTypes
 
+from namex.models import db
+from namex.models.outbox_message import OutboxMessage
 from namex.services import queue
+from namex.services.outbox_relay import OUTBOX_PENDING
 
 
-def publish_email_notification(nr_num: str, option: str, refund_value=None):
-    """Send notification info to the mail queue."""
+def enqueue(topic: str, payload: bytes, nr_num: str, connection=None):
+    """Write the message to the outbox, in the transaction of connection or else of the session.
+
+    The message is published once the transaction commits. With QUEUE_OUTBOX_ENABLED off, it is published right away.
+    """
+    if not current_app.config.get('QUEUE_OUTBOX_ENABLED', True):
+        queue.publish(topic=topic, payload=payload)
+        return
+
+    values = OutboxMessage.insert_values(topic, payload, nr_num)
+    if connection is not None:
+        # called during a flush
+        connection.execute(OutboxMessage.__table__.insert().values(**values))
+    else:
+        db.session.execute(OutboxMessage.__table__.insert().values(**values))
+    db.session.info[OUTBOX_PENDING] = True
+
+
+def publish_email_notification(nr_num: str, option: str, refund_value=None, connection=None):
+    """Send notification info to the mail queue, once the transaction commits."""
     event_data = {
         'request': {
             'nrNum': nr_num,
@@ -33,7 +54,7 @@ def publish_email_notification(nr_num: str, option: str, refund_value=None):
     email_topic = current_app.config.get("EMAILER_TOPIC", "mailer")
     payload = queue.to_queue_message(ce)
     current_app.logger.debug('About to publish email for %s nrNum=%s', option, nr_num)
-    queue.publish(topic=email_topic, payload=payload)
+    enqueue(email_topic, payload, nr_num, connection)
 
 
 def create_name_request_state_msg(nr_num, state_cd, old_state_cd):
@@ -60,10 +81,10 @@ def create_name_request_state_msg(nr_num, state_cd, old_state_cd):
     return payload
 
 
-def send_name_request_state_msg(nr_num, state_cd, old_state_cd):
-    """Publish name request state message to pubsub nr state subject."""
+def send_name_request_state_msg(nr_num, state_cd, old_state_cd, connection=None):
+    """Publish name request state message to pubsub nr state subject, once the transaction commits."""
     email_topic = current_app.config.get("NAMEX_NR_STATE_TOPIC", "mailer")
-    queue.publish(topic=email_topic, payload=create_name_request_state_msg(nr_num, state_cd, old_state_cd))
+    enqueue(email_topic, create_name_request_state_msg(nr_num, state_cd, old_state_cd), nr_num, connection)
     current_app.logger \
         .debug('Published name request ({}) state change from {} -> {}'.format(nr_num, old_state_cd, state_cd))
 
@@ -93,7 +114,7 @@ def create_name_state_msg(nr_num, name_id, state_cd, old_state_cd):
     return payload
 
 
-def send_name_state_msg(nr_num, name_id, state_cd, old_state_cd):
-    """Publish name state message to pubsub nr state subject."""
+def send_name_state_msg(nr_num, name_id, state_cd, old_state_cd, connection=None):
+    """Publish name state message to pubsub nr state subject, once the transaction commits."""
     email_topic = current_app.config.get("NAMEX_NR_STATE_TOPIC", "mailer")
-    queue.publish(topic=email_topic, payload=create_name_state_msg(nr_num, state_cd, old_state_cd))
+    enqueue(email_topic, create_name_state_msg(nr_num, state_cd, old_state_cd), nr_num, connection)
@@ -1,6 +1,11 @@
 """
 SQL Alchemy utils.
 """
+import base64
+import json
+from datetime import date, datetime
+
+from sqlalchemy import and_, func, or_, select
 
 
 def query_result_to_dict(key, values):
@@ -9,3 +14,71 @@ def query_result_to_dict(key, values):
     :return:
     """
     return dict(zip(key, values))
+
+
+def encode_cursor(values):
+    """
+    Return an opaque paging token holding the sort key values of the last row of a page
+    :return:
+    """
+    encoded = [{'datetime': value.isoformat()} if isinstance(value, datetime)
+               else {'date': value.isoformat()} if isinstance(value, date)
+               else value
+               for value in values]
+    return base64.urlsafe_b64encode(json.dumps(encoded).encode('utf-8')).decode('utf-8')
+
+
+def decode_cursor(cursor):
+    """
+    Return the sort key values of a paging token, raises ValueError when the token is not valid
+    :return:
+    """
+    try:
+        encoded = json.loads(base64.urlsafe_b64decode(cursor.encode('utf-8')))
+    except (TypeError, ValueError, UnicodeError) as err:
+        raise ValueError('invalid cursor') from err
+    if not isinstance(encoded, list):
+        raise ValueError('invalid cursor')
+
+    return [datetime.fromisoformat(value['datetime']) if isinstance(value, dict) and 'datetime' in value
+            else date.fromisoformat(value['date']) if isinstance(value, dict) and 'date' in value
+            else value
+            for value in encoded]
+
+
+def keyset_criteria(sort_columns, values):
+    """
+    Return the criteria selecting the rows sorted after the given sort key values (seek pagination)
+    sort_columns is a list of (column, 'asc' | 'desc'), sorted NULLS LAST, the last one being unique
+    :return:
+    """
+    criteria = []
+    equal = []
+    for (column, direction), value in zip(sort_columns, values):
+        # nothing sorts after a null, nulls are last
+        if value is not None:
+            after = column > value if direction == 'asc' else column < value
+            criteria.append(and_(*equal, or_(after, column.is_(None))))
+        equal.append(column.is_(None) if value is None else column == value)
+
+    return or_(*criteria)
+
+
+def estimate_count(session, statement):
+    """
+    Return the number of rows of the statement estimated by the query planner, without running it
+    :return:
+    """
+    compiled = statement.compile(dialect=session.get_bind().dialect)
+    plan = session.connection().exec_driver_sql('EXPLAIN (FORMAT JSON) ' + str(compiled), compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def capped_count(session, statement, cap):
+    """
+    Return the number of rows of the statement, counting no more than cap rows
+    :return:
+    """
+    return session.execute(select(func.count()).select_from(statement.limit(cap).subquery())).scalar()
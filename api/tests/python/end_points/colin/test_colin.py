@@ -1,5 +1,11 @@
+import time
+from unittest.mock import patch
+
 import pytest
 
+from namex.resources.utils import EntityUtils
+from namex.services.cache import cache
+
 from .common import API_BASE_URI
 # Import token and claims if you need it
 # from ..common import token_header, claims
@@ -24,3 +30,62 @@ def test_colin_request(client, jwt, app):
     print(repr(response))
     assert response and response.status_code == 200
 
+
+
+class FakeColinSession:
+    """COLIN stub answering each request after a delay."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.paths = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def get(self, url):
+        self.paths.append(url.split('/businesses/')[1])
+        time.sleep(self.delay)
+        if url.endswith('/public'):
+            return FakeResponse({'business': {'identifier': 'BC0644263', 'legalName': 'TEST CORP', 'legalType': 'BC'}})
+        if url.endswith('/office'):
+            return FakeResponse({'registeredOffice': {'deliveryAddress': {'streetAddress': '123 Main St',
+                                                                          'addressCity': 'Victoria'}}})
+        return FakeResponse({'parties': [{'officer': {'firstName': 'Jane', 'lastName': 'Doe'},
+                                          'roles': [{'roleType': 'Director'}]}]})
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status_code = 200
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+def test_colin_lookup_fans_out_and_is_cached(client, app):
+    """Assert that the office and parties are fetched concurrently and that a repeated lookup is served from cache."""
+    cache.clear()
+    delay = 0.3
+    session = FakeColinSession(delay)
+
+    with patch.object(EntityUtils, 'get_authenticated_session', return_value=session):
+        start = time.monotonic()
+        response = client.get(API_BASE_URI + '0644263')
+        elapsed = time.monotonic() - start
+
+        assert response.status_code == 200
+        payload = response.json
+        assert payload['legalName'] == 'TEST CORP'
+        assert payload['directors'] == ['Jane  Doe']
+        assert payload['registered office delivery address'][0] == '123 Main St'
+        assert sorted(session.paths) == ['0644263/public', 'BC/0644263/office', 'BC/0644263/parties/all']
+        # the business request, then the office and parties requests together
+        assert elapsed < 3 * delay
+
+        assert client.get(API_BASE_URI + '0644263').json == payload
+        assert len(session.paths) == 3
+    cache.clear()
@@ -414,3 +414,47 @@ def test_consumed_event_history(client, jwt, app):
     assert rv.status_code == 200
 
     assert b'"user_action": "Get NR Details from NRO"' in rv.data
+
+
+def test_event_history_window(client, jwt, app):
+    from namex.models import State, User, Event
+    from namex.services import EventRecorder
+
+    user = User('test-user', '', '', '43e6a245-0bf7-4ccf-9bd0-e7fb85fd18cc',
+                'https://sso-dev.pathfinder.gov.bc.ca/auth/realms/sbc', '123', 'IDIR')
+    user.save_to_db()
+
+    headers = create_header(jwt, [User.EDITOR])
+
+    nr = create_base_nr()
+    nr.stateCd = State.DRAFT
+    nr.save_to_db()
+    EventRecorder.record(user, Event.POST + ' [payment completed] CREATE', nr, nr.json())
+
+    nr.stateCd = State.INPROGRESS
+    nr.save_to_db()
+    EventRecorder.record(user, Event.GET, nr, {})
+
+    nr.stateCd = State.HOLD
+    nr.save_to_db()
+    EventRecorder.record(user, Event.PATCH, nr, {'state': 'HOLD'})
+
+    rv = client.get('/api/v1/events/NR%200000002', headers=headers)
+    assert rv.status_code == 200
+    transactions = rv.json['transactions']
+    assert [txn['user_action'] for txn in transactions] == \
+        ['Hold Request', 'Get Next NR', 'Created NR (Payment Completed)']
+    assert {txn['user_name'] for txn in transactions} == {'test-user'}
+
+    rv = client.get('/api/v1/events/NR%200000002?limit=2', headers=headers)
+    assert rv.status_code == 200
+    assert rv.json['response']['count'] == 2
+    assert rv.json['transactions'] == transactions[:2]
+
+    since = Event.query.filter_by(nrId=nr.id, action=Event.GET).one().eventDate.isoformat()
+    rv = client.get('/api/v1/events/NR%200000002', query_string={'since': since}, headers=headers)
+    assert rv.status_code == 200
+    assert rv.json['transactions'] == transactions[:2]
+
+    rv = client.get('/api/v1/events/NR%200000002?limit=-1', headers=headers)
+    assert rv.status_code == 400
@@ -102,6 +102,57 @@ def test_namex_search_default(client, jwt, app):
         date = nr['submittedDate']
 
 
+@pytest.mark.parametrize('order', [
+    'submittedDate:desc,stateCd:desc',
+    'submittedDate:asc',
+    'stateCd:asc,nrNum:desc',
+])
+def test_namex_search_keyset_paging(client, jwt, app, order):
+    """Test paging with the next token returns the same NRs as paging with start."""
+    generate_nrs(14, [], [], [datetime.utcnow() - timedelta(days=i % 3) for i in range(14)])
+    headers = create_header(jwt, [User.EDITOR])
+
+    offset_nrs = []
+    for start in range(0, 14, 4):
+        rv = client.get(f'api/v1/requests?order={order}&rows=4&start={start}', headers=headers)
+        offset_nrs += [nr['nrNum'] for nr in rv.json['nameRequests'][0]]
+
+    keyset_nrs = []
+    after = ''
+    while after is not None:
+        rv = client.get(f'api/v1/requests?order={order}&rows=4&after={after}', headers=headers)
+        keyset_nrs += [nr['nrNum'] for nr in rv.json['nameRequests'][0]]
+        after = rv.json['response']['next']
+
+    assert len(offset_nrs) == 14
+    assert keyset_nrs == offset_nrs
+
+
+@pytest.mark.parametrize('count, num_found_exact', [
+    ('exact', True),
+    ('capped', True),
+    ('estimate', False),
+])
+def test_namex_search_count(client, jwt, app, count, num_found_exact):
+    """Test the count modes of the search."""
+    generate_nrs(14, [], [], [])
+
+    rv = client.get(f'api/v1/requests?count={count}', headers=create_header(jwt, [User.EDITOR]))
+
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.json['response']['numFoundExact'] == num_found_exact
+    if num_found_exact:
+        assert rv.json['response']['numFound'] == 14
+
+
+def test_namex_search_invalid_paging(client, jwt, app):
+    """Test invalid paging parameters are rejected."""
+    headers = create_header(jwt, [User.EDITOR])
+
+    assert client.get('api/v1/requests?after=nope', headers=headers).status_code == HTTPStatus.NOT_ACCEPTABLE
+    assert client.get('api/v1/requests?count=all', headers=headers).status_code == HTTPStatus.NOT_ACCEPTABLE
+
+
 @pytest.mark.parametrize('state_cd', [
     State.APPROVED,
     State.CANCELLED,
@@ -0,0 +1,44 @@
+"""Tests for the NR submission fingerprints."""
+from namex.models import NRSubmissionFingerprint, Request as RequestDAO, State
+
+
+def test_build_normalizes_email_and_names():
+    fingerprint = NRSubmissionFingerprint.build(' User@Example.com ', ['acme  widgets ltd.', 'ACME GADGETS LTD.'])
+
+    assert fingerprint == NRSubmissionFingerprint.build('user@example.com', ['ACME WIDGETS LTD.', 'acme gadgets ltd.'])
+    assert fingerprint != NRSubmissionFingerprint.build('user@example.com', ['ACME GADGETS LTD.', 'ACME WIDGETS LTD.'])
+    assert fingerprint != NRSubmissionFingerprint.build('other@example.com', ['ACME WIDGETS LTD.', 'ACME GADGETS LTD.'])
+
+
+def test_claim_turns_away_the_same_submission(client):
+    fingerprint = NRSubmissionFingerprint.build('user@example.com', ['ACME WIDGETS LTD.'])
+
+    assert NRSubmissionFingerprint.claim(fingerprint, 120)
+    assert not NRSubmissionFingerprint.claim(fingerprint, 120)
+    assert NRSubmissionFingerprint.claim(NRSubmissionFingerprint.build('user@example.com', ['ACME GADGETS LTD.']), 120)
+
+
+def test_claim_after_release_or_expiry(client):
+    released = NRSubmissionFingerprint.build('user@example.com', ['ACME WIDGETS LTD.'])
+    expired = NRSubmissionFingerprint.build('user@example.com', ['ACME GADGETS LTD.'])
+
+    assert NRSubmissionFingerprint.claim(released, 120)
+    NRSubmissionFingerprint.release(released)
+    assert NRSubmissionFingerprint.claim(released, 120)
+
+    assert NRSubmissionFingerprint.claim(expired, 0)
+    assert NRSubmissionFingerprint.claim(expired, 120)
+
+
+def test_claim_once_the_nr_moved_on(client):
+    nr = RequestDAO(nrNum='NR 0000001', stateCd=State.PENDING_PAYMENT)
+    nr.save_to_db()
+    fingerprint = NRSubmissionFingerprint.build('user@example.com', ['ACME WIDGETS LTD.'])
+    assert NRSubmissionFingerprint.claim(fingerprint, 120)
+    NRSubmissionFingerprint.assign(fingerprint, nr.id)
+
+    assert not NRSubmissionFingerprint.claim(fingerprint, 120)
+
+    nr.stateCd = State.CANCELLED
+    nr.save_to_db()
+    assert NRSubmissionFingerprint.claim(fingerprint, 120)
@@ -61,6 +61,74 @@ def test_get_queued_empty_queue(client, app):
         nr_oldest = RequestDAO.get_queued_oldest(user)
 
 
+def test_get_queued_oldest_records_checkout_event(client, app):
+
+    # SETUP #####
+    from namex.models import Request as RequestDAO, State, User, Event
+    nr = RequestDAO()
+    nr.nrNum = 'NR 0000001'
+    nr.stateCd = State.DRAFT
+    nr.save_to_db()
+
+    user = User(username='testUser', firstname='first', lastname='last', sub='idir/funcmunk', iss='keycloak', idp_userid='123', login_source='IDIR')
+    user.save_to_db()
+
+    nr_oldest = RequestDAO.get_queued_oldest(user)
+
+    # Tests ####
+    events = Event.query.filter_by(nrId=nr_oldest.id, action=Event.GET).all()
+    assert nr_oldest.stateCd == State.INPROGRESS
+    assert len(events) == 1
+    assert events[0].stateCd == State.INPROGRESS
+    assert events[0].userId == user.id
+
+
+@pytest.mark.parametrize('priority_queue', [False, True])
+def test_get_queued_oldest_query_skips_locked(client, app, priority_queue):
+    from sqlalchemy.dialects import postgresql
+    from namex.models import Request as RequestDAO, db
+
+    query = RequestDAO.get_queued_oldest_query(db.session, priority_queue)
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    assert sql.endswith('FOR UPDATE SKIP LOCKED')
+
+
+def test_get_queued_oldest_query_concurrent_checkouts(client, app):
+    """N concurrent checkouts, each holding its lock, get N distinct NRs without waiting on each other."""
+    from datetime import datetime
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+    from namex.models import Request as RequestDAO, State, db
+
+    checkouts = 5
+    nr_nums = ['NR 99{0:05d}'.format(i) for i in range(checkouts)]
+
+    # the queued NRs must be committed for the other connections to see them
+    with Session(bind=db.engine) as setup:
+        for i, nr_num in enumerate(nr_nums):
+            setup.add(RequestDAO(nrNum=nr_num, stateCd=State.DRAFT, submittedDate=datetime(1900, 1, 1, 0, i)))
+        setup.commit()
+
+    sessions = [Session(bind=db.engine) for _ in range(checkouts)]
+    try:
+        checked_out = []
+        for sess in sessions:
+            # a checkout waiting on another one's lock fails instead of blocking the test
+            sess.execute(text("SET lock_timeout = '1s'"))
+            nr = RequestDAO.get_queued_oldest_query(sess).first()
+            checked_out.append(nr.nrNum)
+
+        assert sorted(checked_out) == nr_nums
+    finally:
+        for sess in sessions:
+            sess.rollback()
+            sess.close()
+        with Session(bind=db.engine) as cleanup:
+            cleanup.query(RequestDAO).filter(RequestDAO.nrNum.in_(nr_nums)).delete(synchronize_session=False)
+            cleanup.commit()
+
+
 def test_name_search_populated_by_name():
     """Tests changing a name updates the nameSearch column."""
     from namex.models import Name, Request as RequestDAO, State
@@ -126,3 +194,178 @@ def test_is_expired():
     nr.save_to_db()
 
     assert nr.is_expired is True
+
+
+def _create_nr_graph(nr_num, request_id, previous_request_id=None):
+    from namex.models import Applicant, Comment, Name, PartnerNameSystem, Request as RequestDAO, State, User, db
+
+    examiner = User(username='examiner' + nr_num[-2:], firstname='first', lastname='last', sub='idir/' + nr_num,
+                    iss='keycloak', idp_userid=nr_num, login_source='IDIR')
+    examiner.save_to_db()
+
+    nr = RequestDAO()
+    nr.nrNum = nr_num
+    nr.stateCd = State.INPROGRESS
+    nr.requestTypeCd = 'CR'
+    nr.entity_type_cd = 'CR'
+    nr.request_action_cd = 'NEW'
+    nr.requestId = request_id
+    nr.previousRequestId = previous_request_id
+    nr.userId = examiner.id
+    nr.submitter_userid = examiner.id
+    nr.save_to_db()
+
+    name_comment = Comment()
+    name_comment.comment = 'name comment'
+    name_comment.examinerId = examiner.id
+    name_comment.save_to_db()
+
+    for choice, name_text in ((2, 'SECOND CHOICE LTD.'), (1, 'FIRST CHOICE LTD.')):
+        name = Name()
+        name.name = name_text
+        name.choice = choice
+        name.nrId = nr.id
+        name.commentId = name_comment.id if choice == 1 else None
+        name.save_to_db()
+
+    applicant = Applicant()
+    applicant.nrId = nr.id
+    applicant.lastName = 'last'
+    applicant.firstName = 'first'
+    db.session.add(applicant)
+
+    comment = Comment()
+    comment.nrId = nr.id
+    comment.comment = 'staff comment'
+    comment.examinerId = examiner.id
+    db.session.add(comment)
+
+    partner_name = PartnerNameSystem()
+    partner_name.nrId = nr.id
+    partner_name.partnerName = 'PARTNER LTD.'
+    partner_name.partnerNameTypeCd = 'AS'
+    db.session.add(partner_name)
+    db.session.commit()
+
+    return nr, examiner
+
+
+def test_json_golden(client, app):
+    from namex.models import Request as RequestDAO, db
+    from namex.models.request import REQUEST_JSON_SNAPSHOTS
+
+    _create_nr_graph('NR 0000001', 1)
+    nr, examiner = _create_nr_graph('NR 0000002', 2, previous_request_id=1)
+    db.session.expire_all()
+
+    nr_json = nr.json()
+
+    assert nr_json['userId'] == nr_json['submitter_userid'] == examiner.username
+    assert nr_json['previousNr'] == 'NR 0000001'
+    assert [name['name'] for name in nr_json['names']] == ['FIRST CHOICE LTD.', 'SECOND CHOICE LTD.']
+    assert nr_json['names'][0]['comment']['examiner'] == examiner.username
+    assert nr_json['names'][0]['comment']['comment'] == 'name comment'
+    assert nr_json['names'][1]['comment'] is None
+    assert nr_json['applicants']['lastName'] == 'last'
+    assert [comment['comment'] for comment in nr_json['comments']] == ['staff comment']
+    assert nr_json['comments'][0]['examiner'] == examiner.username
+    assert nr_json['nwpta'] == [{'partnerNameTypeCd': 'AS', 'partnerNameNumber': None,
+                                 'partnerJurisdictionTypeCd': None, 'partnerNameDate': None,
+                                 'partnerName': 'PARTNER LTD.', 'requested': False}]
+    assert nr_json['legalType'] == 'BC'
+    assert sorted(nr_json.keys()) == sorted([
+        'id', 'submittedDate', 'lastUpdate', 'userId', 'submitter_userid', 'stateCd', 'state', 'previousStateCd',
+        'nrNum', 'consentFlag', 'consent_dt', 'expirationDate', 'requestTypeCd', 'entity_type_cd',
+        'request_action_cd', 'source', 'priorityCd', 'priorityDate', 'xproJurisdiction', 'additionalInfo',
+        'natureBusinessInfo', 'furnished', 'hasBeenReset', 'previousRequestId', 'previousNr', 'submitCount',
+        'corpNum', 'tradeMark', 'homeJurisNum', 'names', 'applicants', 'comments', 'nwpta', 'checkedOutBy',
+        'checkedOutDt', 'notifiedBeforeExpiry', 'notifiedExpiry', 'legalType', 'target', 'actions'])
+
+    # the already loaded relationships and the batched ones serialize the same
+    db.session.info.pop(REQUEST_JSON_SNAPSHOTS, None)
+    assert nr.json() == nr_json
+    db.session.expire_all()
+    db.session.info.pop(REQUEST_JSON_SNAPSHOTS, None)
+    assert RequestDAO.json_list([nr])[0] == nr_json
+
+
+def test_json_list_fixed_query_count(client, app):
+    from sqlalchemy import event
+    from namex.models import Request as RequestDAO, db
+    from namex.models.request import REQUEST_JSON_SNAPSHOTS
+
+    nrs = [_create_nr_graph('NR 000001{}'.format(i), 10 + i, previous_request_id=10 + i - 1)[0] for i in range(4)]
+
+    def count_queries(nr_list):
+        db.session.expire_all()
+        db.session.info.pop(REQUEST_JSON_SNAPSHOTS, None)
+        nr_list = RequestDAO.query.filter(RequestDAO.id.in_([nr.id for nr in nr_list])).order_by(RequestDAO.id).all()
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        engine = db.session.get_bind()
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            nr_jsons = RequestDAO.json_list(nr_list)
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+        return nr_jsons, len(statements)
+
+    one_json, one_count = count_queries(nrs[:1])
+    all_json, all_count = count_queries(nrs)
+
+    assert one_count == all_count
+    assert all_json[0] == one_json[0]
+    assert [nr_json['previousNr'] for nr_json in all_json] == [None, 'NR 0000010', 'NR 0000011', 'NR 0000012']
+
+
+def test_json_snapshot_reused_until_changed(client, app):
+    import json
+    from datetime import datetime
+    from sqlalchemy import event
+    from namex.models import Event, Name, db
+
+    nr, examiner = _create_nr_graph('NR 0000020', 20)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    engine = db.session.get_bind()
+
+    nr_json = nr.json()
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        # the event, the logs and the response share the snapshot, each gets its own copy
+        nr_json['names'] = []
+        event_json = nr.json()
+        assert not statements
+        assert len(event_json['names']) == 2
+
+        audit_event = Event(nrId=nr.id, action=Event.POST, stateCd=nr.stateCd, eventDate=datetime.utcnow(),
+                            eventJson=json.dumps(event_json), userId=examiner.id)
+        db.session.add(audit_event)
+        db.session.commit()
+        statements.clear()
+        assert nr.json() == event_json
+        assert not [statement for statement in statements if 'FROM names' in statement]
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+
+    name = Name.query.filter_by(nrId=nr.id, choice=1).one()
+    name.name = 'CHANGED CHOICE LTD.'
+    db.session.commit()
+    assert nr.json()['names'][0]['name'] == 'CHANGED CHOICE LTD.'
+
+
+def test_json_snapshot_dropped_when_payment_completes(client, app):
+    from namex.constants import PaymentState
+    from namex.models import Payment, State
+
+    nr, _ = _create_nr_graph('NR 0000021', 21)
+    nr.stateCd = State.PENDING_PAYMENT
+    nr.save_to_db()
+    assert nr.json()['state'] == State.PENDING_PAYMENT
+
+    # the payment moves the NR to DRAFT with a raw update, leaving its lastUpdate as it was
+    with mock.patch('namex.utils.queue_util.send_name_request_state_msg'):
+        payment = Payment(nrId=nr.id, payment_status_code=PaymentState.COMPLETED.value)
+        payment.save_to_db()
+
+    assert nr.json()['state'] == State.DRAFT
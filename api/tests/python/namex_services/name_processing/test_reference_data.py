@@ -0,0 +1,88 @@
+import pytest
+
+from namex.services.name_processing import reference_data as reference_data_module
+from namex.services.name_processing.reference_data import NameProcessingReferenceData, ReferenceDataCache
+
+
+def build_snapshot(version='v1'):
+    return NameProcessingReferenceData(
+        version=version,
+        stop_words=['the', 'of', 'and'],
+        prefixes=['re', 'pre'],
+        number_words=['one'],
+        stand_alone_words=['holdings'],
+        eng_designated_end_words=['ltd', 'limited', 'limited liability company'],
+        eng_designated_any_words=['co-op'],
+        fr_designated_end_words=['ltee'],
+        fr_designated_any_words=['cooperative']
+    )
+
+
+def test_reference_data_snapshot():
+    snapshot = build_snapshot()
+
+    assert snapshot.designated_end_words == ('ltd', 'limited', 'limited liability company', 'ltee')
+    assert set(snapshot.designated_all_words) == {'ltd', 'limited', 'limited liability company', 'ltee', 'co-op',
+                                                  'cooperative'}
+    assert snapshot.designated_all_words[0] == 'limited liability company'
+    assert snapshot.exception_stop_words_designation == ('null',)
+    assert snapshot.name_tokenized_regex.findall('flerkin limited liability company') == \
+        ['flerkin', 'limited liability company']
+
+
+def test_reference_data_exception_stop_words_designation():
+    snapshot = NameProcessingReferenceData('v1', ['of', 'and'], [], [], [],
+                                           ['limited liability partnership', 'ltd'], [],
+                                           ['societe de personnes a responsabilite limitee'], ['association of'])
+
+    assert snapshot.exception_stop_words_designation == ('association of',)
+
+
+@pytest.mark.parametrize('versions, expected_loads', [
+    (['v1', 'v1'], 1),
+    (['v1', 'v2'], 2),
+    # Without a version the snapshot is rebuilt once the TTL expired
+    ([None, None], 2),
+])
+def test_reference_data_cache_reloads_on_version_change(app, monkeypatch, versions, expected_loads):
+    versions = iter(versions)
+    loads = []
+
+    def load(version=None):
+        loads.append(version)
+        return build_snapshot(version)
+
+    monkeypatch.setattr(reference_data_module, 'fetch_synonyms_version', lambda: next(versions))
+    monkeypatch.setattr(NameProcessingReferenceData, 'load', load)
+
+    cache = ReferenceDataCache()
+    first = cache.get()
+    # Within the TTL the snapshot is shared without looking at the version
+    assert cache.get() is first
+
+    cache.invalidate()
+    cache.get()
+
+    assert len(loads) == expected_loads
+
+
+def test_reference_data_cache_keeps_snapshot_when_reload_fails(app, monkeypatch):
+    loads = []
+
+    def load(version=None):
+        loads.append(version)
+        if len(loads) > 1:
+            raise Exception('synonyms API unreachable')
+        return build_snapshot(version)
+
+    monkeypatch.setattr(reference_data_module, 'fetch_synonyms_version', lambda: None)
+    monkeypatch.setattr(NameProcessingReferenceData, 'load', load)
+
+    cache = ReferenceDataCache()
+    first = cache.get()
+    cache.invalidate()
+
+    assert cache.get() is first
+    # the failed reload waits for the TTL before it is tried again
+    assert cache.get() is first
+    assert len(loads) == 2
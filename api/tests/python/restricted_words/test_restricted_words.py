@@ -1,4 +1,4 @@
-from namex.analytics.restricted_words import RestrictedWords
+from namex.analytics.restricted_words import CONDITION_NOT_AVAILABLE, RestrictedWords, RestrictedWordsDictionary
 
 
 def test_get_restricted_short():
@@ -57,3 +57,22 @@ def test_get_restricted_long(db):
             assert 'id' in cnd
             assert 'instructions' in cnd
             assert 'text' in cnd
+
+
+def test_restricted_words_dictionary():
+    dictionary = RestrictedWordsDictionary(
+        'v1',
+        [(1, 'bc'), (2, 'royal'), (3, 'Royal BC'), (4, 'DR'), (5, None), (6, 'royal bc ')],
+        {1: [{'id': 10, 'text': 'bc', 'allow_use': 'Y', 'consent_required': 'N', 'consenting_body': '',
+              'instructions': ''}],
+         2: CONDITION_NOT_AVAILABLE}
+    )
+
+    words = dictionary.find_words(RestrictedWords.strip_content('royal bc royalbc'))
+
+    assert words == [{'id': 1, 'phrase': 'BC'}, {'id': 2, 'phrase': 'ROYAL'}, {'id': 3, 'phrase': 'ROYAL BC'},
+                     {'id': 6, 'phrase': 'ROYAL BC '}]
+    assert dictionary.find_cnd_info(1)[0]['id'] == 10
+    assert dictionary.find_cnd_info(2) == CONDITION_NOT_AVAILABLE
+    assert dictionary.find_cnd_info(3) == []
+    assert dictionary.find_words(RestrictedWords.strip_content('')) == []
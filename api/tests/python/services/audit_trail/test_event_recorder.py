@@ -0,0 +1,79 @@
+"""Tests for the bulk event recording."""
+import json
+
+from namex.models import Event, Request as RequestDAO, State, User, db
+from namex.services import EventRecorder
+from namex.services.audit_trail.event_history import EventHistory
+
+
+def create_nr(nr_num):
+    nr = RequestDAO()
+    nr.nrNum = nr_num
+    nr.stateCd = State.INPROGRESS
+    nr.additionalInfo = 'test'
+    nr.save_to_db()
+    return nr
+
+
+def test_record_many(app):
+    """Assert the events of all the NRs are added to the caller's transaction."""
+    user = User('test-user', '', '', 'idir/test-user', 'url', '123', 'IDIR')
+    user.save_to_db()
+    nrs = [create_nr('NR 000000{}'.format(i)) for i in range(3)]
+
+    EventRecorder.record_many(user, Event.MARKED_ON_HOLD, nrs)
+
+    events = Event.query.filter(Event.nrId.in_([nr.id for nr in nrs])).order_by(Event.nrId).all()
+    assert [event.nrId for event in events] == [nr.id for nr in nrs]
+    assert {event.userId for event in events} == {user.id}
+    assert [json.loads(event.eventJson)['nrNum'] for event in events] == [nr.nrNum for nr in nrs]
+    assert all(event.eventJsonDiff is None for event in events)
+
+
+def test_record_many_compact(app):
+    """Assert the compact events store a diff that rebuilds the full snapshot."""
+    user = User('test-user', '', '', 'idir/test-user', 'url', '123', 'IDIR')
+    user.save_to_db()
+    nr = create_nr('NR 0000001')
+    EventRecorder.record(user, Event.PATCH, nr, nr.json())
+
+    nr.stateCd = State.HOLD
+    nr.additionalInfo = None
+    db.session.add(nr)
+    EventRecorder.record_many(user, Event.MARKED_ON_HOLD, [nr], compact=True)
+    full_json = nr.json()
+
+    base, compact = Event.query.filter_by(nrId=nr.id).order_by(Event.id).all()
+    assert compact.eventJsonDiff['base'] == base.id
+    assert compact.eventJsonDiff['changed']['stateCd'] == State.HOLD
+    assert 'nrNum' not in compact.eventJsonDiff['changed']
+
+    events = EventHistory.get_events(nr.id)
+    assert json.loads(events[1]['jsonData']) == json.loads(json.dumps(full_json))
+
+
+def test_record_many_compact_skips_partial_events(app):
+    """Assert only the events holding the full json of the NR are used as the base of the compact events."""
+    user = User('test-user', '', '', 'idir/test-user', 'url', '123', 'IDIR')
+    user.save_to_db()
+    nr = create_nr('NR 0000001')
+    EventRecorder.record(user, Event.PUT, nr, nr.json())
+    EventRecorder.record(user, Event.GET, nr, {})
+    EventRecorder.record(user, Event.PATCH, nr, {'state': State.HOLD, 'previousStateCd': State.INPROGRESS})
+    first_put = Event.query.filter_by(nrId=nr.id, action=Event.PUT).one()
+
+    EventRecorder.record_many(user, Event.MARKED_ON_HOLD, [nr], compact=True)
+    compact = Event.query.filter_by(nrId=nr.id, action=Event.MARKED_ON_HOLD).one()
+    assert compact.eventJsonDiff['base'] == first_put.id
+    assert 'names' not in compact.eventJsonDiff['changed']
+
+    nr.additionalInfo = None
+    db.session.add(nr)
+    EventRecorder.record(user, Event.PUT, nr, nr.json())
+    EventRecorder.record(user, Event.GET, nr, {})
+    second_put = Event.query.filter_by(nrId=nr.id, action=Event.PUT).order_by(Event.id.desc()).first()
+
+    EventRecorder.record_many(user, Event.NR_DAY_JOB, [nr], compact=True)
+    compact = Event.query.filter_by(nrId=nr.id, action=Event.NR_DAY_JOB).one()
+    assert compact.eventJsonDiff['base'] == second_put.id
+    assert 'additionalInfo' not in compact.eventJsonDiff['changed']
@@ -0,0 +1,80 @@
+"""Tests for the conflict search candidate retrieval."""
+from collections import namedtuple
+
+import pytest
+
+from namex.models import Name, Request as RequestDAO, State
+from namex.services.name_request.builders.conflict_candidates import BatchedConflictCandidates, ConflictCandidates, \
+    PairwiseConflictCandidates, diff_conflict_candidates
+
+ConflictRow = namedtuple('ConflictRow', ['name', 'consumptionDate', 'submittedDate', 'corpNum', 'nrNum'])
+
+dist_substitution_dict = {'mountain': ['mountain', 'mount', 'mt'], 'valley': ['valley']}
+desc_synonym_criteria_dict = {'bakery': ['bakery', 'bread'], 'cafe': ['cafe', 'coffee']}
+stop_words = 'the|and|of'
+
+
+def test_candidates_must_implement_matches():
+    class Incomplete(ConflictCandidates):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(dist_substitution_dict, desc_synonym_criteria_dict, stop_words,
+                   change_filter=False, check_name_is_well_formed=False, queue=False)
+
+
+def test_batched_matches_accumulate_desc_criteria(monkeypatch):
+    rows = [
+        ConflictRow('MOUNTAIN BAKERY CAFE LTD', None, None, 'BC1234567', None),
+        ConflictRow('MOUNTAIN BAKERY LTD', None, None, 'BC7654321', None),
+        ConflictRow('MT. BREAD BREAD COFFEE COFFEE INC', None, '2021-01-01', None, 'NR 0000001'),
+        ConflictRow('MOUNTAIN BAKERY INC', None, '2021-01-01', None, 'NR 0000002'),
+        ConflictRow('VALLEY BAKERY CAFE', None, None, 'BC1111111', None),
+    ]
+    monkeypatch.setattr(RequestDAO, 'find_by_criteria_array', lambda criteria, queue=False: rows)
+
+    candidates = BatchedConflictCandidates(dist_substitution_dict, desc_synonym_criteria_dict, stop_words,
+                                           change_filter=False, check_name_is_well_formed=False, queue=False)
+
+    mountain = {key_desc: [row.name for row in matches] for key_desc, matches in candidates.matches('mountain')}
+    # Names from the not consumed query must match the descriptive criteria twice, see get_descriptive_query
+    assert mountain['bakery'] == ['MOUNTAIN BAKERY CAFE LTD', 'MOUNTAIN BAKERY LTD', 'MT. BREAD BREAD COFFEE COFFEE INC']
+    assert mountain['cafe'] == ['MOUNTAIN BAKERY CAFE LTD', 'MT. BREAD BREAD COFFEE COFFEE INC']
+
+    valley = {key_desc: [row.name for row in matches] for key_desc, matches in candidates.matches('valley')}
+    assert valley == {'bakery': ['VALLEY BAKERY CAFE'], 'cafe': ['VALLEY BAKERY CAFE']}
+
+
+@pytest.mark.parametrize('queue', [False, True])
+def test_batched_and_pairwise_candidates_are_identical(client, app, queue):
+    names = [
+        ('MOUNTAIN BAKERY CAFE LTD', State.CONSUMED),
+        ('MOUNTAIN BAKERY LTD', State.APPROVED),
+        ('MT. BREAD BREAD COFFEE COFFEE INC', State.CONDITIONAL),
+        ('THE MOUNT-BAKERY BAKERY LTD', State.APPROVED),
+        ('VALLEY BAKERY CAFE', State.CONSUMED),
+        ('VALLEY COFFEE LTD', State.DRAFT),
+        ('MOUNTAIN BREAD CAFE', State.INPROGRESS),
+        ('NO. 1 MOUNTAIN BAKERY LTD', State.HOLD),
+        ('OCEAN BAKERY LTD', State.APPROVED),
+    ]
+    for index, (name_text, state) in enumerate(names):
+        name = Name()
+        name.choice = 1
+        name.name = name_text
+        name.state = 'APPROVED'
+        if state == State.CONSUMED:
+            name.corpNum = 'BC{0:07d}'.format(index)
+
+        nr = RequestDAO()
+        nr.nrNum = 'NR {0:07d}'.format(index)
+        nr.stateCd = state
+        nr.requestTypeCd = 'CR'
+        nr.names.append(name)
+        nr.save_to_db()
+
+    args = (dist_substitution_dict, desc_synonym_criteria_dict, stop_words, False, False, queue)
+    pairwise, batched = PairwiseConflictCandidates(*args), BatchedConflictCandidates(*args)
+
+    assert batched.rows
+    assert diff_conflict_candidates(pairwise, batched) == {}
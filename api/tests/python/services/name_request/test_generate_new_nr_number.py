@@ -0,0 +1,56 @@
+"""Tests for the NR number pool."""
+import pytest
+
+from namex.models import NRNumberExclude, NRNumberLifespan, NRNumberPool, Request as RequestDAO, State, db
+from namex.services.name_request.generate_new_nr_number import NRNumberService
+
+
+@pytest.fixture
+def pool_config(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'NR_NUM_POOL_SIZE', 20)
+    monkeypatch.setitem(app.config, 'NR_NUM_POOL_LOW_WATER', 5)
+    monkeypatch.setitem(app.config, 'NR_NUM_POOL_REFILL_IN_BACKGROUND', False)
+
+
+def test_get_new_nr_num_refills_empty_pool(client, pool_config):
+    nr_num = NRNumberService.get_new_nr_num()
+
+    assert nr_num.startswith('NR ') and len(nr_num) == 10
+    assert NRNumberLifespan.check_nr_num_lifespan(nr_num)
+    assert NRNumberPool.get_size() == 19
+
+
+def test_get_new_nr_num_issues_distinct_numbers(client, pool_config):
+    nr_nums = [NRNumberService.get_new_nr_num() for _ in range(30)]
+
+    assert len(set(nr_nums)) == 30
+    # topped up once below the low water mark
+    assert NRNumberPool.get_size() >= 5
+
+
+def test_claim_skips_used_and_excluded_numbers(client, pool_config):
+    db.session.add_all([NRNumberPool(nr_num='NR 0000001'), NRNumberPool(nr_num='NR 0000002')])
+    db.session.commit()
+    RequestDAO(nrNum='NR 0000001', stateCd=State.DRAFT).save_to_db()
+    NRNumberExclude(nr_num='NR 0000002').save_to_db()
+
+    assert NRNumberPool.claim_nr_num() is None
+    assert NRNumberPool.claim_nr_num() is None
+    assert NRNumberPool.get_size() == 0
+
+    nr_num = NRNumberService.get_new_nr_num()
+    assert nr_num not in ['NR 0000001', 'NR 0000002']
+
+
+def test_pool_size_checked_every_interval(client, app, pool_config, monkeypatch):
+    monkeypatch.setitem(app.config, 'NR_NUM_POOL_CHECK_INTERVAL', 5)
+    NRNumberService.get_new_nr_num()
+    checks = []
+    get_size = NRNumberPool.get_size
+    monkeypatch.setattr(NRNumberPool, 'get_size', classmethod(lambda cls: checks.append(1) or get_size()))
+
+    for _ in range(10):
+        NRNumberService.get_new_nr_num()
+
+    # the pool never got below the low water mark, nor empty
+    assert len(checks) == 2
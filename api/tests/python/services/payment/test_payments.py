@@ -0,0 +1,100 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the SBC Pay invoices are fetched concurrently and the final ones cached."""
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from namex.services.cache import cache
+from namex.services.payment import client as client_module
+from namex.services.payment.client import SBCPaymentClient
+from namex.services.payment.exceptions import SBCPaymentException
+from namex.services.payment.payments import get_payments
+
+
+@pytest.fixture
+def sbc_pay(app):
+    """Fake SBC Pay, returns the invoice of each token with the status in statuses."""
+    cache.clear()
+    statuses = {}
+    calls = []
+    lock = threading.Lock()
+
+    def get_payment(self, invoice_id, headers=None):
+        with lock:
+            calls.append(invoice_id)
+        if statuses[invoice_id] is None:
+            raise Exception('SBC Pay is down')
+        return {'id': int(invoice_id), 'paid': 0.0, 'serviceFees': 1.5, 'total': 31.5,
+                'statusCode': statuses[invoice_id]}
+
+    with patch.object(SBCPaymentClient, 'get_payment', get_payment):
+        yield statuses, calls
+    cache.clear()
+
+
+def test_final_invoices_are_not_fetched_again(sbc_pay):
+    """Assert that only the invoices that can still change are fetched again."""
+    statuses, calls = sbc_pay
+    statuses.update({'1': 'COMPLETED', '2': 'CREATED', '3': 'CANCELLED'})
+    payments = [SimpleNamespace(payment_token=token, payment_status_code=status)
+                for token, status in (('1', 'COMPLETED'), ('2', 'CREATED'), ('3', 'CANCELLED'))]
+
+    invoices = get_payments(payments)
+    assert {token: invoice.statusCode for token, invoice in invoices.items()} == statuses
+    assert sorted(calls) == ['1', '2', '3']
+
+    calls.clear()
+    invoices = get_payments(payments)
+    assert invoices['1'].statusCode == 'COMPLETED'
+    assert calls == ['2']
+
+    # a refund requested by namex is fetched until SBC Pay reports it
+    payments[0].payment_status_code = 'REFUND_REQUESTED'
+    calls.clear()
+    get_payments(payments)
+    get_payments(payments)
+    assert sorted(calls) == ['1', '1', '2', '2']
+
+
+def test_fetch_error_is_raised(sbc_pay):
+    """Assert that the listing fails when an invoice can't be fetched."""
+    statuses, calls = sbc_pay
+    statuses.update({'1': 'COMPLETED', '2': None})
+    payments = [SimpleNamespace(payment_token=token, payment_status_code='COMPLETED') for token in ('1', '2')]
+
+    with pytest.raises(SBCPaymentException):
+        get_payments(payments)
+
+
+def test_client_credentials_are_reused(app):
+    """Assert that the client credentials token is only requested again once it expired."""
+    auth_response = MagicMock(status_code=200)
+    auth_response.json.return_value = {'access_token': 'token', 'expires_in': 300}
+    session = MagicMock()
+    session.post.return_value = auth_response
+
+    client_module.clear_client_credentials('http://auth', 'client')
+    with patch.object(client_module, 'get_session', return_value=session):
+        assert SBCPaymentClient.get_client_credentials('http://auth', 'client', 'secret') == (True, 'token')
+        assert SBCPaymentClient.get_client_credentials('http://auth', 'client', 'secret') == (True, 'token')
+        assert session.post.call_count == 1
+
+        auth_response.json.return_value = {'access_token': 'new token', 'expires_in': 300}
+        client_module.clear_client_credentials('http://auth', 'client')
+        assert SBCPaymentClient.get_client_credentials('http://auth', 'client', 'secret') == (True, 'new token')
+        assert session.post.call_count == 2
+    client_module.clear_client_credentials('http://auth', 'client')
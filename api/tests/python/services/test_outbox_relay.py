@@ -0,0 +1,68 @@
+"""Tests for the outbox of the queue messages."""
+import json
+
+import pytest
+
+from namex.models import OutboxMessage, Request as RequestDAO, State, db
+from namex.services.outbox_relay import outbox_relay
+
+
+@pytest.fixture
+def outbox(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'QUEUE_OUTBOX_ENABLED', True)
+    monkeypatch.setitem(app.config, 'QUEUE_OUTBOX_RELAY_IN_BACKGROUND', False)
+    monkeypatch.setitem(app.config, 'NAMEX_NR_STATE_TOPIC', 'nr-state')
+
+
+def create_nr(nr_num, state):
+    nr = RequestDAO()
+    nr.nrNum = nr_num
+    nr.stateCd = state
+    db.session.add(nr)
+    db.session.flush()
+    return nr
+
+
+def get_states(payloads):
+    return [(data['request']['nrNum'], data['request']['newState'])
+            for data in (json.loads(payload.decode('utf-8').replace("'", '"'))['data'] for payload in payloads)]
+
+
+def test_state_change_is_written_to_outbox(client, outbox):
+    nr = create_nr('NR 0000001', State.DRAFT)
+    nr.stateCd = State.INPROGRESS
+    db.session.flush()
+
+    messages = OutboxMessage.query.order_by(OutboxMessage.id).all()
+    assert [message.topic for message in messages] == ['nr-state', 'nr-state']
+    assert get_states([message.payload for message in messages]) == \
+        [('NR 0000001', State.DRAFT), ('NR 0000001', State.INPROGRESS)]
+
+    published = []
+    assert outbox_relay.drain(db.session.connection(), lambda topic, payload: published.append(payload)) == 2
+    assert get_states(published) == [('NR 0000001', State.DRAFT), ('NR 0000001', State.INPROGRESS)]
+    assert OutboxMessage.query.count() == 0
+
+
+def test_failed_message_holds_back_the_nr(client, outbox):
+    nr_failing = create_nr('NR 0000001', State.DRAFT)
+    create_nr('NR 0000002', State.DRAFT)
+    nr_failing.stateCd = State.INPROGRESS
+    db.session.flush()
+
+    published = []
+
+    def publish(topic, payload):
+        if b'NR 0000001' in payload and not published:
+            raise Exception('broker unavailable')
+        published.append(payload)
+
+    # the first message of NR 0000001 fails, its second one waits for it
+    assert outbox_relay.drain(db.session.connection(), publish) == 1
+    assert get_states(published) == [('NR 0000002', State.DRAFT)]
+    failed = OutboxMessage.query.order_by(OutboxMessage.id).first()
+    assert failed.attempts == 1
+    assert failed.lastError == 'broker unavailable'
+
+    assert outbox_relay.drain(db.session.connection(), publish) == 2
+    assert get_states(published[1:]) == [('NR 0000001', State.DRAFT), ('NR 0000001', State.INPROGRESS)]
@@ -0,0 +1,106 @@
+import pytest
+
+from namex.services.synonyms import LocalSynonymsApi, SynonymEngine
+
+rows = [
+    {'id': 1, 'category': 'English Designations_end CR-VALID', 'synonymsText': 'limited, ltd, incorporated, inc',
+     'stemsText': 'limit, ltd, incorpor, inc'},
+    {'id': 2, 'category': 'English Designations_any', 'synonymsText': 'co-op, cooperative',
+     'stemsText': 'co-op, cooper'},
+    {'id': 3, 'category': 'French Designations_end', 'synonymsText': 'limitee, ltee', 'stemsText': 'limite, ltee'},
+    {'id': 4, 'category': 'Sub Mountain', 'synonymsText': 'mount, mountain, mt, mtn', 'stemsText': 'mount, mountain'},
+    {'id': 5, 'category': 'food', 'synonymsText': 'bakery, bread, cafe', 'stemsText': 'bakeri, bread, cafe'},
+    {'id': 6, 'category': 'English Stop Words', 'synonymsText': 'the, and, of', 'stemsText': 'the, and, of'},
+    {'id': 7, 'category': 'prefixes', 'synonymsText': 're, pre', 'stemsText': 're, pre'},
+    {'id': 8, 'category': 'Stand-alone', 'synonymsText': 'holdings, ventures', 'stemsText': 'hold, ventur'},
+    {'id': 9, 'category': 'Number Sub', 'synonymsText': 'one, 1', 'stemsText': 'one, 1'},
+    {'id': 10, 'category': None, 'synonymsText': 'orphan, bread', 'stemsText': 'orphan, bread'},
+]
+
+
+@pytest.fixture
+def engine():
+    return SynonymEngine(rows=rows)
+
+
+@pytest.mark.parametrize("word, expected", [
+    ('bread', ['bakeri', 'bread', 'cafe', 'bakery', 'bread', 'cafe']),
+    # No synonyms_text match, found through the stems
+    ('bakeries', ['bakeri', 'bread', 'cafe', 'bakery', 'bread', 'cafe']),
+    # Substitutions and stop words are excluded
+    ('mountain', []),
+    ('the', []),
+])
+def test_get_synonyms(engine, word, expected):
+    assert engine.get_synonyms(word) == expected
+
+
+def test_get_substitutions(engine):
+    assert engine.get_substitutions('MT') == ['mount', 'mountain', 'mount', 'mountain', 'mt', 'mtn']
+
+
+def test_word_lists(engine):
+    assert set(engine.get_stop_words()) == {'the', 'and', 'of'}
+    assert engine.get_stop_words()[-1] == 'of'
+    assert engine.get_prefixes() == ['re', 'pre', 're', 'pre']
+    assert set(engine.get_standalone()) == {'holdings', 'ventures'}
+    assert engine.get_number_words() == ['one', '1', 'one', '1']
+
+
+def test_get_designations(engine):
+    end_eng = engine.get_designations(None, 'end', 'english')
+    assert sorted(end_eng) == sorted({'limited', 'ltd', 'incorporated', 'inc', 'limit', 'incorpor'})
+    assert [len(d) for d in end_eng] == sorted([len(d) for d in end_eng], reverse=True)
+
+    # Entity type designations only return the stems
+    assert sorted(engine.get_designations('CR', 'end', 'english')) == sorted({'limit', 'ltd', 'incorpor', 'inc'})
+    assert set(engine.get_designations(None, 'end', 'french')) == {'limitee', 'limite', 'ltee'}
+
+
+def test_designations_in_name(engine):
+    assert engine.get_designation_end_in_name('flerkin bakery ltd') == ['ltd']
+    assert engine.get_designation_any_in_name('flerkin co-op bakery') == ['co-op']
+
+
+def test_find(engine):
+    assert engine.find('bread', 'synonyms_text') == ['bakery, bread, cafe', 'orphan, bread']
+    assert engine.find('bakeri', 'stems_text') == ['bakeri, bread, cafe']
+    assert engine.find('brea', 'synonyms_text') == []
+
+
+def test_local_synonyms_api(engine):
+    syn_svc = LocalSynonymsApi(engine)
+
+    results = syn_svc.get_all_substitutions_synonyms(words=['mountain', 'flerkin'], words_are_distinctive=True).data
+    assert {item.key: item.list for item in results} == {
+        'mountain': ['mount', 'mountain', 'mount', 'mountain', 'mt', 'mtn'],
+        'flerkin': ['flerkin']
+    }
+    assert syn_svc.get_designated_end_all_words(lang='french').data == \
+        engine.get_designations(None, 'end', 'french')
+
+
+def test_load_is_lazy():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return rows
+
+    engine = SynonymEngine(loader=loader)
+    assert not engine.loaded
+    engine.get_prefixes()
+    engine.get_stop_words()
+    assert engine.loaded
+    assert len(calls) == 1
+
+
+def test_mixins_require_the_engine_lookups():
+    from namex.services.synonyms.mixins.designation import SynonymDesignationMixin
+
+    class PartialEngine(SynonymDesignationMixin):
+        def get_designations(self, entity_type_str, position_str, lang):
+            return []
+
+    with pytest.raises(TypeError):
+        PartialEngine()
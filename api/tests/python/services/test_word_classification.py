@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from namex.models import WordClassification
+from namex.services.cache import cache
+from namex.services.word_classification.word_classification import WordClassificationService
+
+
+def save_word_classification(word, classification):
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    entity = WordClassification()
+    entity.word = word
+    entity.classification = classification
+    entity.frequency = 1
+    entity.approved_dt = yesterday
+    entity.start_dt = yesterday
+    entity.save_to_db()
+    return entity
+
+
+@pytest.fixture
+def word_classifications(client):
+    cache.clear()
+    for word, classification in [('BAKERY', 'DESC'), ('BAKERY', 'DIST'), ('FLERKIN', 'DIST'), ('MOUNTAIN', 'DIST'),
+                                 ('MOUNTAIN VIEW', 'DIST'), ('MOUNTAINS', 'DESC'), ('VIEW', 'DESC')]:
+        save_word_classification(word, classification)
+    yield
+    cache.clear()
+
+
+def test_find_classifications_matches_find_one(word_classifications):
+    service = WordClassificationService()
+    words = ['bakery', 'Flerkin', 'mountain', 'view', 'unknown']
+
+    classifications = service.find_classifications(words)
+
+    for word in words:
+        assert sorted(classifications[word.lower()]) == \
+            sorted(row.classification for row in service.find_one(word))
+    assert sorted(classifications['mountain']) == ['DIST', 'DIST']
+    assert classifications['unknown'] == ()
+
+
+def test_find_classifications_cache(word_classifications):
+    service = WordClassificationService()
+    assert service.find_classifications(['flerkin']) == {'flerkin': ('DIST',)}
+
+    entity = save_word_classification('FLERKIN', 'DESC')
+    # Still served from the cache until the word is approved through the service
+    assert service.find_classifications(['flerkin']) == {'flerkin': ('DIST',)}
+
+    WordClassificationService.invalidate_cache(entity.word)
+    assert sorted(service.find_classifications(['flerkin'])['flerkin']) == ['DESC', 'DIST']
+
+
+def test_classify_tokens(word_classifications):
+    token_classifier = WordClassificationService().classify_tokens(['flerkin', 'bakery', 'unknown'])
+
+    assert token_classifier.distinctive_word_tokens == ['flerkin', 'bakery']
+    assert token_classifier.descriptive_word_tokens == ['bakery']
+    assert token_classifier.unclassified_word_tokens == ['unknown']
+
+
+def test_find_classifications_escapes_the_words(word_classifications):
+    save_word_classification('A+B', 'DESC')
+    service = WordClassificationService()
+
+    classifications = service.find_classifications(['a+b', 'bak(ery', 'flerkin?', 'bakery'])
+
+    assert classifications['a+b'] == ('DESC',)
+    assert classifications['bak(ery'] == ()
+    assert classifications['flerkin?'] == ()
+    assert sorted(classifications['bakery']) == ['DESC', 'DIST']
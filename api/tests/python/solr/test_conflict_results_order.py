@@ -0,0 +1,124 @@
+import copy
+
+import pytest
+
+from namex.analytics.solr import SolrQueries
+
+
+def doc(nr_id, name):
+    return {'id': nr_id, 'name': name}
+
+
+def connection(title, docs):
+    return ({'response': {'numFound': len(docs), 'docs': docs},
+             'responseHeader': {'params': {'q': 'flerkin bakery'}}}, title)
+
+
+# Solr responses recorded for each bucket, with the names as ordered before the ordering was rewritten
+conflict_results_data = [
+    (
+        'synonym',
+        [
+            connection('----FLERKIN BAKERY synonyms:(BAKERI) - PROXIMITY SEARCH',
+                       [doc('1', 'FLERKIN BAKESHOP LTD.'), doc('2', 'FLERKIN PATISSERIE INC.'),
+                        doc('3', 'FLERKIN BAKERY LTD.'), doc('4', 'FLERKIN BAKERIES CORP.'),
+                        doc('5', 'FLERKINS TOYS LTD.')]),
+            connection('----FLERKIN BAKERY synonyms:(BAKERI) - EXACT WORD ORDER',
+                       [doc('3', 'FLERKIN BAKERY LTD.'), doc('6', 'FLERKIN BAKER\'S DOZEN LTD.'),
+                        doc('7', 'FLERKIN PATISSERIES LTD.')]),
+            connection('----FLERKIN - PROXIMITY SEARCH',
+                       [doc('8', 'FLERKIN HOLDINGS LTD.'), doc('1', 'FLERKIN BAKESHOP LTD.'),
+                        doc('9', 'THE FLERKIN LTD.')]),
+            connection('----FLERKIN* - EXACT WORD ORDER', [doc('10', 'FLERKINATOR LTD.'), doc('9', 'THE FLERKIN LTD.')]),
+        ],
+        ['FLERKIN', 'BAKERY'],
+        ['FLERKIN', 'BAKERI'],
+        {'FLERKIN': ['FLERKIN'], 'BAKERI': ['BAKERI', 'BAKESHOP', 'BAKERS', 'PATISSERIE']},
+        [
+            (None, '----FLERKIN BAKERY synonyms:(BAKERI) - PROXIMITY SEARCH', ['FLERKIN', 'BAKERI', 'BAKER']),
+            ('3', 'FLERKIN BAKERY LTD.', ['FLERKIN', 'BAKER']),
+            ('4', 'FLERKIN BAKERIES CORP.', ['FLERKIN', 'BAKERI']),
+            ('1', 'FLERKIN BAKESHOP LTD.', ['FLERKIN', 'BAKESHOP']),
+            ('2', 'FLERKIN PATISSERIE INC.', ['FLERKIN', 'PATISSERIE']),
+            ('5', 'FLERKINS TOYS LTD.', ['FLERKIN']),
+            (None, '----FLERKIN BAKERY synonyms:(BAKERI) - EXACT WORD ORDER', ['FLERKIN', 'BAKERI', 'BAKER']),
+            ('6', 'FLERKIN BAKER\'S DOZEN LTD.', ['FLERKIN', 'BAKER']),
+            ('7', 'FLERKIN PATISSERIES LTD.', ['FLERKIN', 'PATISSERIE']),
+            (None, '----FLERKIN - PROXIMITY SEARCH', ['FLERKIN']),
+            ('8', 'FLERKIN HOLDINGS LTD.', []),
+            ('9', 'THE FLERKIN LTD.', []),
+            (None, '----FLERKIN* - EXACT WORD ORDER', ['FLERKIN']),
+            ('10', 'FLERKINATOR LTD.', []),
+        ],
+        13
+    ),
+    (
+        'phonetic',
+        [
+            connection('----FLERKIN BAKERY', [doc('1', 'FLURKIN BAKERY LTD.'), doc('2', 'FLERKEN BAKERIE INC.'),
+                                              doc('1', 'FLURKIN BAKERY LTD.')]),
+            connection('----FLERKIN', [doc('2', 'FLERKEN BAKERIE INC.'), doc('3', 'FLIRKIN LTD.')]),
+            connection('----FLERKIN', []),
+        ],
+        ['FLERKIN', 'BAKERY'],
+        ['FLERKIN', 'BAKERI'],
+        {'FLERKIN': ['FLERKIN'], 'BAKERI': ['BAKERI']},
+        [
+            (None, '----FLERKIN BAKERY', ['FLERKIN', 'BAKERI', 'BAKER']),
+            ('1', 'FLURKIN BAKERY LTD.', []),
+            ('2', 'FLERKEN BAKERIE INC.', []),
+            (None, '----FLERKIN', ['FLERKIN', 'BAKERI', 'BAKER']),
+            ('3', 'FLIRKIN LTD.', []),
+        ],
+        5
+    ),
+    (
+        'cobrs_phonetic',
+        [
+            connection('----MOUNTAIN VIEW synonyms:(MOUNTAIN, VIEW)',
+                       [doc('1', 'MOUNT VIEW LTD.'), doc('2', 'ALPINE VIEWS LTD.'), doc('3', 'MOUNTAIN BIKES LTD.'),
+                        doc('4', 'RIVERSIDE LTD.')]),
+        ],
+        ['MOUNTAIN', 'VIEW'],
+        ['MOUNTAIN', 'VIEW'],
+        {'MOUNTAIN': ['MOUNTAIN', 'ALPINE', 'MOUNT'], 'VIEW': ['VIEW', 'VISTA']},
+        [
+            (None, '----MOUNTAIN VIEW synonyms:(MOUNTAIN, VIEW)', ['MOUNTAIN', 'VIEW']),
+            ('3', 'MOUNTAIN BIKES LTD.', ['MOUNTAIN']),
+            ('2', 'ALPINE VIEWS LTD.', ['ALPINE']),
+            ('1', 'MOUNT VIEW LTD.', ['MOUNT']),
+            ('4', 'RIVERSIDE LTD.', []),
+        ],
+        4
+    ),
+]
+
+
+@pytest.mark.parametrize('bucket, connections, list_name_split, stemmed_words, synonyms_for_word, expected, num_found',
+                         conflict_results_data)
+def test_order_conflict_results(app, monkeypatch, bucket, connections, list_name_split, stemmed_words,
+                                synonyms_for_word, expected, num_found):
+    processed = []
+
+    def name_pre_processing(cls, name):
+        processed.append(name)
+        return name_pre_processing_base(name)
+
+    name_pre_processing_base = SolrQueries.name_pre_processing
+    monkeypatch.setattr(SolrQueries, 'name_pre_processing', classmethod(name_pre_processing))
+
+    results, msg, code = SolrQueries.order_conflict_results(copy.deepcopy(connections), bucket, list_name_split,
+                                                            stemmed_words, synonyms_for_word)
+
+    assert code is None
+    assert [(name['name_info'].get('id'), name['name_info']['name'], name['stems']) for name in results['names']] \
+        == expected
+    assert results['response'] == {'numFound': num_found, 'maxScore': 0.0, 'name': 'flerkin bakery'}
+    # every name is pre-processed once
+    assert len(processed) == len(set(processed))
+
+
+def test_order_conflict_results_error(app):
+    results, msg, code = SolrQueries.order_conflict_results((None, 'SOLR query error', 500), 'synonym', [], [], {})
+
+    assert (results, msg, code) == (None, 'Internal server error', 500)
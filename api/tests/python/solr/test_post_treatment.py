@@ -0,0 +1,41 @@
+import pytest
+
+from namex.analytics.phonetic import phonetic_key, phonetic_keys
+from namex.analytics.solr import SolrQueries
+
+
+@pytest.mark.parametrize('word, query, expected', [
+    ('QUICK', 'KWIK', True),
+    ('MACDONALD', 'MCDONALD', True),
+    ('PHONE', 'FONE', True),
+    ('EXPO', 'XPO', True),
+    ('KWIK', 'FONE', False),
+    ('OYSTER', 'OISTER', True),
+    ('FEY', 'FAY', True),
+    ('FEY', 'FOY', False),
+])
+def test_phonetic_key(word, query, expected):
+    assert (phonetic_key(word) == phonetic_key(query)) is expected
+    assert SolrQueries.keep_phonetic_match(word, query) is expected
+
+
+def test_phonetic_keys_skip_designations():
+    assert phonetic_keys(['KWIK', 'FONE', 'LTD.', 'THE']) == {phonetic_key('KWIK'), phonetic_key('FONE')}
+
+
+def candidate(nr_id, name):
+    return {'id': nr_id, 'name': name, 'source': 'CORP'}
+
+
+def test_post_treatment():
+    docs = [candidate('1', 'quick phone ltd.'), candidate('2', 'Kwik Fone Inc.'), candidate('1', 'quick phone ltd.'),
+            candidate('3', 'quick stop ltd.'), candidate('4', 'the fone')]
+
+    names = SolrQueries.post_treatment(docs, 'kwik fone')
+
+    assert [(name['id'], name['name']) for name in names] == [('1', 'QUICK PHONE LTD.'), ('2', 'KWIK FONE INC.')]
+    assert names[0] == {'name': 'QUICK PHONE LTD.', 'id': '1', 'source': 'CORP', 'jurisdiction': '', 'start_date': ''}
+
+
+def test_post_treatment_designation_in_query():
+    assert SolrQueries.post_treatment([candidate('1', 'kwik ltd.')], 'kwik ltd.') == []
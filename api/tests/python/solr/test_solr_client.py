@@ -0,0 +1,100 @@
+import time
+
+from namex.analytics import solr as solr_module
+from namex.analytics.solr import SolrQueries
+from namex.analytics.solr_client import SolrClient
+
+
+class FakeResponse:
+    def __init__(self, query):
+        self.query = query
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'query': self.query, 'response': {'docs': []}}
+
+
+class FakeSession:
+    def get(self, query, timeout=None):
+        # The first queries answer last
+        time.sleep(0.05 if query == 'q0' else 0)
+        return FakeResponse(query)
+
+
+def test_get_all_json_keeps_query_order(app):
+    client = SolrClient()
+    client._get_pool()
+    client._session = FakeSession()
+
+    queries = ['q{}'.format(i) for i in range(10)]
+    results = client.get_all_json(queries)
+
+    assert [result['query'] for result in results] == queries
+    assert client.get_all_json([]) == []
+
+
+def test_get_phonetic_results_keeps_stack_order(app, monkeypatch):
+    queries = []
+
+    def get_all_json(all_queries):
+        queries.extend(all_queries)
+        return [{'response': {'docs': []}, 'query': query} for query in all_queries]
+
+    monkeypatch.setattr(solr_module.solr_client, 'get_all_json', get_all_json)
+    monkeypatch.setattr(SolrQueries, '_get_synonyms_clause', classmethod(lambda cls, *args: ''))
+
+    connections = SolrQueries.get_phonetic_results('http://solr', 'flerkin bakery',
+                                                   [('flerkin bakery', '', '', 1), ('flerkin', '', '', 1)],
+                                                   {'full_words': [], 'stemmed_words': []})
+
+    assert [label for _, label in connections] == ['----flerkin bakery', '----flerkin']
+    assert [result['query'] for result, _ in connections] == queries
+
+
+class VersionedSession:
+    def __init__(self):
+        self.version = 1
+        self.queries = []
+
+    def get(self, query, timeout=None):
+        if '/admin/luke' in query:
+            return FakeIndexResponse(self.version)
+        self.queries.append(query)
+        return FakeResponse(query)
+
+
+class FakeIndexResponse(FakeResponse):
+    def __init__(self, version):
+        super().__init__(None)
+        self.version = version
+
+    def json(self):
+        return {'index': {'version': self.version}}
+
+
+def test_get_cached_json_until_the_core_is_updated(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'SOLR_BASE_URL', 'http://solr')
+    monkeypatch.setitem(app.config, 'SOLR_MATCH_CACHE_TIMEOUT', 60)
+    client = SolrClient()
+    client._get_pool()
+    client._session = session = VersionedSession()
+    client.invalidate('names')
+
+    first = client.get_cached_json('names', 'histories/flerkin', 'q0')
+    assert client.get_cached_json('names', 'histories/flerkin', 'q0') == first
+    client.get_cached_json('names', 'histories/bakery', 'q1')
+    assert session.queries == ['q0', 'q1']
+
+    # the version is only checked again once the core was updated by this process, or after the check interval
+    session.version = 2
+    client.get_cached_json('names', 'histories/flerkin', 'q0')
+    assert session.queries == ['q0', 'q1']
+    client.invalidate('names')
+    client.get_cached_json('names', 'histories/flerkin', 'q0')
+    assert session.queries == ['q0', 'q1', 'q0']
+
+    monkeypatch.setitem(app.config, 'SOLR_MATCH_CACHE_TIMEOUT', 0)
+    client.get_cached_json('names', 'histories/flerkin', 'q0')
+    assert session.queries == ['q0', 'q1', 'q0', 'q0']
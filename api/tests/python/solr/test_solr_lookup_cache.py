@@ -0,0 +1,43 @@
+import pytest
+
+from namex.analytics import solr as solr_module
+from namex.analytics.solr import SolrQueries
+from namex.services.cache import cache
+
+
+@pytest.fixture
+def lookups(app, monkeypatch):
+    cache.clear()
+    versions = ['v1']
+    calls = []
+
+    def fetch_synonym_list(cls, solr_synonyms_api_url, token):
+        calls.append(token)
+        return ['bakery', 'bakeries', 'bakeshop']
+
+    monkeypatch.setitem(app.config, 'SOLR_SYNONYMS_API_URL', 'http://synonyms')
+    monkeypatch.setattr(solr_module, 'fetch_synonyms_version', lambda: versions[0])
+    monkeypatch.setattr(SolrQueries, '_fetch_synonym_list', classmethod(fetch_synonym_list))
+    yield versions, calls
+    cache.clear()
+
+
+def test_synonym_list_is_cached(lookups):
+    versions, calls = lookups
+
+    first = SolrQueries.get_synonyms_for_words(['bakery'])
+    assert SolrQueries.get_synonyms_for_words(['bakery']) == first
+    assert first['BAKERY'][0] == 'BAKERY'
+    assert calls == ['BAKERY']
+
+
+def test_synonym_edit_invalidates_lookups(lookups):
+    versions, calls = lookups
+
+    SolrQueries._get_synonym_list('BAKERY')
+    versions[0] = 'v2'
+    # The version is only checked again once the cached one expired
+    cache.delete(solr_module.SYNONYMS_VERSION_CACHE_KEY)
+    SolrQueries._get_synonym_list('BAKERY')
+
+    assert calls == ['BAKERY', 'BAKERY']
@@ -55,8 +55,9 @@ def inprogress_update(user: User, max_rows: int, client_delay: int, examine_dela
 
             request.stateCd = State.DRAFT
             request.checkedOutBy = None
-            request.save_to_db()
-            EventRecorder.record(user, Event.SET_TO_DRAFT, request, request.json(), save_to_session=True)
+            db.session.add(request)
+
+        EventRecorder.record_many(user, Event.SET_TO_DRAFT, client_edit_reqs, compact=True)
 
         # for nrs edited by examiners
         examine_reqs = db.session.query(Request). \
@@ -67,6 +68,8 @@ def inprogress_update(user: User, max_rows: int, client_delay: int, examine_dela
             limit(max_rows). \
             with_for_update().all()
 
+        set_to_draft_reqs = []
+        marked_on_hold_reqs = []
         for request in examine_reqs:
             row_count += 1
             current_app.logger.debug(f'processing: {request.nrNum}')
@@ -74,19 +77,21 @@ def inprogress_update(user: User, max_rows: int, client_delay: int, examine_dela
 
             # if this NR was previously in DRAFT, reset it to that state
             # (ie: the user walked away from an open edit window)
-            event = None
             if request.previousStateCd == State.DRAFT:
                 request.stateCd = State.DRAFT
                 request.previousStateCd = None
-                event = Event.SET_TO_DRAFT
+                set_to_draft_reqs.append(request)
             # otherwise put it on hold
             else:
                 request.stateCd = State.HOLD
-                event = Event.MARKED_ON_HOLD
+                marked_on_hold_reqs.append(request)
 
-            request.save_to_db()
+            db.session.add(request)
 
-            EventRecorder.record(user, event, request, request.json(), save_to_session=True)
+        # the events are inserted in bulk and committed with the NR changes
+        EventRecorder.record_many(user, Event.SET_TO_DRAFT, set_to_draft_reqs, compact=True)
+        EventRecorder.record_many(user, Event.MARKED_ON_HOLD, marked_on_hold_reqs, compact=True)
+        db.session.commit()
         return row_count, True
 
     except Exception as err:  # noqa B902
@@ -77,6 +77,12 @@ class Config():  # pylint: disable=too-few-public-methods
 
     EMAILER_TOPIC = os.getenv('NAMEX_MAILER_TOPIC', '')
     NAMEX_NR_STATE_TOPIC = os.getenv('NAMEX_NR_STATE_TOPIC', '')
+    # Client side batching of the messages published to a topic
+    PUBLISHER_BATCH_MAX_MESSAGES = int(os.getenv('PUBLISHER_BATCH_MAX_MESSAGES', '100'))
+    PUBLISHER_BATCH_MAX_BYTES = int(os.getenv('PUBLISHER_BATCH_MAX_BYTES', '1000000'))
+    PUBLISHER_BATCH_MAX_LATENCY = float(os.getenv('PUBLISHER_BATCH_MAX_LATENCY', '0.05'))
+    # Seconds to wait for the published messages to be posted before the job exits
+    PUBLISHER_FLUSH_TIMEOUT = int(os.getenv('PUBLISHER_FLUSH_TIMEOUT', '60'))
 
 class DevConfig(Config):  # pylint: disable=too-few-public-methods
     """Creates the Development Config object."""
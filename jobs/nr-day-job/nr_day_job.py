@@ -14,6 +14,7 @@
 """s2i based launch script to run the service."""
 import os
 import uuid
+from concurrent.futures import Future
 from datetime import datetime, timezone
 
 from flask import Flask, current_app
@@ -52,16 +53,25 @@ def register_shellcontext(app):
 
 
 def publish_email_message(payload: dict):
-    """Publish the email message onto the pubsub emailer topic."""
+    """Publish the email message onto the pubsub emailer topic, returns the future of the publication."""
     email_topic = current_app.config.get('EMAILER_TOPIC', '')
     current_app.logger.debug('publish to queue, subject:%s, event:%s', email_topic, payload)
-    queue.publish(topic=email_topic, payload=payload)
+    if hasattr(queue, 'publish_async'):
+        return queue.publish_async(topic=email_topic, payload=payload)
+
+    # gcp_queue before 2.1.0 only publishes synchronously
+    future = Future()
+    try:
+        future.set_result(queue.publish(topic=email_topic, payload=payload))
+    except Exception as err:  # noqa B902; pylint: disable=W0703;
+        future.set_exception(err)
+    return future
 
 def furnish_request_message(
         request: Request,
         option: str
 ):  # pylint: disable=redefined-outer-name
-    """Send notification info to the mail queue."""
+    """Send notification info to the mail queue, returns the future of the publication."""
     current_app.logger.debug('Start of the furnishing of request for %s nrNum=%s', option, request.nrNum)
     ce = SimpleCloudEvent(
         id=str(uuid.uuid4()),
@@ -79,14 +89,33 @@ def furnish_request_message(
     payload = queue.to_queue_message(ce)
     current_app.logger.debug('About to publish email for %s nrNum=%s', option, request.nrNum)
 
-    publish_email_message(payload)
+    return publish_email_message(payload)
+
+
+def furnish_request_messages(requests: list, option: str):
+    """Send the notification info of the requests to the mail queue, returns the requests that were notified.
+
+    The messages are all published before waiting for them to be posted, so they are batched by the publisher.
+    Only the requests whose message was posted are marked as notified.
+    """
+    futures = [(request, furnish_request_message(request, option)) for request in requests]
+
+    furnished = []
+    for request, future in futures:
+        try:
+            future.result()
+        except Exception as err:  # noqa B902; pylint: disable=W0703;
+            current_app.logger.error('Unable to publish email for %s nrNum=%s: %s', option, request.nrNum, err)
+            continue
 
-    if option == 'before-expiry':
-        request.notifiedBeforeExpiry = True
-    elif option == 'expired':
-        request.notifiedExpiry = True
-        request.stateCd = State.EXPIRED
-    request.save_to_db()
+        if option == 'before-expiry':
+            request.notifiedBeforeExpiry = True
+        elif option == 'expired':
+            request.notifiedExpiry = True
+            request.stateCd = State.EXPIRED
+        request.save_to_db()
+        furnished.append(request)
+    return furnished
 
 
 def notify_nr_before_expiry():
@@ -101,8 +130,7 @@ def notify_nr_before_expiry():
             Request.notifiedBeforeExpiry == False,  # noqa E712; pylint: disable=singleton-comparison
             where_clause
         ).all()
-        for request in requests:
-            furnish_request_message(request, 'before-expiry')
+        furnish_request_messages(requests, 'before-expiry')
     except Exception as err:  # noqa B902; pylint: disable=W0703;
         current_app.logger.error(err)
 
@@ -118,8 +146,7 @@ def notify_nr_expired():
             Request.notifiedExpiry == False,  # noqa E712; pylint: disable=singleton-comparison
             where_clause
         ).all()
-        for request in requests:
-            furnish_request_message(request, 'expired')
+        for request in furnish_request_messages(requests, 'expired'):
             EventRecorder.record_as_system(Event.NR_DAY_JOB, request, request.json())
 
     except Exception as err:  # noqa B902; pylint: disable=W0703;
@@ -134,3 +161,6 @@ if __name__ == '__main__':
     with application.app_context():
         notify_nr_expired()
         notify_nr_before_expiry()
+        # gcp_queue before 2.1.0 has nothing left to flush
+        if hasattr(queue, 'close') and (failed := queue.close(application.config.get('PUBLISHER_FLUSH_TIMEOUT'))):
+            application.logger.error('%s messages were not posted to the queue', failed)
@@ -22,11 +22,11 @@ import config  # pylint: disable=wrong-import-order; # noqa: I001
 import quart.flask_patch
 from namex import models
 from namex.models import db, ma
-from namex.services.name_request.auto_analyse.protected_name_analysis import ProtectedNameAnalysisService
+from namex.services.cache import cache
 from quart import Quart, jsonify, request
 
 
-from .analyzer import auto_analyze
+from .pool import analyze_batches
 
 
 # Set config
@@ -42,6 +42,7 @@ async def create_app(run_mode):
         quart_app.config.from_object(config.CONFIGURATION[run_mode])
         db.init_app(quart_app)
         ma.init_app(quart_app)
+        cache.init_app(quart_app)
     except Exception as err:
         quart_app.logger.debug(
             'Error creating application in auto-analyze service: {0}'.format(repr(err.with_traceback(None))))
@@ -80,26 +81,23 @@ db.app = app  # Just set it, see if it works...
 @app.route('/', methods=['POST'])
 async def private_service():
     """Return the outcome of this private service call."""
-    name_analysis_service = ProtectedNameAnalysisService()
-    service = name_analysis_service
-    np_svc_prep_data = service.name_processing_service
-    np_svc_prep_data.prepare_data()
+    json_data = await request.get_json()
+    app.logger.debug('Number of matches: {0}'.format(len(json_data.get('names'))))
+
+    results = await analyze_batches([json_data], app.config.get('ANALYZER_PROCESSES'))
+    return jsonify(result=results[0])
 
+
+@app.route('/batch', methods=['POST'])
+async def private_batch_service():
+    """Return the outcome of this private service call for several sets of names, in order."""
     json_data = await request.get_json()
-    list_dist = json_data.get('list_dist')
-    list_desc = json_data.get('list_desc')
-    list_name = json_data.get('list_name')
-    dict_substitution = json_data.get('dict_substitution')
-    dict_synonyms = json_data.get('dict_synonyms')
-    matches = json_data.get('names')
-
-    app.logger.debug('Number of matches: {0}'.format(len(matches)))
-
-    result = await asyncio.gather(
-        *[auto_analyze(name, list_name, list_dist, list_desc, dict_substitution, dict_synonyms, np_svc_prep_data) for
-          name in matches]
-    )
-    return jsonify(result=result)
+    batches = json_data.get('batches')
+    app.logger.debug('Number of sets: {0}, number of matches: {1}'.format(
+        len(batches), sum(len(analysis.get('names')) for analysis in batches)))
+
+    results = await analyze_batches(batches, app.config.get('ANALYZER_PROCESSES'))
+    return jsonify(results=results)
 
 
 if __name__ == '__main__':
@@ -12,11 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Analyzes a single name."""
-import itertools
 import logging
 import math
 import re
 from collections import Counter
+from functools import lru_cache
 
 from namex.services.name_processing.name_processing import NameProcessingService
 from namex.services.name_request.auto_analyse.name_analysis_utils import (
@@ -28,12 +28,14 @@ from namex.services.name_request.auto_analyse.name_analysis_utils import (
 )
 from namex.services.name_request.auto_analyse.protected_name_analysis import ProtectedNameAnalysisService
 from namex.services.name_request.builders.name_analysis_builder import NameAnalysisBuilder
+from namex.services.synonyms import SynonymsApi as SynonymService
 from nltk.stem import PorterStemmer
-from swagger_client import SynonymsApi as SynonymService
 
 
 porter = PorterStemmer()
 
+STEM_CACHE_SIZE = 50000
+
 synonym_service = SynonymService()
 name_processing_service = NameProcessingService()
 name_analysis_service = ProtectedNameAnalysisService()
@@ -52,6 +54,12 @@ MINIMUM_SIMILARITY = 0.66
 HIGH_CONFLICT_RECORDS = 20
 
 
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(word: str) -> str:
+    """Return the Porter stem of the word, the same words are stemmed for every candidate name."""
+    return porter.stem(word)
+
+
 # ok deep function
 async def auto_analyze(name: str,  # pylint: disable=too-many-locals, too-many-arguments
                        list_name: list, list_dist: list,
@@ -108,7 +116,7 @@ async def auto_analyze(name: str,  # pylint: disable=too-many-locals, too-many-a
             service.get_list_dist(),
             list_dist)
 
-        list_dist_stem = [porter.stem(word) for word in list_dist]
+        list_dist_stem = [stem(word) for word in list_dist]
         vector1_dist = text_to_vector(list_dist_stem)
 
         vector2_dist, entropy_dist = get_vector(service.get_list_dist(), list_dist,
@@ -131,7 +139,7 @@ async def auto_analyze(name: str,  # pylint: disable=too-many-locals, too-many-a
 
         similarity_dist = round(get_similarity(vector1_dist, vector2_dist, entropy_dist), 2)
 
-        list_desc_stem = [porter.stem(word) for word in list_desc]
+        list_desc_stem = [stem(word) for word in list_desc]
         vector1_desc = text_to_vector(list_desc_stem)
 
         vector2_desc, entropy_desc = get_vector(
@@ -161,17 +169,18 @@ def get_vector(conflict_class_list, original_class_list, class_subs_dict, dist=F
     original_class_list = original_class_list if original_class_list else []
     class_subs_dict = class_subs_dict if class_subs_dict else {}
 
-    conflict_class_stem = [porter.stem(name.lower()) for name in conflict_class_list]
+    conflict_class_stem = {stem(name.lower()) for name in conflict_class_list}
+    class_subs = set(get_flat_list(class_subs_dict.values()))
 
-    for idx, word in enumerate(original_class_list):  # pylint: disable=unused-variable
+    for word in original_class_list:
         k = word.lower()
-        word_stem = porter.stem(k)
+        word_stem = stem(k)
         counter = 1
-        if word.lower() in conflict_class_list:
+        if k in conflict_class_list:
             entropy.append(1)
         elif word_stem in conflict_class_stem:
             entropy.append(STEM_W)
-        elif word_stem in get_flat_list(class_subs_dict.values()):
+        elif word_stem in class_subs:
             entropy.append(SUBS_W)
         else:
             counter = OTHER_W_DIST if dist else OTHER_W_DESC
@@ -285,15 +294,19 @@ def update_dictionary_key(d1, d2):
 
 def remove_descriptive_same_category(dict_desc):
     """Remove descriptive with the same category."""
-    dict_desc_unique_category = {key: val for i, (key, val) in enumerate(dict_desc.items())
-                                 if porter.stem(key) not in itertools.chain(*list(dict_desc.values())[:i])}
+    dict_desc_unique_category = {}
+    previous_values = set()
+    for key, val in dict_desc.items():
+        if stem(key) not in previous_values:
+            dict_desc_unique_category[key] = val
+        previous_values.update(val)
 
     return list(dict_desc_unique_category.keys()), dict_desc_unique_category
 
 
 def stem_key_dictionary(d1):
     """Stem the dictionary key."""
-    dict_stem = {porter.stem(k): v for (k, v) in d1.items()}
+    dict_stem = {stem(k): v for (k, v) in d1.items()}
 
     return dict_stem
 
@@ -0,0 +1,91 @@
+# Copyright © 2020 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Runs the analysis of sets of names, on the event loop or on a pool of worker processes.
+
+The analysis is CPU bound, so running it on the event loop serializes every request.
+With ANALYZER_PROCESSES set, each set of names is analyzed by a worker process, each worker
+loading the name processing reference data once when it starts.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from namex.services.name_request.auto_analyse.protected_name_analysis import ProtectedNameAnalysisService
+
+from .analyzer import auto_analyze
+
+
+_executor = {'pool': None}
+_worker_loop = {'loop': None}
+
+
+def get_prepared_data():
+    """Return a name processing service prepared from the process wide reference data snapshot."""
+    np_svc_prep_data = ProtectedNameAnalysisService().name_processing_service
+    np_svc_prep_data.prepare_data()
+    return np_svc_prep_data
+
+
+async def analyze_names(analysis: dict) -> list:
+    """Return the analysis of a set of names, one {name: similarity} per name."""
+    np_svc_prep_data = get_prepared_data()
+
+    # The names of a set are analyzed in order, auto_analyze updates dict_synonyms as it goes
+    return await asyncio.gather(
+        *[auto_analyze(name, analysis.get('list_name'), analysis.get('list_dist'), analysis.get('list_desc'),
+                       analysis.get('dict_substitution'), analysis.get('dict_synonyms'), np_svc_prep_data)
+          for name in analysis.get('names')]
+    )
+
+
+async def _analyze_names_in_context(analysis: dict) -> list:
+    from . import app  # pylint: disable=import-outside-toplevel; the worker imports the app on start up
+
+    async with app.app_context():
+        return await analyze_names(analysis)
+
+
+def _init_worker():
+    """Load the reference data when the worker starts, so the first request does not pay for it."""
+    _worker_loop['loop'] = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop['loop'])
+    _worker_loop['loop'].run_until_complete(_analyze_names_in_context({'names': []}))
+
+
+def _analyze_names_in_worker(analysis: dict) -> list:
+    return _worker_loop['loop'].run_until_complete(_analyze_names_in_context(analysis))
+
+
+def get_executor(processes: int) -> ProcessPoolExecutor:
+    """Return the worker pool, created on first use."""
+    if _executor['pool'] is None:
+        _executor['pool'] = ProcessPoolExecutor(max_workers=processes,
+                                                mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=_init_worker)
+    return _executor['pool']
+
+
+async def analyze_batches(batches: list, processes: int) -> list:
+    """Return the analysis of every set of names, in order.
+
+    Without worker processes the sets are analyzed on the event loop.
+    """
+    if not processes:
+        return [await analyze_names(analysis) for analysis in batches]
+
+    loop = asyncio.get_event_loop()
+    executor = get_executor(processes)
+    return await asyncio.gather(
+        *[loop.run_in_executor(executor, _analyze_names_in_worker, analysis) for analysis in batches]
+    )
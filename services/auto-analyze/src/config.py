@@ -64,6 +64,13 @@ class Config:  # pylint: disable=too-few-public-methods
     )
 
     SOLR_SYNONYMS_API_URL = os.getenv('SOLR_SYNONYMS_API_URL', None)
+    # Serve synonym / designation lookups from the in-process synonym engine instead of the synonyms API
+    SYNONYMS_IN_PROCESS = os.getenv('SYNONYMS_IN_PROCESS', 'False').lower() == 'true'
+
+    # Number of worker processes analyzing the names, 0 analyzes them on the event loop
+    ANALYZER_PROCESSES = int(os.getenv('ANALYZER_PROCESSES', '0'))
+    # Seconds between checks of the synonym table version, the name processing reference data is reloaded on change
+    REFERENCE_DATA_TTL = int(os.getenv('REFERENCE_DATA_TTL', '300'))
 
     # JWT_OIDC Settings
     JWT_OIDC_WELL_KNOWN_CONFIG = os.getenv('JWT_OIDC_WELL_KNOWN_CONFIG')
@@ -27,3 +27,26 @@ async def test_auto_analyzer(test_name, name, expected):
     r = await auto_analyze(name)
 
     assert r == expected
+
+
+@pytest.mark.parametrize('conflict_class_list, original_class_list, class_subs_dict, dist, expected', [
+    (['bakery'], ['bakery'], {}, False, ({'bakeri': 1}, 1.0)),
+    (['bakeries'], ['bakery'], {}, False, ({'bakeri': 1}, 0.85)),
+    (['cafe'], ['bakery', 'bread'], {'bakery': ['bread ', 'bakeri']}, False, ({'bakeri': 1, 'bread': 1}, 0.65)),
+    (['cafe'], ['mountain'], {}, True, ({}, 0.0)),
+])
+def test_get_vector(conflict_class_list, original_class_list, class_subs_dict, dist, expected):
+    """Assert that the vector and entropy of the matched words are returned."""
+    from auto_analyze.analyzer import get_vector
+
+    assert get_vector(conflict_class_list, original_class_list, class_subs_dict, dist) == expected
+
+
+def test_remove_descriptive_same_category():
+    """Assert that descriptives already found in the synonyms of a previous descriptive are removed."""
+    from auto_analyze.analyzer import remove_descriptive_same_category
+
+    dict_desc = {'bakery': ['bakeri', 'bread'], 'breads': ['bread', 'loaf'], 'cafe': ['cafe']}
+
+    assert remove_descriptive_same_category(dict_desc) == \
+        (['bakery', 'cafe'], {'bakery': ['bakeri', 'bread'], 'cafe': ['cafe']})
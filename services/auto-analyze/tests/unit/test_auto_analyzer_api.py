@@ -22,3 +22,15 @@ async def test_auto_analyzer_api(app):
     client = app.test_client()
     response = await client.post('/', json=data)
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_auto_analyzer_batch_api(app):
+    """Assert that the API returns the analysis of every set of names, in order."""
+    data = {'batches': [{'names': ['person', 'man']}, {'names': []}, {'names': ['camera']}]}
+    client = app.test_client()
+    response = await client.post('/batch', json=data)
+    assert response.status_code == 200
+
+    results = (await response.get_json())['results']
+    assert [len(result) for result in results] == [2, 0, 1]
@@ -34,12 +34,14 @@
 """This module provides Queue type services."""
 from __future__ import annotations
 
+import atexit
 import base64
 import json
+import threading
 from concurrent.futures import TimeoutError  # pylint: disable=W0622
-from concurrent.futures import CancelledError
+from concurrent.futures import CancelledError, Future, wait
 from contextlib import suppress
-from typing import Optional
+from typing import Iterable, List, Optional
 
 from flask import Flask
 from google.auth import jwt
@@ -64,7 +66,13 @@ class GcpQueue:
         self.gcp_auth_key = None
         self.publisher_audience = None
         self.service_account_info = None
+        self.batch_settings = None
         self._publisher = None
+        self._publisher_lock = threading.Lock()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        # the messages still batched in the publisher are sent before the process exits
+        atexit.register(self.close)
 
         if app:
             self.init_app(app)
@@ -72,6 +80,12 @@ class GcpQueue:
     def init_app(self, app: Flask):
         """Initializes the application"""
 
+        self.batch_settings = pubsub_v1.types.BatchSettings(
+            max_messages=app.config.get("PUBLISHER_BATCH_MAX_MESSAGES", 100),
+            max_bytes=app.config.get("PUBLISHER_BATCH_MAX_BYTES", 1 * 1000 * 1000),
+            max_latency=app.config.get("PUBLISHER_BATCH_MAX_LATENCY", 0.01),
+        )
+
         self.gcp_auth_key = app.config.get("GCP_AUTH_KEY")
         if self.gcp_auth_key:
             try:
@@ -92,10 +106,13 @@ class GcpQueue:
 
     @property
     def publisher(self):
-        """Returns the publisher"""
+        """Returns the publisher, a single client is shared by the threads of the process"""
 
         if not self._publisher and self.credentials_pub:
-            self._publisher = pubsub_v1.PublisherClient(credentials=self.credentials_pub)
+            with self._publisher_lock:
+                if not self._publisher:
+                    kwargs = {"batch_settings": self.batch_settings} if self.batch_settings else {}
+                    self._publisher = pubsub_v1.PublisherClient(credentials=self.credentials_pub, **kwargs)
         return self._publisher
 
     @staticmethod
@@ -175,6 +192,57 @@ class GcpQueue:
         except (CancelledError, TimeoutError) as error:
             raise Exception("Unable to post to queue", error) from error  # pylint: disable=W0719
 
+    def publish_async(self, topic: str, payload: bytes) -> Future:
+        """Send payload to the queue without waiting for it to be posted.
+
+        The message is batched with the others sent to the topic, the returned future resolves to the message id.
+        The message is tracked until it is posted, see flush.
+        """
+        if not (publisher := self.publisher):
+            raise Exception("missing setup arguments")  # pylint: disable=W0719
+
+        future = publisher.publish(topic, payload)
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard_pending)
+        return future
+
+    def publish_many(self, topic: str, payloads: Iterable[bytes]) -> List[str]:
+        """Send the payloads to the queue in batches, returns the message ids once they are all posted."""
+        futures = [self.publish_async(topic, payload) for payload in payloads]
+        try:
+            return [future.result() for future in futures]
+        except (CancelledError, TimeoutError) as error:
+            raise Exception("Unable to post to queue", error) from error  # pylint: disable=W0719
+
+    def flush(self, timeout: Optional[float] = None) -> int:
+        """Wait for the messages sent with publish_async to be posted, returns how many of them failed or timed out."""
+        with self._pending_lock:
+            pending = list(self._pending)
+        if not pending:
+            return 0
+
+        done, not_done = wait(pending, timeout=timeout)
+        failed = len(not_done)
+        for future in done:
+            if future.cancelled() or future.exception() is not None:
+                failed += 1
+        return failed
+
+    def close(self, timeout: Optional[float] = None):
+        """Post the pending messages and stop the publisher."""
+        failed = self.flush(timeout)
+        with self._publisher_lock:
+            if self._publisher:
+                with suppress(Exception):
+                    self._publisher.stop()
+                self._publisher = None
+        return failed
+
+    def _discard_pending(self, future: Future):
+        with self._pending_lock:
+            self._pending.discard(future)
+
     @staticmethod
     def to_queue_message(ce: SimpleCloudEvent):
         """Return a byte string of the CloudEvent in JSON format"""
@@ -1,4 +1,6 @@
 import base64
+import threading
+from concurrent.futures import CancelledError, Future
 from contextlib import suppress
 from http import HTTPStatus
 
@@ -115,3 +117,84 @@ def test_gcp_pubsub_connectivity():
         # Data must be a bytestring
         data = data_str.encode("utf-8")
         queue.publish(topic, data)
+
+
+class FakePublisher:
+    """In memory publisher, a batch is posted once full or when max_latency elapsed."""
+
+    def __init__(self, max_messages=3, max_latency=None, fail_on=None):
+        self.max_messages = max_messages
+        self.max_latency = max_latency
+        self.fail_on = fail_on
+        self.batch = []
+        self.posted = []
+        self.stopped = False
+        self.lock = threading.Lock()
+
+    def publish(self, topic, payload):
+        future = Future()
+        with self.lock:
+            self.batch.append((topic, payload, future))
+            full = len(self.batch) >= self.max_messages
+            if len(self.batch) == 1 and not full and self.max_latency is not None:
+                threading.Timer(self.max_latency, self.post).start()
+        if full:
+            self.post()
+        return future
+
+    def post(self):
+        with self.lock:
+            batch, self.batch = self.batch, []
+        for topic, payload, future in batch:
+            if payload == self.fail_on:
+                future.set_exception(CancelledError())
+                continue
+            self.posted.append((topic, payload))
+            future.set_result(str(len(self.posted)))
+
+    def stop(self):
+        self.post()
+        self.stopped = True
+
+
+def test_publish_async_is_batched():
+    """Test that the messages are not waited for one by one."""
+    queue = GcpQueue()
+    queue._publisher = publisher = FakePublisher(max_messages=3, max_latency=0.05)
+
+    futures = [queue.publish_async("topic", f"message {n}".encode()) for n in range(4)]
+
+    assert [future.done() for future in futures] == [True, True, True, False]
+    assert len(queue._pending) == 1
+
+    assert queue.close() == 0
+    assert publisher.stopped
+    assert queue._publisher is None
+    assert [payload for _, payload in publisher.posted] == [f"message {n}".encode() for n in range(4)]
+    assert not queue._pending
+
+
+def test_publish_many():
+    """Test that the message ids are returned once all the messages are posted."""
+    queue = GcpQueue()
+    queue._publisher = FakePublisher(max_messages=2)
+
+    assert queue.publish_many("topic", [b"1", b"2", b"3", b"4"]) == ["1", "2", "3", "4"]
+
+    queue._publisher = FakePublisher(max_messages=2, fail_on=b"2")
+    with pytest.raises(Exception, match="Unable to post to queue"):
+        queue.publish_many("topic", [b"1", b"2"])
+
+
+def test_flush_reports_failures():
+    """Test that flush waits for the pending messages and counts the ones that failed."""
+    queue = GcpQueue()
+    queue._publisher = publisher = FakePublisher(max_messages=10, fail_on=b"bad")
+
+    queue.publish_async("topic", b"good")
+    queue.publish_async("topic", b"bad")
+    assert queue.flush(timeout=0) == 2
+
+    publisher.post()
+    assert queue.flush() == 0
+    assert publisher.posted == [("topic", b"good")]
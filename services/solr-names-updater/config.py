@@ -88,6 +88,12 @@ class Config():  # pylint: disable=too-few-public-methods
     SUB_SERVICE_ACCOUNT = os.getenv('BUSINESS_SERVICE_ACCOUNT', '')
 
     SOLR_FEEDER_API_URL = os.getenv('SOLR_FEEDER_API_URL', None)
+    # Seconds the updates wait for the ones of the concurrent messages before being sent to solr feeder together
+    SOLR_FEEDER_BATCH_WINDOW = float(os.getenv('SOLR_FEEDER_BATCH_WINDOW', '0.2'))
+    # Docs of a batch sent to solr feeder without waiting for the window to elapse
+    SOLR_FEEDER_BATCH_SIZE = int(os.getenv('SOLR_FEEDER_BATCH_SIZE', '100'))
+    # Milliseconds within which solr commits the updates, bounds the delay before they are searchable
+    SOLR_FEEDER_COMMIT_WITHIN = int(os.getenv('SOLR_FEEDER_COMMIT_WITHIN', '1000'))
 
     ALEMBIC_INI = 'migrations/alembic.ini'
 
@@ -139,6 +145,7 @@ class TestConfig(Config):  # pylint: disable=too-few-public-methods
         name=DB_NAME,
     )
     SOLR_FEEDER_API_URL = os.getenv('SOLR_FEEDER_API_URL', 'https://mock-solr-feeder/api/v1')
+    SOLR_FEEDER_BATCH_WINDOW = 0
 
     # JWT OIDC settings
     # JWT_OIDC_TEST_MODE will set jwt_manager to use
@@ -38,7 +38,8 @@
 import os
 
 workers = int(os.environ.get("GUNICORN_PROCESSES", "1"))  # pylint: disable=invalid-name
-threads = int(os.environ.get("GUNICORN_THREADS", "1"))  # pylint: disable=invalid-name
+# the concurrent messages of a worker process share their requests to solr feeder, see names_processors
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))  # pylint: disable=invalid-name
 timeout = int(os.environ.get("GUNICORN_TIMEOUT", "600"))  # pylint: disable=invalid-name
 
 forwarded_allow_ips = "*"  # pylint: disable=invalid-name
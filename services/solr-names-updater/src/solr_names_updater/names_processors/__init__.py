@@ -14,9 +14,16 @@
 """This module contains all of the Entity Email specific processors.
 
 Processors hold the business logic for how solr feeder is updated.
-"""
 
+The updates of the messages processed at the same time are sent to solr feeder in a single request per core. The
+first message of a batch waits SOLR_FEEDER_BATCH_WINDOW seconds, or until the batch holds SOLR_FEEDER_BATCH_SIZE
+docs, for the others to join it. The processing of a message only completes once its batch was posted, so a failed
+post still sends the messages back on the queue. Solr commits the updates within SOLR_FEEDER_COMMIT_WITHIN
+milliseconds instead of a hard commit per message.
+"""
+import json
 import re
+import threading
 
 import requests
 from flask import current_app
@@ -25,16 +32,110 @@ from namex.models import db, Name  # noqa: 1001
 
 
 def convert_to_solr_conformant_json(request_str):
-    """Replace the 'add' keys append with a number with the key 'add'.
+    """Replace the 'add' and 'delete' keys append with a number with the key 'add' / 'delete'.
 
     This is needed as dict do not allow duplicates keys.  The solr api expects a json
-    format that requires duplicate add keys so as a workaround this limitation, this is
+    format that requires duplicate add / delete keys so as a workaround this limitation, this is
     done after the payload_dict is converted to a json string.
     """
-    request_str = re.sub(r"\"add\d+\":", "\"add\":", request_str)  # noqa:Q000
+    request_str = re.sub(r"\"(add|delete)\d+\":", r'"\1":', request_str)  # noqa:Q000
     return request_str
 
 
+def construct_solr_update_request(updates: dict, commit_within: int):
+    """Return the solr update request of the updates, a dict of doc id to the doc to add or None to delete it."""
+    request = {}
+    for index, (doc_id, doc) in enumerate(updates.items()):
+        if doc is None:
+            request[f'delete{index + 1}'] = {'id': doc_id, 'commitWithin': commit_within}
+        else:
+            request[f'add{index + 1}'] = {'doc': doc, 'commitWithin': commit_within}
+    return convert_to_solr_conformant_json(json.dumps(request))
+
+
+class SolrFeederBatch:
+    """Updates of a solr core sent to solr feeder in a single request."""
+
+    def __init__(self, solr_core: str):
+        """Create an empty batch, closed once it is full or its window elapsed."""
+        self.solr_core = solr_core
+        self.updates = {}
+        self.closed = threading.Event()
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+    def merge(self, docs, delete_ids):
+        """Add the updates to the batch, the last update of a doc replaces the previous ones."""
+        for doc_id in delete_ids:
+            self.updates.pop(doc_id, None)
+            self.updates[doc_id] = None
+        for doc in docs:
+            self.updates.pop(doc['id'], None)
+            self.updates[doc['id']] = doc
+
+    def post(self, commit_within: int):
+        """Post the batch to solr feeder and release the messages waiting for it."""
+        try:
+            self.response = post_to_solr_feeder({
+                'solr_core': self.solr_core,
+                'request': construct_solr_update_request(self.updates, commit_within)
+            })
+        except Exception as err:  # noqa: B902
+            self.error = err
+        finally:
+            self.done.set()
+
+
+class SolrFeederBatcher:
+    """Process wide batching of the solr feeder updates, one open batch per solr core."""
+
+    def __init__(self):
+        """Create the batcher."""
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def send(self, solr_core: str, docs=(), delete_ids=()):
+        """Send the updates to solr feeder with the ones of the concurrent messages, returns the response."""
+        window = current_app.config.get('SOLR_FEEDER_BATCH_WINDOW', 0.2)
+        max_size = current_app.config.get('SOLR_FEEDER_BATCH_SIZE', 100)
+        commit_within = current_app.config.get('SOLR_FEEDER_COMMIT_WITHIN', 1000)
+
+        with self._lock:
+            batch = self._batches.get(solr_core)
+            opened = batch is None
+            if opened:
+                batch = self._batches[solr_core] = SolrFeederBatch(solr_core)
+            batch.merge(docs, delete_ids)
+            poster = len(batch.updates) >= max_size
+            if poster:
+                self._close(batch)
+
+        if opened and not poster:
+            batch.closed.wait(window)
+            with self._lock:
+                # the batch may have been closed and posted by the message that filled it
+                poster = self._batches.get(solr_core) is batch
+                if poster:
+                    self._close(batch)
+
+        if poster:
+            batch.post(commit_within)
+        else:
+            batch.done.wait()
+
+        if batch.error:
+            raise batch.error
+        return batch.response
+
+    def _close(self, batch: SolrFeederBatch):
+        del self._batches[batch.solr_core]
+        batch.closed.set()
+
+
+solr_feeder_batcher = SolrFeederBatcher()
+
+
 def post_to_solr_feeder(payload: dict):
     """Post to solr feeder api's feeds endpoint."""
     solr_feeder_api_url = current_app.config['SOLR_FEEDER_API_URL']
@@ -12,16 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Processing logic to process names updates via Solr feeder api."""
-import json
-
 from gcp_queue.logging import structured_log
 from namex.constants import NameState
 from namex.models import Request as RequestDAO
 
 from solr_names_updater.names_processors import convert_to_solr_conformant_datetime_str  # noqa: I001
-from solr_names_updater.names_processors import convert_to_solr_conformant_json  # noqa: I001
 from solr_names_updater.names_processors import find_name_by_name_states  # noqa: I001
-from solr_names_updater.names_processors import post_to_solr_feeder  # noqa: I001; noqa: I001
+from solr_names_updater.names_processors import solr_feeder_batcher  # noqa: I001; noqa: I001
 
 # noqa: I003, I005
 
@@ -43,32 +40,25 @@ def process_delete_from_solr(state_change_msg: dict):  # pylint: disable=too-man
 
 
 def send_to_solr_add(nr: RequestDAO):
-    """Send json payload to add names to solr for NR."""
+    """Send the names of the NR to add to solr."""
     # pylint: disable=no-member
     name_states = [NameState.APPROVED.value, NameState.CONDITION.value]
     names = find_name_by_name_states(nr.id, name_states)
     jur = nr.xproJurisdiction if nr.xproJurisdiction else 'BC'
-    payload_dict = construct_payload_dict(nr, names, jur)
-    resp = post_to_solr_feeder(payload_dict)
+    docs = construct_docs(nr, names, jur)
+    if not docs:
+        return
+    resp = solr_feeder_batcher.send('names', docs=docs)
     if resp.status_code != 200:
-        structured_log(payload_dict, severity='ERROR', message=f'failed to add names to solr for {nr.nrNum}, status code: {resp.status_code}, error reason: {resp.reason}, error details: {resp.text}')
+        structured_log(docs, severity='ERROR', message=f'failed to add names to solr for {nr.nrNum}, status code: {resp.status_code}, error reason: {resp.reason}, error details: {resp.text}')
 
 
 def send_to_solr_delete(nr: RequestDAO):
-    """Send json payload to delete names from solr for NR."""
+    """Send the names of the NR to delete from solr."""
     delete_ids = get_nr_ids_to_delete_from_solr(nr)
-    payload_dict = {
-        'solr_core': 'names',
-        'request': {
-            'delete': delete_ids,
-            'commit': {}
-        }
-    }
-    request_str = json.dumps(payload_dict['request'])
-    payload_dict['request'] = request_str
-    resp = post_to_solr_feeder(payload_dict)
+    resp = solr_feeder_batcher.send('names', delete_ids=delete_ids)
     if resp.status_code != 200:
-        structured_log(payload_dict, severity='ERROR', message=f'failed to delete names from solr for {nr.nrNum}, status code: {resp.status_code}, error reason: {resp.reason}, error details: {resp.text}')
+        structured_log(delete_ids, severity='ERROR', message=f'failed to delete names from solr for {nr.nrNum}, status code: {resp.status_code}, error reason: {resp.reason}, error details: {resp.text}')
 
 
 def get_nr_ids_to_delete_from_solr(nr: RequestDAO):
@@ -80,29 +70,18 @@ def get_nr_ids_to_delete_from_solr(nr: RequestDAO):
     return keys
 
 
-def construct_payload_dict(nr: RequestDAO, names, jur):
-    """Construct json payload used to invoke solr feeder endpoint for adding names for a given NR."""
-    payload_dict = {'solr_core': 'names'}
-    payload_request = {}
-
-    for index, name in enumerate(names):
-        key = f'add{index + 1}'
-        doc_id = f'{nr.nrNum}-{name.choice}'
-        start_date = convert_to_solr_conformant_datetime_str(nr.submittedDate)
-        payload_request[key] = {
-            'doc': {
-                'id': doc_id,
-                'name': name.name,
-                'nr_num': nr.nrNum,
-                'submit_count': nr.submitCount,
-                'name_state_type_cd': name.state,
-                'start_date': start_date,
-                'jurisdiction': jur
-            }
+def construct_docs(nr: RequestDAO, names, jur):
+    """Construct the solr docs of the names of a given NR."""
+    start_date = convert_to_solr_conformant_datetime_str(nr.submittedDate)
+    return [
+        {
+            'id': f'{nr.nrNum}-{name.choice}',
+            'name': name.name,
+            'nr_num': nr.nrNum,
+            'submit_count': nr.submitCount,
+            'name_state_type_cd': name.state,
+            'start_date': start_date,
+            'jurisdiction': jur
         }
-
-    payload_request['commit'] = {}
-    request_str = json.dumps(payload_request)
-    request_str = convert_to_solr_conformant_json(request_str)
-    payload_dict['request'] = request_str
-    return payload_dict
+        for name in names
+    ]
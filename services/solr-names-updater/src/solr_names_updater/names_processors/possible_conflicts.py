@@ -14,8 +14,6 @@
 """Processing logic to process possible conflict updates via Solr feeder api."""
 from __future__ import annotations
 
-import json
-
 from namex.constants import NameState
 from namex.models import Request as RequestDAO
 from gcp_queue.logging import structured_log
@@ -23,7 +21,7 @@ from gcp_queue.logging import structured_log
 from solr_names_updater.names_processors import (  # noqa: I001
     convert_to_solr_conformant_datetime_str,  # noqa: I001
     find_name_by_name_states,  # noqa: I001
-    post_to_solr_feeder  # noqa: I001
+    solr_feeder_batcher  # noqa: I001
 )  # noqa: I001
 # noqa: I003, I005
 
@@ -45,52 +43,32 @@ def process_delete_from_solr(state_change_msg: dict):  # pylint: disable=too-man
 
 
 def send_to_solr_add(nr: RequestDAO):
-    """Send json payload to add possible conflict to solr for NR."""
+    """Send the possible conflict of the NR to add to solr."""
     name_states = [NameState.APPROVED.value, NameState.CONDITION.value]  # pylint: disable=no-member
     names = find_name_by_name_states(nr.id, name_states)
     name = names[0]
     jur = nr.xproJurisdiction if nr.xproJurisdiction else 'BC'
-    payload_dict = construct_payload_dict(nr, name, jur)
+    doc = construct_doc(nr, name, jur)
 
-    resp = post_to_solr_feeder(payload_dict)
+    resp = solr_feeder_batcher.send('possible.conflicts', docs=[doc])
     if resp.status_code != 200:
-        structured_log(payload_dict, severity='ERROR', message=f'failed to add possible conflict to solr for {nr.nrNum}, status code: {resp.status_code}, error reason: {resp.reason}, error details: {resp.text}')
+        structured_log(doc, severity='ERROR', message=f'failed to add possible conflict to solr for {nr.nrNum}, status code: {resp.status_code}, error reason: {resp.reason}, error details: {resp.text}')
 
 
 def send_to_solr_delete(nr: RequestDAO):
-    """Send json payload to delete possible conflict from solr for NR."""
-    payload_dict = {
-        'solr_core': 'possible.conflicts',
-        'request': {
-            'delete': [nr.nrNum],
-            'commit': {}
-        }
-    }
-
-    request_str = json.dumps(payload_dict['request'])
-    payload_dict['request'] = request_str
-    resp = post_to_solr_feeder(payload_dict)
+    """Send the possible conflict of the NR to delete from solr."""
+    resp = solr_feeder_batcher.send('possible.conflicts', delete_ids=[nr.nrNum])
     if resp.status_code != 200:
-        structured_log(payload_dict, severity='ERROR', message=f'failed to delete possible conflict from solr for {nr.nrNum}, status code: {resp.status_code}, error reason: {resp.reason}, error details: {resp.text}')
-
-
-def construct_payload_dict(nr: RequestDAO, name, jur):
-    """Construct json payload used to invoke solr feeder endpoint for adding possible conflicts for a given NR."""
-    payload_dict = {'solr_core': 'possible.conflicts'}
-    payload_request = {}
-    start_date = convert_to_solr_conformant_datetime_str(nr.submittedDate)
-    payload_request['add'] = {
-        'doc': {
-            'id': nr.nrNum,
-            'name': name.name,
-            'state_type_cd': name.state,
-            'source': nr.source,
-            'start_date': start_date,
-            'jurisdiction': jur
-        }
+        structured_log(nr.nrNum, severity='ERROR', message=f'failed to delete possible conflict from solr for {nr.nrNum}, status code: {resp.status_code}, error reason: {resp.reason}, error details: {resp.text}')
+
+
+def construct_doc(nr: RequestDAO, name, jur):
+    """Construct the solr doc of the possible conflict of a given NR."""
+    return {
+        'id': nr.nrNum,
+        'name': name.name,
+        'state_type_cd': name.state,
+        'source': nr.source,
+        'start_date': convert_to_solr_conformant_datetime_str(nr.submittedDate),
+        'jurisdiction': jur
     }
-
-    payload_request['commit'] = {}
-    request_str = json.dumps(payload_request)
-    payload_dict['request'] = request_str
-    return payload_dict
@@ -215,4 +215,4 @@ def test_should_delete_possible_conflict_from_solr(
             assert post_json['solr_core'] == 'possible.conflicts'
 
             request_json = post_json['request']
-            assert f'"delete": ["{mock_nr.nrNum}"]' in request_json
+            assert f'"delete": {{"id": "{mock_nr.nrNum}"' in request_json
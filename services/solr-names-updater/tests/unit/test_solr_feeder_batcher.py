@@ -0,0 +1,120 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to ensure the solr feeder updates of concurrent messages are batched."""
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from solr_names_updater.names_processors import (  # noqa: I001
+    SolrFeederBatch,
+    SolrFeederBatcher,
+    convert_to_solr_conformant_json,
+)
+
+from . import MockResponse  # noqa: I003
+
+
+def send_concurrently(app, batcher, updates):
+    """Send each (solr_core, docs, delete_ids) update from its own thread, returns the responses or errors."""
+    results = [None] * len(updates)
+
+    def send(index, solr_core, docs, delete_ids):
+        with app.app_context():
+            try:
+                results[index] = batcher.send(solr_core, docs=docs, delete_ids=delete_ids)
+            except Exception as err:  # noqa: B902
+                results[index] = err
+
+    threads = [threading.Thread(target=send, args=(index, *update)) for index, update in enumerate(updates)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def parse_solr_request(request_str):
+    """Return the (command, body) pairs of a solr update request, in order."""
+    return json.loads(request_str, object_pairs_hook=list)
+
+
+def test_concurrent_updates_are_sent_together(app, config):
+    """Assert that the concurrent updates of a core are sent in one request committed within a delay."""
+    batcher = SolrFeederBatcher()
+    with patch.dict(config, {'SOLR_FEEDER_BATCH_WINDOW': 0.5, 'SOLR_FEEDER_COMMIT_WITHIN': 2000}), \
+            patch.object(requests, 'post', return_value=MockResponse({}, 200)) as mock_post:
+        results = send_concurrently(app, batcher, [
+            ('names', [{'id': 'NR 1-1', 'name': 'ONE'}], []),
+            ('names', [{'id': 'NR 2-1', 'name': 'TWO'}], []),
+            ('names', [], ['NR 3-1']),
+        ])
+
+    assert all(result.status_code == 200 for result in results)
+    assert mock_post.call_count == 1
+    post_json = mock_post.call_args[1]['json']
+    assert post_json['solr_core'] == 'names'
+
+    commands = parse_solr_request(post_json['request'])
+    assert all(dict(body)['commitWithin'] == 2000 for _, body in commands)
+    assert 'commit' not in [command for command, _ in commands]
+    updated = {dict(body).get('id') or dict(dict(body)['doc'])['id']: command for command, body in commands}
+    assert updated == {'NR 1-1': 'add', 'NR 2-1': 'add', 'NR 3-1': 'delete'}
+
+
+def test_last_update_of_a_doc_wins():
+    """Assert that a batch only sends the last update of each doc, in the order of the last updates."""
+    batch = SolrFeederBatch('names')
+    batch.merge([{'id': 'NR 1-1'}, {'id': 'NR 2-1'}], [])
+    batch.merge([], ['NR 1-1', 'NR 1-2'])
+    batch.merge([{'id': 'NR 1-2', 'name': 'TWO'}], [])
+
+    assert batch.updates == {'NR 2-1': {'id': 'NR 2-1'}, 'NR 1-1': None, 'NR 1-2': {'id': 'NR 1-2', 'name': 'TWO'}}
+    assert list(batch.updates) == ['NR 2-1', 'NR 1-1', 'NR 1-2']
+
+
+def test_full_batch_is_sent_without_waiting(app, config):
+    """Assert that a batch is sent as soon as it holds SOLR_FEEDER_BATCH_SIZE docs."""
+    batcher = SolrFeederBatcher()
+    with patch.dict(config, {'SOLR_FEEDER_BATCH_WINDOW': 30, 'SOLR_FEEDER_BATCH_SIZE': 2}), \
+            patch.object(requests, 'post', return_value=MockResponse({}, 200)) as mock_post:
+        results = send_concurrently(app, batcher, [
+            ('possible.conflicts', [{'id': 'NR 1'}], []),
+            ('possible.conflicts', [{'id': 'NR 2'}], []),
+        ])
+
+    assert all(result.status_code == 200 for result in results)
+    assert mock_post.call_count == 1
+
+
+@pytest.mark.parametrize('error', [requests.ConnectionError('solr feeder down')])
+def test_failed_batch_fails_every_message(app, config, error):
+    """Assert that every message of a batch that could not be sent goes back on the queue."""
+    batcher = SolrFeederBatcher()
+    with patch.dict(config, {'SOLR_FEEDER_BATCH_WINDOW': 0.5}), \
+            patch.object(requests, 'post', side_effect=error):
+        results = send_concurrently(app, batcher, [
+            ('names', [{'id': 'NR 1-1'}], []),
+            ('names', [], ['NR 2-1']),
+        ])
+
+    assert results == [error, error]
+
+
+def test_conformant_json_keeps_duplicate_commands():
+    """Assert that the numbered add and delete keys are sent as duplicate keys."""
+    request_str = convert_to_solr_conformant_json(json.dumps({'delete1': {'id': 'a'}, 'add2': {'doc': {}}}))
+    assert request_str == '{"delete": {"id": "a"}, "add": {"doc": {}}}'
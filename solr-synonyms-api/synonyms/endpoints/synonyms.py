@@ -762,6 +762,33 @@ class _RegexPrefixes(Resource):
             'data': result
         }
 
+
+@api.route('/snapshot', strict_slashes=False, methods=['GET'])
+class _Snapshot(Resource):
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    # @jwt.requires_auth
+    def get():
+        """Return every synonym row, so clients can load the whole table once and serve lookups in process."""
+        results = synonym.Synonym.find_all()
+
+        return {
+            'data': [result.json() for result in results]
+        }
+
+
+@api.route('/version', strict_slashes=False, methods=['GET'])
+class _Version(Resource):
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    # @jwt.requires_auth
+    def get():
+        """Return a fingerprint of the synonym table, it changes whenever a synonym row is added, updated or removed."""
+        return {
+            'version': synonym.Synonym.version()
+        }
+
+
 @api.route('/<col>/<term>', strict_slashes=False, methods=['GET'])
 class _Synonyms(Resource):
     @staticmethod
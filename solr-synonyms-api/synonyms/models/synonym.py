@@ -1,6 +1,7 @@
 from . import db, ma
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 
 from synonyms.criteria.synonym.query_criteria import SynonymQueryCriteria
@@ -56,6 +57,22 @@ class Synonym(db.Model):
 
         return synonyms_list
 
+    '''
+    Return the whole table in id order, used to build in-process synonym engines.
+    '''
+    @classmethod
+    def find_all(cls):
+        return cls.query.order_by(Synonym.id).all()
+
+    '''
+    Return a fingerprint of the whole table, used by clients to find out whether their copy of the table is stale.
+    '''
+    @classmethod
+    def version(cls):
+        row = func.concat_ws('|', cls.id, cls.category, cls.synonyms_text, cls.stems_text, cls.enabled)
+        return db.session.query(func.md5(func.string_agg(row, aggregate_order_by(literal_column("';'"), cls.id)))) \
+            .scalar()
+
     '''
     Query the model collection using an array of filters
     @:param filters An array of query filters eg. 